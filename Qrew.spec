@@ -18,7 +18,7 @@ a = Analysis(
     (r'C:/Users/centralmd/Downloads/vlc-3.0.21-win64/vlc-3.0.21/libvlccore.dll', '.'),
 ],
     datas=[(r'C:/Users/centralmd/Documents/Qrew_pro/qrew/assets', 'assets'), (r'C:/Users/centralmd/Documents/Qrew_pro/README.md', '.'), (r'C:/Users/centralmd/Documents/Qrew_pro/LICENSE', '.'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/coordinate_picker.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/main.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/mic_pos.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/mic_widget.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew2.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew3.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew4.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_api_helper.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_button.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_common.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_dialogs.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_filedialog.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_find_vlc.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_gridwidget.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_measurement_metrics.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_messagebox.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_message_handlers.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_micwidget_icons.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_resources.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_settings.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_styles.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_v1.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_vlc_helper.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_vlc_helper_v2.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_workers.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/Qrew_workers_v2.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/__init__.py', 'qrew'), (r'C:/Users/centralmd/Documents/Qrew_pro/qrew/__main__.py', 'qrew')],
-    hiddenimports=['qrew', 'qrew.Qrew', 'qrew.Qrew_api_helper', 'qrew.Qrew_message_handlers', 'qrew.Qrew_common', 'qrew.Qrew_styles', 'qrew.Qrew_button', 'qrew.Qrew_dialogs', 'qrew.Qrew_workers_v2', 'qrew.Qrew_settings', 'qrew.Qrew_measurement_metrics', 'qrew.Qrew_micwidget_icons', 'qrew.Qrew_vlc_helper_v2', 'qrew.Qrew_messagebox', 'qrew.Qrew_resources', 'requests', 'flask', 'gevent', 'numpy', 'pandas', 'vlc', 'colour', 'PyQt5.sip', 'PyQt5.QtCore', 'PyQt5.QtGui', 'PyQt5.QtWidgets'],
+    hiddenimports=['qrew', 'qrew.Qrew', 'qrew.Qrew_api_helper', 'qrew.Qrew_message_handlers', 'qrew.Qrew_common', 'qrew.Qrew_styles', 'qrew.Qrew_button', 'qrew.Qrew_dialogs', 'qrew.Qrew_workers_v2', 'qrew.Qrew_settings', 'qrew.Qrew_measurement_metrics', 'qrew.Qrew_micwidget_icons', 'qrew.Qrew_vlc_helper_v2', 'qrew.Qrew_messagebox', 'qrew.Qrew_resources', 'requests', 'numpy', 'vlc', 'colour', 'PyQt5.sip', 'PyQt5.QtCore', 'PyQt5.QtGui', 'PyQt5.QtWidgets'],
     excludes=['tkinter', 'matplotlib', 'IPython', 'PyQt5.QtQuick', 'PyQt5.QtQml', 'PyQt5.QtWebSockets', 'PyQt5.QtDBus', 'PyQt5.QtPrintSupport', 'test', 'unittest', 'pdb', 'pydoc', 'doctest', 'xml.etree', 'xml.parsers', 'setuptools', 'pkg_resources', 'wheel', 'pip'],
     hookspath=[],
     hooksconfig={},
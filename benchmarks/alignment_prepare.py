@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Alignment IR preparation check and benchmark.
+
+Times Qrew_cross_align.rew_prepare_ir_for_correlation against the
+original per-sample loops (decay window and fractional shift, kept
+below as the reference) at realistic FFT lengths, checks that both give
+the same spectrum, and that a full rew_cross_correlation_align run finds
+the same shifts with either.
+
+    python benchmarks/alignment_prepare.py [--lengths 16384 65536 262144 1048576]
+                                           [--positions 9] [--tolerance 1e-3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "qrew"))
+
+import Qrew_cross_align  # noqa: E402
+from Qrew_cross_align import rew_circular_shift, rew_prepare_ir_for_correlation  # noqa: E402
+
+SAMPLE_RATE = 48000.0
+
+
+def prepare_loops(ir_data, sample_rate, start_time, timing_ref, fft_length,
+                  reference_peak_time, ir_start_index=None, signal_squaring=True):
+    """The per-sample loop version this benchmark compares against."""
+    prepared = np.zeros(fft_length, dtype=np.float32)
+    prepared[: len(ir_data)] = ir_data
+
+    if ir_start_index is not None and ir_start_index > 0:
+        decay_factor = 0.1
+        min_decay_samples = max(int(0.01 * sample_rate), 100)
+        decay_rate = np.log(decay_factor) / min_decay_samples
+
+        decay_start = ir_start_index + max(int(0.001 * sample_rate), 10)
+        if decay_start < len(prepared):
+            for i in range(decay_start, min(len(prepared), decay_start + min_decay_samples)):
+                prepared[i] *= np.exp(decay_rate * (i - decay_start))
+
+    time_offset = (reference_peak_time - start_time) * sample_rate
+    shift_samples = int(np.round(time_offset))
+    fractional_shift = time_offset - shift_samples
+
+    # Same direction as the circular shift (earlier for a positive offset)
+    if abs(fractional_shift) > 1e-6:
+        if fractional_shift > 0:
+            for i in range(len(prepared) - 1):
+                prepared[i] = prepared[i] * (1 - fractional_shift) + prepared[i + 1] * fractional_shift
+        else:
+            fractional_shift = -fractional_shift
+            for i in range(len(prepared) - 1, 0, -1):
+                prepared[i] = prepared[i] * (1 - fractional_shift) + prepared[i - 1] * fractional_shift
+
+    rew_circular_shift(prepared, -shift_samples)
+
+    if signal_squaring:
+        prepared = np.sign(prepared) * (prepared**2)
+
+    return np.fft.rfft(prepared)
+
+
+def make_ir(length, delay_samples, seed):
+    """Band-limited direct sound at 20 ms plus a decaying diffuse tail."""
+    rng = np.random.default_rng(seed)
+    freqs = np.fft.rfftfreq(length, 1 / SAMPLE_RATE)
+    response = 1 / (1 + (freqs / 8000.0) ** 4)
+    direct = np.fft.irfft(response * np.exp(-2j * np.pi * freqs * (0.02 + delay_samples / SAMPLE_RATE)), length)
+    onset = int(0.02 * SAMPLE_RATE + delay_samples)
+    tail = np.zeros(length)
+    decay = np.arange(length - onset)
+    tail[onset:] = rng.normal(0.0, 0.02, decay.size) * np.exp(-decay / (0.1 * SAMPLE_RATE))
+    return (direct + tail).astype(np.float32)
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def bench_prepare(lengths, repeat):
+    worst = 0.0
+    print(f"{'fft length':>10} {'loops':>10} {'vectorised':>11} {'speed-up':>9} {'max rel err':>12}")
+    for length in lengths:
+        ir = make_ir(length, 3.37, seed=length)
+        kwargs = dict(sample_rate=SAMPLE_RATE, start_time=0.0, timing_ref=0.02,
+                      fft_length=length, ir_start_index=int(0.02 * SAMPLE_RATE))
+        for peak_time in (0.02 + 3.37 / SAMPLE_RATE, 0.02 - 2.61 / SAMPLE_RATE):
+            t_loop, expected = timed(
+                lambda: prepare_loops(ir, reference_peak_time=peak_time, **kwargs), 1)
+            t_vec, got = timed(
+                lambda: rew_prepare_ir_for_correlation(ir, reference_peak_time=peak_time, **kwargs), repeat)
+            err = np.max(np.abs(got - expected)) / np.max(np.abs(expected))
+            worst = max(worst, err)
+        print(f"{length:>10} {t_loop * 1000:8.1f}ms {t_vec * 1000:9.2f}ms {t_loop / t_vec:8.0f}x {err:12.2e}")
+    return worst
+
+
+def bench_align(length, positions, tolerance):
+    delays = [0.0] + [float(d) for d in np.random.default_rng(7).uniform(-40, 40, positions - 1)]
+    data = [(make_ir(length, d, seed=0), SAMPLE_RATE, 0.0, 0.02, f"pos{i}")
+            for i, d in enumerate(delays)]
+
+    def align_with(prepare):
+        original = Qrew_cross_align.rew_prepare_ir_for_correlation
+        Qrew_cross_align.rew_prepare_ir_for_correlation = prepare
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return Qrew_cross_align.rew_cross_correlation_align(data)
+        finally:
+            Qrew_cross_align.rew_prepare_ir_for_correlation = original
+
+    t_loop, expected = timed(lambda: align_with(prepare_loops), 1)
+    t_vec, got = timed(lambda: align_with(rew_prepare_ir_for_correlation), 1)
+    diff = max(abs(a - b) * SAMPLE_RATE for a, b in zip(expected, got))
+    error = max(abs(s * SAMPLE_RATE - d) for s, d in zip(got, delays))
+
+    print(f"\nalignment of {positions} positions, fft length {length}:")
+    print(f"  loops:      {t_loop * 1000:8.1f} ms")
+    print(f"  vectorised: {t_vec * 1000:8.1f} ms  ({t_loop / t_vec:.0f}x)")
+    print(f"  shifts differ by at most {diff:.2e} samples (tolerance {tolerance:g})")
+    print(f"  largest error against the true delays: {error:.3f} samples")
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[16384, 65536, 262144, 1048576])
+    parser.add_argument("--positions", type=int, default=9)
+    parser.add_argument("--align-length", type=int, default=65536)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=1e-3, help="max shift difference (samples)")
+    args = parser.parse_args()
+
+    worst = bench_prepare(args.lengths, args.repeat)
+    diff = bench_align(args.align_length, args.positions, args.tolerance)
+
+    ok = worst < 1e-4 and diff <= args.tolerance
+    print("\nresults match" if ok else "\nresults differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
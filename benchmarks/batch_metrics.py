@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Batch metric engine check and benchmark.
+
+Scores a synthetic session of N measurements once through the
+per-measurement path (calculate_rew_metrics_from_ir + evaluate_measurement
++ combine_and_score_metrics) and once through
+Qrew_batch_metrics.score_measurements_batch, checks that both agree and
+reports the timings.
+
+    python benchmarks/batch_metrics.py [--count 200] [--samples 131072]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "qrew"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Qrew_measurement_metrics import (  # noqa: E402
+    calculate_rew_metrics_from_ir,
+    evaluate_measurement,
+    combine_and_score_metrics,
+)
+from Qrew_batch_metrics import score_measurements_batch, batch_details  # noqa: E402
+from ir_metrics_regression import make_ir  # noqa: E402
+
+HEADERS = ["Freq (Hz)", "Fundamental (dB)", "THD (%)", "Noise (%)", "H2 (%)", "H3 (%)"]
+
+
+def make_distortion(seed, ppo=96, scaled=False, rows=None):
+    rng = np.random.default_rng(seed)
+    freqs = 20.0 * 2 ** (np.arange(0, 10 * ppo) / ppo)
+    if rows is not None:
+        freqs = freqs[:rows]
+    thd = np.abs(rng.normal(0.3, 0.2, freqs.size)) * (1 + 4 * (freqs < 100))
+    noise = np.abs(rng.normal(200.0, 50.0, freqs.size))  # REW reports x10000
+    h2 = thd * rng.uniform(0.4, 0.9, freqs.size)
+    h3 = thd * rng.uniform(0.1, 0.6, freqs.size)
+    h2[rng.random(freqs.size) < 0.05] = 0.0
+    if scaled:
+        thd, h2, h3 = thd * 10000, h2 * 10000, h3 * 10000
+    data = np.column_stack([freqs, np.full(freqs.size, 90.0), thd, noise, h2, h3])
+    return {"columnHeaders": HEADERS, "data": data.tolist()}
+
+
+def single(ir, thd, info):
+    rew = calculate_rew_metrics_from_ir(ir)
+    freq = evaluate_measurement(thd, info, None)
+    combined = combine_and_score_metrics(rew, freq)
+    return {"score": combined["score"], "rating": combined["rating"],
+            "detail": {**freq["detail"], **rew["detail"]}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=1 << 17)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    irs, thds, infos = [], [], []
+    for i in range(args.count):
+        n = args.samples - int(rng.integers(0, args.samples // 8))  # ragged lengths
+        irs.append(make_ir(n, peak_at=int(rng.integers(10, n - 10)), seed=i))
+        thds.append(make_distortion(i, scaled=(i % 7 == 0), rows=None if i % 5 else 800))
+        infos.append({"signalToNoisedB": float(rng.uniform(40, 90))})
+
+    import io, contextlib
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # evaluate_measurement prints
+        expected = [single(ir, thd, info) for ir, thd, info in zip(irs, thds, infos)]
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    got = batch_details(score_measurements_batch(irs, thds, infos))
+    t_batch = time.perf_counter() - t0
+
+    mismatches = 0
+    for i, (exp, res) in enumerate(zip(expected, got)):
+        bad = [k for k in ("score", "rating") if exp[k] != res[k]]
+        for key, val in exp["detail"].items():
+            other = res["detail"][key]
+            if key == "analysis_regions":
+                if {k: tuple(v) for k, v in val.items()} != other:
+                    bad.append(key)
+            elif val is None or other is None:
+                if val is not other:
+                    bad.append(key)
+            elif not np.isclose(float(val), other, rtol=1e-6, atol=1e-4, equal_nan=True):
+                bad.append(key)
+        if bad:
+            mismatches += 1
+            print(f"measurement {i}: mismatch in {bad}")
+
+    print(f"{args.count} measurements x {args.samples} samples")
+    print(f"  per-measurement: {t_single * 1000:8.1f} ms")
+    print(f"  batched:         {t_batch * 1000:8.1f} ms  ({t_single / t_batch:.1f}x)")
+    print("  results match" if not mismatches else f"  {mismatches} mismatching measurements")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
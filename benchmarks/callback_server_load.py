@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+REW callback server load test.
+
+Replays a stream of REW callbacks against Qrew_callback_server.CallbackServer
+on a free local port and reports what REW would see (response latency)
+and what Qrew would see (how far the dispatcher falls behind).
+
+A stream is a JSON-lines file of {"t", "method", "path", "body"} objects.
+Record one from a real session by setting "callback_record_file" in
+settings.json; without --stream a synthetic session is generated: one
+sweep measurement's status lines, processing results, warnings and an
+RTA verification posting at --rta-rate per second.
+
+    python benchmarks/callback_server_load.py [--stream session.jsonl]
+        [--speed 1.0 | --speed 0] [--connections 2] [--handler-ms 2]
+        [--rta-rate 50] [--duration 10] [--max-p99-ms 50]
+
+--speed 0 replays as fast as possible.
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "qrew"))
+
+from Qrew_callback_server import CallbackServer  # noqa: E402
+
+
+def synthetic_stream(rta_rate, duration):
+    """One measurement followed by an RTA verification, timed like REW."""
+    events = []
+    t = 0.0
+
+    def post(path, body, dt):
+        nonlocal t
+        t += dt
+        events.append({"t": round(t, 4), "method": "POST", "path": path, "body": body})
+
+    for percent in range(0, 101, 5):
+        post("/rew-status", json.dumps(f"Capturing noise floor {percent}%"), 0.05)
+    for percent in range(0, 101):
+        post("/rew-status", json.dumps(f"{percent}% Measuring, sweep 1 of 1"), 0.03)
+    post("/rew-status", json.dumps("100% Measurement complete"), 0.01)
+    post("/rew-warnings", json.dumps({"time": "now", "title": "Low signal-to-noise ratio", "message": "SNR 38 dB"}), 0.01)
+    post("/rew-status/0123456789abcdef", json.dumps(
+        {"processName": "Cross corr align", "message": "Completed", "results": {}}), 0.2)
+    post("/rew-status", json.dumps(
+        {"processName": "Vector average", "message": "Completed", "results": {"12": {"title": "FL_VectorAvg"}}}), 0.2)
+
+    harmonics = [{"frequency": 1000.0 * h, "dBFS": -60.0 - h, "percent": 0.01 / h} for h in range(2, 10)]
+    for i in range(int(rta_rate * duration)):
+        post("/rta-distortion", json.dumps([{
+            "nanotime": i,
+            "totalSamplesProcessed": 4800 * i,
+            "fundamentalFrequency": 1000.0,
+            "fundamentaldBFS": -12.0,
+            "thd": {"value": 0.05},
+            "thdPlusN": {"value": 0.08},
+            "snrdB": 92.0,
+            "enob": 15.0,
+            "imd": {"value": 0.01},
+            "gaindB": 0.0,
+            "harmonics": harmonics,
+            "coherentAveraging": False,
+            "averages": i,
+        }]), 1.0 / rta_rate)
+    return events
+
+
+def load_stream(path):
+    with open(path, encoding="utf-8") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    start = events[0]["t"] if events else 0.0
+    for event in events:
+        event["t"] -= start
+    return events
+
+
+def replay(port, events, speed, connection_index, connections, latencies, accepted, errors):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    start = time.perf_counter()
+    for event in events[connection_index::connections]:
+        if speed:
+            delay = event["t"] / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        body = event.get("body", "").encode("utf-8")
+        t0 = time.perf_counter()
+        try:
+            conn.request(event.get("method", "POST"), event["path"], body,
+                         {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status == 200:
+                accepted.append(event)
+            elif response.status >= 500:
+                errors.append(f"{event['path']}: HTTP {response.status}")
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(f"{event['path']}: {e}")
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stream", help="recorded callback stream (JSON lines)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed, 0 = flat out")
+    parser.add_argument("--connections", type=int, default=2)
+    parser.add_argument("--handler-ms", type=float, default=2.0,
+                        help="simulated work per callback on the dispatcher thread")
+    parser.add_argument("--rta-rate", type=float, default=50.0, help="synthetic RTA posts per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="synthetic RTA duration (s)")
+    parser.add_argument("--max-p99-ms", type=float, default=50.0, help="fail above this response p99")
+    args = parser.parse_args()
+
+    events = load_stream(args.stream) if args.stream else synthetic_stream(args.rta_rate, args.duration)
+    posts = [e for e in events if e.get("method", "POST") == "POST"]
+
+    server = CallbackServer(host="127.0.0.1", port=0)
+    handled = []
+    max_backlog = [0]
+
+    def handler(payload, **params):
+        max_backlog[0] = max(max_backlog[0], server.backlog)
+        if args.handler_ms:
+            time.sleep(args.handler_ms / 1000.0)
+        handled.append(time.perf_counter())
+
+    for path in sorted({e["path"] for e in posts}):
+        body = "json" if path in ("/rta-distortion", "/rew-warnings", "/rew-errors", "/rew-result") else "text"
+        server.route(path, body=body)(handler)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    if not server.ready.wait(5) or server.error:
+        print(f"server did not start: {server.error}")
+        return 1
+
+    latencies, accepted, errors = [], [], []
+    clients = [
+        threading.Thread(target=replay, args=(server.port, posts, args.speed, i, args.connections,
+                                              latencies, accepted, errors))
+        for i in range(args.connections)
+    ]
+    t0 = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    sent = time.perf_counter() - t0
+    while server.backlog and time.perf_counter() - t0 < sent + 60:
+        time.sleep(0.01)
+    drained = time.perf_counter() - t0
+    server.stop()
+
+    p50, p99 = percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000
+    print(f"\n{len(posts)} callbacks over {args.connections} connections in {sent:.2f}s "
+          f"({len(latencies) / sent:.0f}/s), speed {args.speed or 'flat out'}")
+    print(f"  response latency: p50 {p50:.2f} ms, p99 {p99:.2f} ms, "
+          f"max {max(latencies, default=0) * 1000:.2f} ms")
+    print(f"  accepted {len(accepted)}, handled {len(handled)}, dispatcher backlog max {max_backlog[0]}, "
+          f"drained {drained - sent:.2f}s after the last send")
+    for error in errors[:10]:
+        print(f"  error: {error}")
+
+    # Rejected posts (e.g. empty JSON bodies, 400) never reach a handler
+    ok = not errors and len(handled) == len(accepted) and p99 <= args.max_p99_ms
+    print("\nload test passed" if ok else "\nload test failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
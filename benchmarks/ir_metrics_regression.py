@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Regression check for the IR metrics decoder.
+
+Compares Qrew_measurement_metrics.calculate_rew_metrics_from_ir against the
+original float64 implementation (kept verbatim below) on synthetic REW-style
+impulse responses, and reports the speed-up - overall, and for the analysis
+after base64 decoding, which both versions have to pay for and which
+dominates the total.
+
+    python benchmarks/ir_metrics_regression.py [--samples 1048576] [--repeat 5]
+"""
+import argparse
+import base64
+import binascii
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "qrew"))
+
+from Qrew_measurement_metrics import calculate_rew_metrics_from_ir  # noqa: E402
+
+
+# ----------------------------------------------------------------------
+# Original implementation (pre zero-copy decoder) – do not modify
+# ----------------------------------------------------------------------
+def reference_rew_metrics_from_ir(ir, harm_factor=0.5):
+    """
+    Calculate metrics exactly like REW using impulse response data.
+    """
+
+    ir_base64 = ir['data']
+    sample_rate = ir['sampleRate']
+    start_time = ir['startTime']
+    timing_ref_time = ir.get('timingRefTime', 0.0)
+    timing_offset = ir.get('timingOffset', 0.0)
+    delay = ir.get('delay', 0.0)
+    effective_timing_ref = timing_ref_time + timing_offset + delay
+    
+    ir_bytes = base64.b64decode(ir_base64)
+    ir_array = np.frombuffer(ir_bytes, dtype='>f4')  # REW uses big-endian float32
+    ir_array = ir_array / 100  #change from percentage values  
+    # Handle NaN/Inf values
+    if np.isnan(ir_array).sum() > 0 or np.isinf(ir_array).sum() > 0:
+        ir_array = np.nan_to_num(ir_array, nan=0.0, posinf=0.0, neginf=0.0)
+    """
+    # Normalize if values are too large
+    max_val = np.max(np.abs(ir_array))
+    if max_val > 10.0:
+        ir_array = ir_array / max_val
+    
+    ir_array = np.clip(ir_array, -1.0, 1.0)
+
+    """
+    T = 1.0 / sample_rate  # Sample interval
+    
+    # Step 1: Find the absolute maximum (peak) index
+    abs_max_idx = np.argmax(np.abs(ir_array))
+    peak_value = np.abs(ir_array[abs_max_idx])
+    peak_time_sec = start_time + (abs_max_idx * T)
+    
+    # Convert to milliseconds
+    peak_time_ms = peak_time_sec * 1000
+    # Step 2: Calculate time window based on harmonic factor
+    time_window = harm_factor * np.log(2.0)
+    window_samples = int(round(time_window / T))
+    
+    # Step 3: Define analysis regions
+    analysis_start = abs_max_idx - window_samples // 4
+    window_size = len(ir_array) // 4
+    
+    # Ensure we don't go out of bounds
+    analysis_start = max(0, analysis_start)
+    window_size = min(window_size, len(ir_array) - analysis_start)
+    
+    # Step 4: Calculate power in each region
+    
+    # SIGNAL REGION: After the peak (direct sound)
+    signal_start = analysis_start
+    signal_end = min(signal_start + window_size, len(ir_array))
+    signal_power = np.sum(ir_array[signal_start:signal_end] ** 2)
+    peak_signal_power = np.max(ir_array[signal_start:signal_end] ** 2)
+    
+    # DISTORTION REGION: Before the peak (early reflections)
+    dist_start = max(0, analysis_start - window_size)
+    dist_end = analysis_start
+    if dist_end > dist_start:
+        dist_power = np.max(ir_array[dist_start:dist_end] ** 2)
+    else:
+        dist_power = 1e-10  # Avoid log(0)
+    
+    # NOISE REGION: Further before the peak
+    noise_start = max(0, dist_start - window_size)
+    noise_end = dist_start
+    if noise_end > noise_start:
+        noise_power = np.sum(ir_array[noise_start:noise_end] ** 2)
+    else:
+        noise_power = 1e-10  # Avoid log(0)
+    
+    # Step 5: Convert to dBFS
+    signal_dbfs = 10 * np.log10(signal_power)
+    dist_dbfs = 10 * np.log10(dist_power)
+    noise_dbfs = 10 * np.log10(noise_power)
+    
+    # Step 6: Calculate ratios (exactly like REW)
+    signal_to_noise_db = signal_dbfs - noise_dbfs
+    signal_to_dist_db = 10 * np.log10(peak_signal_power) - dist_dbfs
+    peak_dbfs     = 20 * np.log10(max(peak_value, 1e-12))  # protect log(0)
+    ir_pk_noise   = peak_dbfs - noise_dbfs                 # dB difference
+
+    return {
+        "detail": {
+            'signal_dbfs': signal_dbfs,
+            'dist_dbfs': dist_dbfs,
+            'noise_dbfs': noise_dbfs,
+            'snr_dB': signal_to_noise_db,
+            'sdr_dB': signal_to_dist_db,
+            'peak_idx': abs_max_idx,
+            'peak_value': peak_value,
+            'peak_time_ms': peak_time_ms,
+            'ir_pk_noise_dB': ir_pk_noise, 
+            'analysis_regions': {
+                'signal': (signal_start, signal_end),
+                'distortion': (dist_start, dist_end), 
+                'noise': (noise_start, noise_end)
+            }
+        }
+    }
+
+
+# ----------------------------------------------------------------------
+# Synthetic inputs
+# ----------------------------------------------------------------------
+def make_ir(n, sample_rate=48000, peak_at=None, seed=0, non_finite=False, negative_peak=False):
+    """Decaying noise burst after a peak, in REW's percent scale."""
+    rng = np.random.default_rng(seed)
+    peak_at = n // 3 if peak_at is None else peak_at
+    ir = rng.normal(0.0, 1e-3, n)
+    tail = np.arange(n - peak_at)
+    ir[peak_at:] += rng.normal(0.0, 1.0, n - peak_at) * np.exp(-tail / (0.05 * sample_rate))
+    ir[peak_at] = -100.0 if negative_peak else 100.0
+    if non_finite:
+        ir[5] = np.nan
+        ir[7] = np.inf
+        ir[9] = -np.inf
+    data = ir.astype(">f4").tobytes()
+    return {
+        "data": base64.b64encode(data).decode("ascii"),
+        "sampleRate": sample_rate,
+        "startTime": -peak_at / sample_rate,
+    }
+
+
+CASES = {
+    "typical": dict(),
+    "early_peak": dict(peak_at=10),
+    "late_peak": dict(peak_at=-1),
+    "negative_peak": dict(negative_peak=True),
+    "non_finite": dict(non_finite=True),
+}
+
+
+def compare(reference, candidate, db_tol, rtol):
+    """
+    The reference sums energies in float32 (numpy keeps float32 / int in
+    float32); the new path accumulates in float64, so dB values agree to
+    float32 precision rather than bit-for-bit.
+    """
+    bad = []
+    for key, ref_val in reference["detail"].items():
+        val = candidate["detail"][key]
+        if key == "analysis_regions":
+            if tuple(map(tuple, val.values())) != tuple(map(tuple, ref_val.values())):
+                bad.append((key, ref_val, val))
+        elif key.endswith("dB") or key.endswith("dbfs"):
+            if not np.isclose(val, ref_val, rtol=0.0, atol=db_tol, equal_nan=True):
+                bad.append((key, ref_val, val))
+        elif not np.isclose(val, ref_val, rtol=rtol, atol=0.0, equal_nan=True):
+            bad.append((key, ref_val, val))
+    return bad
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=1 << 20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db-tol", type=float, default=1e-4, help="allowed dB difference")
+    parser.add_argument("--rtol", type=float, default=1e-6, help="relative tolerance otherwise")
+    args = parser.parse_args()
+
+    failures = 0
+    for name, kwargs in CASES.items():
+        kwargs = dict(kwargs)
+        if kwargs.get("peak_at") == -1:
+            kwargs["peak_at"] = args.samples - 100
+        ir = make_ir(args.samples, **kwargs)
+
+        bad = compare(reference_rew_metrics_from_ir(ir), calculate_rew_metrics_from_ir(ir), args.db_tol, args.rtol)
+        status = "OK" if not bad else "MISMATCH"
+        print(f"{name:>14}: {status}")
+        for key, ref_val, val in bad:
+            print(f"{'':>16}{key}: reference={ref_val!r} new={val!r}")
+        failures += bool(bad)
+
+    ir = make_ir(args.samples)
+    timings = {}
+    decoders = {
+        "reference": lambda: base64.b64decode(ir["data"]),
+        "current": lambda: binascii.a2b_base64(ir["data"]),
+    }
+    for label, fn in (("reference", reference_rew_metrics_from_ir), ("current", calculate_rew_metrics_from_ir)):
+        fn(ir)  # warm-up
+        timings[label] = best_of(lambda: fn(ir), args.repeat)
+        decode = best_of(decoders[label], args.repeat)
+
+        tracemalloc.start()
+        fn(ir)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{label:>14}: {timings[label] * 1000:.1f} ms per IR ({args.samples} samples), "
+            f"of which base64 {decode * 1000:.1f} ms; peak allocation {peak / 2**20:.1f} MiB"
+        )
+        timings[label + " analysis"] = timings[label] - decode
+    print(f"{'speed-up':>14}: {timings['reference'] / timings['current']:.2f}x overall, "
+          f"{timings['reference analysis'] / timings['current analysis']:.2f}x after base64 decoding")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+RTA distortion ingestion benchmark.
+
+Compares the per-callback cost of the /rta-distortion handler writing
+into Qrew_rta_buffer.RTARingBuffer with the dict path it replaced
+(processed dict, a second copy per collected sample, a console line and
+a GUI notification for every update), and the cost of the end-of-run
+analysis on both, plus what keeping RunningStats up to date costs per
+update (the coordinator's O(1) summary).
+
+The ring buffer is timed twice: append() alone, and end to end with the
+throttled GUI update (as_dict(), the console line and the notification)
+at REW's pace.  Console output goes to os.devnull and the notification
+is a no-op here, so a real terminal and a queued Qt signal per update
+only widen the gap.
+
+    python benchmarks/rta_ingestion.py [--updates 2000] [--repeat 5]
+                                       [--notify-interval 0.25]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "qrew"))
+
+from Qrew_rta_buffer import RTARingBuffer, RunningStats, Throttle  # noqa: E402
+
+CONSOLE = open(os.devnull, "w")
+
+
+def notify(data):
+    """Stands in for MessageBridge.rta_distortion_received.emit."""
+
+
+def make_payloads(count, seed=0):
+    rng = np.random.default_rng(seed)
+    harmonics = [{"frequency": 1000.0 * h, "dBFS": -60.0 - h, "percent": 0.01 / h} for h in range(2, 11)]
+    return [{
+        "nanotime": i,
+        "totalSamplesProcessed": 65536 + 4096 * i,
+        "fundamentalFrequency": 1000.0,
+        "fundamentaldBFS": -12.0,
+        "thd": {"value": float(0.05 + rng.normal(0, 0.002))},
+        "thdPlusN": {"value": float(0.08 + rng.normal(0, 0.002))},
+        "snrdB": float(92 + rng.normal(0, 0.5)),
+        "enob": 15.0,
+        "imd": {"value": 0.01},
+        "gaindB": 0.0,
+        "harmonics": harmonics,
+        "coherentAveraging": False,
+        "averages": i,
+    } for i in range(count)]
+
+
+def ingest_dicts(payloads):
+    """The dict path: processed dict per callback, copied again into the sample list."""
+    samples = []
+    start = time.time()
+    for d in payloads:
+        processed = {
+            "timestamp": d.get("nanotime", 0),
+            "samples_processed": d.get("totalSamplesProcessed", 0),
+            "fundamental_freq": d.get("fundamentalFrequency", 0),
+            "fundamental_dbfs": d.get("fundamentaldBFS", 0),
+            "thd_percent": d.get("thd", {}).get("value", 0),
+            "thd_plus_n_percent": d.get("thdPlusN", {}).get("value", 0),
+            "snr_db": d.get("snrdB", 0),
+            "enob": d.get("enob", 0),
+            "imd_percent": d.get("imd", {}).get("value", 0),
+            "gain_db": d.get("gaindB", 0),
+            "harmonics": d.get("harmonics", []),
+            "coherent_averaging": d.get("coherentAveraging", False),
+            "averages": d.get("averages", 0),
+        }
+        notify(processed)
+        print(f"RTA Update: THD={processed['thd_percent']:.3f}%, SNR={processed['snr_db']:.1f}dB, "
+              f"ENOB={processed['enob']:.1f}", file=CONSOLE)
+        samples.append({"elapsed_time": time.time() - start, **processed})
+    return samples
+
+
+def analyze_dicts(samples):
+    stable = samples[len(samples) // 4:]
+    thd = [s["thd_percent"] for s in stable]
+    snr = [s["snr_db"] for s in stable]
+    return np.mean(thd), np.max(thd), np.std(thd), np.mean(snr), np.min(snr)
+
+
+def ingest_buffer(payloads, notify_interval):
+    buffer = RTARingBuffer(capacity=max(4096, len(payloads)))
+    throttle = Throttle(notify_interval)
+    # Replayed at REW's pace: 64k FFT, 93.75% overlap at 48 kHz
+    now, period = 0.0, 4096 / 48000.0
+    for d in payloads:
+        cursor = buffer.append(d)
+        now += period
+        if throttle.ready(now):
+            processed = buffer.as_dict(cursor)
+            notify(processed)
+            print(f"RTA Update: THD={processed['thd_percent']:.3f}%, SNR={processed['snr_db']:.1f}dB, "
+                  f"ENOB={processed['enob']:.1f}", file=CONSOLE)
+    return buffer
+
+
+def append_only(payloads):
+    buffer = RTARingBuffer(capacity=max(4096, len(payloads)))
+    for d in payloads:
+        buffer.append(d)
+    return buffer
+
+
+def analyze_buffer(buffer):
+    rows, _ = buffer.since(0)
+    stable = rows[len(rows) // 4:]
+    thd = stable["thd"].astype(np.float64)
+    return thd.mean(), thd.max(), thd.std(), stable["snr"].mean(dtype=np.float64), stable["snr"].min()
+
+
+def running_stats(buffer):
+    """Per-row updates as RTAVerificationCoordinator.add_sample does them."""
+    rows, _ = buffer.since(0)
+    stable = rows[len(rows) // 4:]
+    thd, snr = RunningStats(), RunningStats()
+    for row in stable:
+        thd.add(float(row["thd"]))
+        snr.add(float(row["snr"]))
+    return thd.mean, thd.max, thd.std, snr.mean, snr.min
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--notify-interval", type=float, default=0.25, help="GUI update interval (s)")
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.updates)
+    t_dict, samples = timed(lambda: ingest_dicts(payloads), args.repeat)
+    t_append, _ = timed(lambda: append_only(payloads), args.repeat)
+    t_buf, buffer = timed(lambda: ingest_buffer(payloads, args.notify_interval), args.repeat)
+    a_dict, expected = timed(lambda: analyze_dicts(samples), args.repeat)
+    a_buf, got = timed(lambda: analyze_buffer(buffer), args.repeat)
+    t_stats, streamed = timed(lambda: running_stats(buffer), args.repeat)
+
+    n = args.updates
+    print(f"{n} updates")
+    print(f"  ingest  dicts: {t_dict / n * 1e6:6.2f} us/update   ring buffer: {t_buf / n * 1e6:6.2f} us/update"
+          f"  (append alone {t_append / n * 1e6:.2f})")
+    print(f"  analyze dicts: {a_dict * 1000:6.2f} ms          ring buffer: {a_buf * 1000:6.2f} ms")
+    print(f"  running stats (THD, SNR): {t_stats / (n - n // 4) * 1e6:6.2f} us/update, summary O(1)")
+    print(f"  ring buffer memory: {buffer.rows.nbytes + buffer.harmonics.nbytes} bytes, fixed")
+
+    ok = np.allclose(expected, got, rtol=1e-5) and np.allclose(expected, streamed, rtol=1e-5)
+    print("\nresults match" if ok else "\nresults differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time-to-first-paint of the Qrew main window.
+
+Launches ``python -m qrew`` repeatedly with QREW_PROFILE_STARTUP=1 and
+QREW_EXIT_AFTER_PAINT=1, so each run quits as soon as the main window
+has painted, and reports process-spawn -> first-paint plus the median
+of every phase recorded by Qrew_startup.  REW must be running, otherwise
+the connection dialog holds start-up (the 'rew_check' phase).
+
+    python benchmarks/startup_time.py [--runs 5] [--timeout 60] [--output results.json]
+
+``--imports`` instead runs ``python -X importtime`` over qrew.main and
+lists the slowest modules; it needs no REW and no display.
+
+    python benchmarks/startup_time.py --imports [--top 25]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+REPORT_PREFIX = "QREW_STARTUP_PROFILE "
+
+
+def run_once(timeout):
+    env = dict(os.environ, QREW_PROFILE_STARTUP="1", QREW_EXIT_AFTER_PAINT="1")
+    spawned = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-m", "qrew"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith(REPORT_PREFIX):
+            report = json.loads(line[len(REPORT_PREFIX):])
+            report["interpreter"] = report["start_wall"] - spawned
+            report["time_to_first_paint"] = report["first_paint_wall"] - spawned
+            return report
+    raise RuntimeError(
+        f"no startup profile in output (exit code {proc.returncode}):\n"
+        + proc.stdout[-2000:]
+        + proc.stderr[-2000:]
+    )
+
+
+def bench_first_paint(args):
+    reports = []
+    for i in range(args.runs):
+        report = run_once(args.timeout)
+        reports.append(report)
+        print(f"run {i + 1}: first paint after {report['time_to_first_paint']:.3f} s")
+
+    print(f"\nmedian over {len(reports)} runs (seconds since spawn):")
+    ttfp = statistics.median(r["time_to_first_paint"] for r in reports)
+    print(f"   {'interpreter':<20} {statistics.median(r['interpreter'] for r in reports):7.3f}")
+    phases = []
+    for report in reports:
+        for phase in report["phases"]:
+            if phase not in phases:
+                phases.append(phase)
+    for phase in phases:
+        values = [
+            r["interpreter"] + r["phases"][phase] for r in reports if phase in r["phases"]
+        ]
+        print(f"   {phase:<20} {statistics.median(values):7.3f}")
+    print(f"\ntime to first paint: {ttfp:.3f} s")
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump({"time_to_first_paint": ttfp, "runs": reports}, fh, indent=2)
+        print(f"results written to {args.output}")
+
+
+def bench_imports(args):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {args.module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    if proc.returncode != 0:
+        print(proc.stderr.splitlines()[-1] if proc.stderr else "import failed")
+    if not rows:
+        return
+
+    total = max(rows)[0]
+    print(f"import {args.module}: {total / 1e6:.3f} s total\n")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"{cumulative_us / 1e3:10.1f}ms {self_us / 1e3:8.1f}ms {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="write per-run results as JSON")
+    parser.add_argument("--imports", action="store_true", help="import-time breakdown")
+    parser.add_argument("--module", default="qrew.main")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    if args.imports:
+        bench_imports(args)
+    else:
+        bench_first_paint(args)
+
+
+if __name__ == "__main__":
+    main()
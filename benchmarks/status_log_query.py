@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Status log monitoring cost benchmark.
+
+Replays a session of REW status lines into Qrew_status_log.StatusLog and
+compares what one open /rew-status browser tab costs the server:
+
+* the page it replaced - a deque(maxlen=100) rendered to a full HTML page
+  on every request, with the page reloading itself every second (kept
+  below as the reference);
+* /status-log long-polling - one JSON response per batch of new entries,
+  built from the since-cursor.
+
+It also checks that the incremental client ends up with the same latest
+100 lines as the old page showed.
+
+    python benchmarks/status_log_query.py [--events 2000] [--rate 20]
+                                          [--repeat 5]
+
+--rate is status lines per second, e.g. 20 for sweep progress.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "qrew"))
+
+from Qrew_status_log import StatusLog  # noqa: E402
+
+
+def render_page(status_log):
+    """The auto-reloading page this benchmark compares against (markup trimmed)."""
+    log_html = "<br>".join(f'<div class="entry">{msg}</div>' for msg in status_log)
+    return f"""
+    <html><head><title>REW Live Status</title>
+    <script>setTimeout(function () {{ window.location.reload(); }}, 1000);</script>
+    </head><body><h2>REW Status Log (Live)</h2><div class="log">{log_html}</div></body></html>
+    """
+
+
+def make_session(events, rate):
+    """(time, kind, text) of a session: noise floor, sweeps, the odd warning."""
+    session = []
+    for i in range(events):
+        t = i / rate
+        if i % 250 == 249:
+            session.append((t, "warning", f"Low signal-to-noise ratio - SNR {30 + i % 20} dB"))
+        elif i % 125 < 20:
+            session.append((t, "progress", f"Capturing noise floor {(i % 125) * 5}%"))
+        else:
+            session.append((t, "progress", f"{(i % 125) - 20}% Measuring, sweep 1 of 1"))
+    return session
+
+
+def old_page(session):
+    """Requests, bytes and the last page of a tab reloading once a second."""
+    log = deque(maxlen=100)
+    requests = sent = 0
+    next_reload = 0.0
+    page = ""
+    for t, kind, text in session:
+        while next_reload <= t:
+            page = render_page(log)
+            requests += 1
+            sent += len(page.encode("utf-8"))
+            next_reload += 1.0
+        log.appendleft(f"WARNING: {text}" if kind == "warning" else text)
+    page = render_page(log)
+    return requests + 1, sent + len(page.encode("utf-8")), list(log)
+
+
+def long_poll(session, min_interval=1.0):
+    """
+    Requests, bytes and the latest 100 lines of a tab long-polling
+    /status-log: an answer goes out as soon as an entry arrives, but the
+    page polls at most every *min_interval* s, so bursts share one.
+    """
+    log = StatusLog()
+    shown = deque(maxlen=100)
+    requests = sent = 0
+    cursor = None
+    last = -min_interval
+
+    def respond():
+        nonlocal requests, sent, cursor
+        entries, cursor = log.since(cursor)
+        sent += len(json.dumps({"entries": entries, "next": cursor, "oldest": log.oldest}))
+        requests += 1
+        shown.extendleft(f"WARNING: {e['text']}" if e["kind"] == "warning" else e["text"] for e in entries)
+
+    respond()  # page load
+    for t, kind, text in session:
+        if cursor < log.count and t >= last + min_interval:
+            respond()
+            last = t
+        log.append(kind, text, "FL", 3)
+    respond()
+    return requests, sent, list(shown)
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=20.0, help="status lines per second")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    session = make_session(args.events, args.rate)
+    duration = session[-1][0]
+    t_old, (req_old, bytes_old, lines_old) = timed(lambda: old_page(session), args.repeat)
+    t_new, (req_new, bytes_new, lines_new) = timed(lambda: long_poll(session), args.repeat)
+
+    print(f"{args.events} status lines over {duration:.0f}s, one monitoring tab")
+    print(f"  reloading page: {req_old:6d} requests {bytes_old / 1024:9.1f} KiB  server {t_old * 1000:8.2f} ms")
+    print(f"  long-poll JSON: {req_new:6d} requests {bytes_new / 1024:9.1f} KiB  server {t_new * 1000:8.2f} ms")
+    print("  (server time: rendering or querying, plus appending to the log)")
+
+    ok = lines_old == lines_new
+    print("\nresults match" if ok else "\nresults differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
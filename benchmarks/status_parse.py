@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+REW status line parsing check and benchmark.
+
+Times Qrew_status_events.parse_status on a synthetic measurement's
+/rew-status bodies against two references kept below:
+
+* the substring chain /rew-status ran before typed events (strip the
+  quotes, then a series of ``in`` tests);
+* the single unanchored regex parse_status used before it dispatched on
+  the leading token.
+
+parse_status keeps each distinct progress body it has parsed, so the
+best-of timing is the warm case every sweep after the first one sees.
+
+It also checks that parse_status classifies every line (event type,
+percentage, progress text) exactly like that regex did.
+
+    python benchmarks/status_parse.py [--sweeps 20] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "qrew"))
+
+from Qrew_status_events import parse_status  # noqa: E402
+
+_ERROR_WORDS = r"error|fail(?:ed|ure)?|time(?:d)?\s*out|cannot|can't|unable|invalid"
+_OPERATIONS = r"measurement|capture|sweep|playback|recording|process(?:ing)?|input|output"
+_STATUS_RE = re.compile(
+    r"(?:(?P<complete>\s*100\s*%\s*Measurement complete)"
+    r"|.*?Capturing noise floor\W*(?P<noise_pct>\d{1,3})\s*%"
+    r"|.*?(?P<abort>Measurement (?:aborted|cancell?ed))"
+    r"|(?P<error>\W*(?:" + _ERROR_WORDS + r")\b"
+    r"|.*?\b(?:" + _OPERATIONS + r")\s+(?:" + _ERROR_WORDS + r")\b)"
+    r"|(?P<pct_prefix>.*?)(?P<sweep_pct>\d{1,3})\s*%)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def regex_classify(body):
+    """The regex classifier (type name, percent, text) this benchmark checks against."""
+    body = body.strip()
+    msg = json.loads(body) if body.startswith('"') else body
+    match = _STATUS_RE.match(msg)
+    if match is None:
+        return "StatusMessage", None, None
+    if match.group("complete") is not None:
+        return "MeasurementComplete", None, None
+    if match.group("noise_pct") is not None:
+        return "NoiseFloorProgress", int(match.group("noise_pct")), None
+    if match.group("abort") is not None:
+        return "Abort", None, None
+    if match.group("error") is not None:
+        return "Error", None, None
+    text = (match.group("pct_prefix") + msg[match.end():]).strip(" .-:")
+    return "SweepProgress", int(match.group("sweep_pct")), text
+
+
+def substring_chain(body):
+    """The pre-typed-event handler's tests (classification only)."""
+    msg = body.strip('"')
+    if "Capturing noise floor...100%" in msg:
+        return "noise"
+    elif "100% Measurement complete" in msg:
+        return "complete"
+    elif "Waiting for timing reference" in msg and "6%" in msg:
+        return "timing"
+    elif "Remaining sweeps: 1" in msg and "8%" in msg:
+        return "sweep"
+    elif "Measurement aborted" in msg or "Measurement cancelled" in msg:
+        return "abort"
+    elif any(p in msg.lower() for p in ["error", "failed", "timeout", "cannot", "unable", "invalid"]):
+        return "error"
+    return None
+
+
+def describe(event):
+    return (
+        type(event).__name__,
+        getattr(event, "percent", None),
+        getattr(event, "text", None),
+    )
+
+
+def make_bodies(sweeps):
+    lines = []
+    for _ in range(sweeps):
+        lines += [f"Capturing noise floor {p}%" for p in range(0, 101, 5)]
+        lines += ["Waiting for timing reference 6%", "Remaining sweeps: 1 8%"]
+        lines += [f"{p}% Measuring, sweep 1 of 1" for p in range(101)]
+        lines.append("100% Measurement complete")
+    lines += [
+        "Measurement aborted", "40% Measurement cancelled by user", "Error: input device lost",
+        "Capture failed", "Sweep timed out at 50%", "FL_error_pos0 saved", "Idle",
+        "Playback  error", "  12 %  Processing...", "Loaded 1234% gain", "He said \"hi\" 5%",
+    ]
+    return [json.dumps(line) for line in lines]
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sweeps", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bodies = make_bodies(args.sweeps)
+    n = len(bodies)
+    t_chain = timed(lambda: [substring_chain(b) for b in bodies], args.repeat)
+    t_regex = timed(lambda: [regex_classify(b) for b in bodies], args.repeat)
+    t_new = timed(lambda: [parse_status(b) for b in bodies], args.repeat)
+
+    print(f"{n} status bodies")
+    print(f"  substring chain:  {t_chain / n * 1e6:6.2f} us/line  (classification only)")
+    print(f"  single regex:     {t_regex / n * 1e6:6.2f} us/line")
+    print(f"  parse_status:     {t_new / n * 1e6:6.2f} us/line  (builds the typed event)")
+
+    mismatches = [(b, regex_classify(b), describe(parse_status(b)))
+                  for b in bodies if regex_classify(b) != describe(parse_status(b))]
+    for body, expected, got in mismatches[:10]:
+        print(f"  {body}: expected {expected}, got {got}")
+    ok = not mismatches
+    print("\nresults match" if ok else "\nresults differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
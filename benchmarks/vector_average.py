@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Local vector average check and benchmark.
+
+Times Qrew_vector_average.stack_frequency_responses plus the complex
+mean against the per-measurement path of
+misc_assets/rew_cross_align_FR_v2.py (list-comprehension frequency grid,
+one decode and phase correction per response, np.mean over a list; kept
+below as the reference), and checks that both give the same average.
+
+    python benchmarks/vector_average.py [--positions 9 32] [--ppo 48 96 384]
+                                        [--repeat 20] [--tolerance 1e-4]
+
+Responses cover 1 Hz to 24 kHz (about 15 octaves) at each --ppo.
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "qrew"))
+
+from Qrew_vector_average import rew_frequencies, stack_frequency_responses  # noqa: E402
+
+START_FREQ = 1.0
+OCTAVES = 14.55  # 1 Hz .. 24 kHz
+
+
+def average_loops(fr_jsons, shifts):
+    """The per-measurement version this benchmark compares against."""
+    responses = []
+    for fr, shift in zip(fr_jsons, shifts):
+        step = 2 ** (1.0 / fr["ppo"])
+        magnitudes_db = np.frombuffer(base64.b64decode(fr["magnitude"]), dtype=">f4")
+        phases_deg = np.frombuffer(base64.b64decode(fr["phase"]), dtype=">f4")
+        frequencies = np.array([fr["startFreq"] * (step**i) for i in range(len(magnitudes_db))])
+        response = 10 ** (magnitudes_db / 20.0) * np.exp(1j * np.radians(phases_deg))
+        if shift != 0:
+            response = response * np.exp(1j * 2 * np.pi * frequencies * shift)
+        responses.append(response)
+    return np.mean(responses, axis=0)
+
+
+def make_responses(positions, ppo, seed=0):
+    """Responses of one speaker at *positions* mic positions, each with its own delay."""
+    rng = np.random.default_rng(seed)
+    points = int(OCTAVES * ppo) + 1
+    frequencies = rew_frequencies(START_FREQ, ppo, points)
+    base = 1 / (1 + 1j * frequencies / 8000.0) * (1 + 0.2j * frequencies / 40.0) / (1 + 1j * frequencies / 40.0)
+    delays = [0.0] + list(rng.uniform(-2e-3, 2e-3, positions - 1))
+    fr_jsons = []
+    for delay in delays:
+        response = base * np.exp(-2j * np.pi * frequencies * delay)
+        response *= 10 ** (rng.normal(0.0, 1.0, points) / 20.0)  # position-dependent ripple
+        fr_jsons.append({
+            "startFreq": START_FREQ,
+            "ppo": ppo,
+            "magnitude": base64.b64encode(
+                (20 * np.log10(np.abs(response))).astype(">f4").tobytes()).decode("ascii"),
+            "phase": base64.b64encode(
+                np.degrees(np.angle(response)).astype(">f4").tobytes()).decode("ascii"),
+        })
+    return fr_jsons, delays
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def run_case(positions, ppo, repeat, tolerance):
+    fr_jsons, delays = make_responses(positions, ppo)
+
+    def stacked():
+        matrix, _, _ = stack_frequency_responses(fr_jsons, delays)
+        return matrix.mean(axis=0, dtype=np.complex128)
+
+    t_loop, expected = timed(lambda: average_loops(fr_jsons, delays), repeat)
+    rew_frequencies.cache_clear()
+    t_vec, got = timed(stacked, repeat)
+    err = np.max(np.abs(got - expected)) / np.max(np.abs(expected))
+    print(f"{positions:>9} {ppo:>5} {t_loop * 1000:8.2f}ms {t_vec * 1000:8.2f}ms "
+          f"{t_loop / t_vec:8.1f}x {err:12.2e}")
+    return bool(err <= tolerance)  # False for NaN as well
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--positions", type=int, nargs="+", default=[9, 32])
+    parser.add_argument("--ppo", type=int, nargs="+", default=[48, 96, 384])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="max relative error")
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'positions':>9} {'ppo':>5} {'loops':>10} {'stacked':>10} {'speed-up':>9} {'max rel err':>12}")
+    for positions in args.positions:
+        for ppo in args.ppo:
+            ok &= run_case(positions, ppo, args.repeat, args.tolerance)
+
+    print("\nresults match" if ok else "\nresults differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
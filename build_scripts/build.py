@@ -256,6 +256,8 @@ def verify_qrew_modules():
     required_modules = [
         "qrew.Qrew",
         "qrew.Qrew_api_helper",
+        "qrew.Qrew_rew_client",
+        "qrew.Qrew_measurement_index",
         "qrew.Qrew_message_handlers",
         "qrew.Qrew_common",
         "qrew.Qrew_styles",
@@ -264,6 +266,16 @@ def verify_qrew_modules():
         "qrew.Qrew_workers_v2",
         "qrew.Qrew_settings",
         "qrew.Qrew_measurement_metrics",
+        "qrew.Qrew_batch_metrics",
+        "qrew.Qrew_startup",
+        "qrew.Qrew_status_events",
+        "qrew.Qrew_callback_server",
+        "qrew.Qrew_rta_buffer",
+        "qrew.Qrew_status_log",
+        "qrew.Qrew_processing_scheduler",
+        "qrew.Qrew_cross_align",
+        "qrew.Qrew_vector_average",
+        "qrew.Qrew_quality_cache",
         "qrew.Qrew_micwidget_icons",
         "qrew.Qrew_vlc_helper_v2",
         "qrew.Qrew_messagebox",
@@ -432,6 +444,8 @@ def generate_pyinstaller_spec():
         "qrew",
         "qrew.Qrew",
         "qrew.Qrew_api_helper",
+        "qrew.Qrew_rew_client",
+        "qrew.Qrew_measurement_index",
         "qrew.Qrew_message_handlers",
         "qrew.Qrew_common",
         "qrew.Qrew_styles",
@@ -440,16 +454,23 @@ def generate_pyinstaller_spec():
         "qrew.Qrew_workers_v2",
         "qrew.Qrew_settings",
         "qrew.Qrew_measurement_metrics",
+        "qrew.Qrew_batch_metrics",
+        "qrew.Qrew_startup",
+        "qrew.Qrew_status_events",
+        "qrew.Qrew_callback_server",
+        "qrew.Qrew_rta_buffer",
+        "qrew.Qrew_status_log",
+        "qrew.Qrew_processing_scheduler",
+        "qrew.Qrew_cross_align",
+        "qrew.Qrew_vector_average",
+        "qrew.Qrew_quality_cache",
         "qrew.Qrew_micwidget_icons",
         "qrew.Qrew_vlc_helper_v2",
         "qrew.Qrew_messagebox",
         "qrew.Qrew_resources",
         # External
         "requests",
-        "flask",
-        "gevent",
         "numpy",
-        "pandas",
         "vlc",
         "colour",
         # PyQt5 modules
@@ -485,6 +506,7 @@ def generate_pyinstaller_spec():
         "pkg_resources",
         "wheel",
         "pip",
+        "pandas",  # no longer used; keep it out if installed alongside
     ]
 
     # Add Linux-specific excludes
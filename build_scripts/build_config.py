@@ -71,10 +71,7 @@ DATA_FILES = [
 
 HIDDEN_IMPORTS = [
     "requests",
-    "flask",
-    "gevent",
     "numpy",
-    "pandas",
     "vlc",
     "colour",
     "PyQt5.sip",
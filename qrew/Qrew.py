@@ -1,6 +1,5 @@
 # Qrew.py
 import os
-import re
 import sys
 import time
 import faulthandler
@@ -59,7 +58,7 @@ try:
         combine_and_score_metrics,
     )
 
-    from .Qrew_workers_v2 import MeasurementWorker, ProcessingWorker
+    from .Qrew_workers_v2 import MeasurementWorker, ProcessingWorker, QualityLoaderWorker
     from .Qrew_styles import (
         GLOBAL_STYLE,
         COMBOBOX_STYLE,
@@ -78,8 +77,9 @@ try:
     from .Qrew_messagebox import QrewMessageBox
 
     from .Qrew_message_handlers import (
-        run_flask_server,
-        stop_flask_server,
+        run_callback_server,
+        stop_callback_server,
+        wait_for_callback_server,
         message_bridge,
         #  rta_coordinator,
     )
@@ -128,7 +128,7 @@ except ImportError:
         combine_and_score_metrics,
     )
 
-    from Qrew_workers_v2 import MeasurementWorker, ProcessingWorker
+    from Qrew_workers_v2 import MeasurementWorker, ProcessingWorker, QualityLoaderWorker
     from Qrew_styles import (
         GLOBAL_STYLE,
         COMBOBOX_STYLE,
@@ -147,8 +147,9 @@ except ImportError:
     from Qrew_messagebox import QrewMessageBox
 
     from Qrew_message_handlers import (
-        run_flask_server,
-        stop_flask_server,
+        run_callback_server,
+        stop_callback_server,
+        wait_for_callback_server,
         message_bridge,
         # rta_coordinator,
     )
@@ -762,6 +763,7 @@ class MainWindow(QMainWindow):
         # Worker thread
         self.measurement_worker = None
         self.processing_worker = None
+        self.quality_loader = None
         message_bridge.message_received.connect(self.update_status)
         message_bridge.warning_received.connect(self.add_warning)
         message_bridge.error_received.connect(self.add_error)
@@ -1626,20 +1628,10 @@ class MainWindow(QMainWindow):
         for channel, measurements in channels_with_data.items():
             channels_with_uuids[channel] = [m["uuid"] for m in measurements]
 
-        # Determine starting step based on mode
-        if mode == "cross_corr_only":
-            start_step = "cross_corr"
-        elif mode == "vector_avg_only":
-            start_step = "vector_avg"
-        else:  # 'full'
-            start_step = "cross_corr"
-
-        # Initialize processing state
+        # Initialize processing state; mode is a ProcessingScheduler preset
         self.processing_state = {
             "channels": list(channels_with_data.keys()),
             "channel_measurements": channels_with_data,
-            "current_step": start_step,
-            "channel_index": 0,
             "running": True,
             "mode": mode,
         }
@@ -1681,7 +1673,9 @@ class MainWindow(QMainWindow):
             and self.processing_worker.isRunning()
         ):
             self.processing_worker.stop()
-        stop_flask_server()  # make sure the port is released
+        if self.quality_loader and self.quality_loader.isRunning():
+            self.quality_loader.stop()
+        stop_callback_server()  # make sure the port is released
         super().closeEvent(event)  # default tidy-up
 
     #  event.accept()
@@ -1855,62 +1849,48 @@ class MainWindow(QMainWindow):
             )
 
     def load_existing_measurement_qualities(self):
-        """Load quality data for existing measurements (useful when restarting the app)."""
-        try:
-            measurements, _ = get_all_measurements_with_uuid()
-            if not measurements:
-                return
+        """Load quality data for existing measurements (useful when restarting the app).
 
-            for measurement in measurements:
-                title = measurement.get("title", "")
-                uuid = measurement.get("uuid", "")
-
-                # Parse channel and position from title
-                for channel in SPEAKER_LABELS.keys():
-                    pattern = rf"^{re.escape(channel)}_pos(\d+)$"
-                    match = re.match(pattern, title, re.IGNORECASE)
-                    if match:
-                        position = int(match.group(1))
-
-                        # Try to get quality metrics for this measurement
-                        try:
-                            measurement_data = get_measurement_by_uuid(uuid)
-                            distortion_data = get_measurement_distortion_by_uuid(uuid)
-                            ir_response = get_ir_for_measurement(uuid)
-                            if measurement_data and distortion_data:
-                                freq_metrics = evaluate_measurement(
-                                    distortion_data, measurement_data, None
-                                )
-                                rew_metrics = calculate_rew_metrics_from_ir(ir_response)
-                                combined_score = combine_and_score_metrics(
-                                    rew_metrics, freq_metrics
-                                )
-                                result = {
-                                    "score": combined_score["score"],
-                                    "rating": combined_score["rating"],
-                                    "detail": {
-                                        **freq_metrics["detail"],
-                                        **rew_metrics["detail"],
-                                    },
-                                }
-                                if result:
-                                    self.measurement_qualities[(channel, position)] = {
-                                        "rating": result.get("rating", "Unknown"),
-                                        "score": result.get("score", 0),
-                                        "uuid": uuid,
-                                        "detail": result.get("detail", None),
-                                        "title": title,
-                                    }
-                        except Exception as e:
-                            print(f"Could not evaluate quality for {title}: {e}")
-                        break
-
-            print(
-                f"Loaded quality data for {len(self.measurement_qualities)} existing measurements"
-            )
+        Runs in a QualityLoaderWorker; results stream in through
+        on_existing_quality_loaded so the window stays usable.
+        """
+        if self.quality_loader and self.quality_loader.isRunning():
+            return
 
-        except Exception as e:
-            print(f"Error loading existing measurement qualities: {e}")
+        self.quality_loader = QualityLoaderWorker(
+            skip_keys=self.measurement_qualities.keys()
+        )
+        self.quality_loader.quality_loaded.connect(self.on_existing_quality_loaded)
+        self.quality_loader.progress.connect(self.on_quality_load_progress)
+        self.quality_loader.status_update.connect(self.update_status)
+        self.quality_loader.finished.connect(self.on_quality_load_finished)
+        self.quality_loader.start()
+
+    def on_existing_quality_loaded(self, result: dict):
+        """Store one re-scored measurement from the background loader."""
+        key = (result["channel"], result["position"])
+        existing = self.measurement_qualities.get(key)
+        if existing and existing.get("uuid") != result["uuid"]:
+            return  # a newer capture was scored while we were loading
+
+        self.measurement_qualities[key] = {
+            "rating": result.get("rating", "Unknown"),
+            "score": result.get("score", 0),
+            "uuid": result["uuid"],
+            "detail": result.get("detail", None),
+            "title": result["title"],
+        }
+
+    def on_quality_load_progress(self, done: int, total: int):
+        if done == total:
+            self.update_status(f"Loaded quality data for {total} existing measurements")
+        else:
+            self.update_status(f"Loading quality data... {done}/{total}")
+
+    def on_quality_load_finished(self):
+        if self.quality_loader:
+            self.quality_loader.wait()  # run() is returning; let the thread exit
+            self.quality_loader = None
 
     def show_measurement_quality_dialog(self, measurement_info):
         """Show quality dialog and handle user choice"""
@@ -2316,7 +2296,7 @@ def wait_for_rew_qt():
 
 def shutdown_handler(signum, frame):
     print("🔔 Signal received – shutting down …")
-    stop_flask_server()
+    stop_callback_server()
     QApplication.quit()  # orderly Qt shutdown
 
 
@@ -2324,11 +2304,10 @@ if __name__ == "__main__":
     signal.signal(signal.SIGINT, shutdown_handler)
     signal.signal(signal.SIGTERM, shutdown_handler)
 
-    # Start Flask in a background thread
-    flask_thread = Thread(target=run_flask_server, daemon=True)
-    flask_thread.start()
-
-    time.sleep(1)
+    # Start the REW callback server in a background thread
+    server_thread = Thread(target=run_callback_server, daemon=True)
+    server_thread.start()
+    wait_for_callback_server()
 
     # Create Qt application
     app = QApplication(sys.argv)
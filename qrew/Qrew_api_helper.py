@@ -5,17 +5,34 @@ This module provides functions to interact with the REW (Room EQ Wizard) API for
 It includes functions to start measurements, process results, and manage subscriptions for status updates, warnings, and errors.
 """
 import requests
+import base64
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 try:
     from .Qrew_vlc_helper_v2 import find_sweep_file
     from .Qrew_common import REW_API_BASE_URL
+    from .Qrew_rew_client import rew_client
+    from .Qrew_measurement_index import measurement_index, group_measurements_by_channel, canonical_channel
     from . import Qrew_common
 except ImportError:
     from Qrew_vlc_helper_v2 import find_sweep_file
     from Qrew_common import REW_API_BASE_URL
+    from Qrew_rew_client import rew_client
+    from Qrew_measurement_index import measurement_index, group_measurements_by_channel, canonical_channel
     import Qrew_common
 
+def _callback_url(path):
+    """
+    URL of *path* on Qrew's callback server, on whatever port it bound
+    (imported here: Qrew_message_handlers imports this module).
+    """
+    try:
+        from .Qrew_message_handlers import callback_url
+    except ImportError:
+        from Qrew_message_handlers import callback_url
+    return callback_url(path)
+
 # Helper functions 
 def get_measurements_for_channel(channel):
     """
@@ -27,21 +44,11 @@ def get_measurements_for_channel(channel):
         if not measurements:
             return []
         
-        channel_measurements = []
-        
-        for measurement in measurements:
-            title = measurement.get('title', '')
-            # Match pattern: channel_pos# (e.g., "FL_pos0", "FR_pos1")
-            pattern = rf'^{re.escape(channel)}_pos(\d+)$'
-            match = re.match(pattern, title, re.IGNORECASE)
-            
-            if match:
-                position = int(match.group(1))
-                measurement_id = measurement['id']
-                channel_measurements.append((measurement_id, position))
-        
-        # Sort by position (0 first, then 1, 2, etc.)
-        channel_measurements.sort(key=lambda x: x[1])
+        grouped = group_measurements_by_channel(measurements)
+        channel_measurements = [
+            (measurement['id'], position)
+            for position, measurement in grouped.get(canonical_channel(channel), [])
+        ]
         
         return channel_measurements
         
@@ -94,7 +101,8 @@ def get_cross_corr_result():
 # Updated start_capture function with proper error handling
 def start_capture(channel, position, status_callback=None, error_callback=None):
     """
-    Start capture process. Returns (success, error_message).
+    Start capture process. Returns (capture, error_message), where capture
+    is a CaptureHandle on success (see start_measurement) and False otherwise.
     Uses callbacks instead of direct message boxes for thread safety.
     """
     #global selected_stimulus_path, stimulus_dir
@@ -135,24 +143,33 @@ def start_capture(channel, position, status_callback=None, error_callback=None):
         return False, err_msg
 
     # Start measurement using REW API
-    success, err_msg = start_measurement(sample_name, stimulus_path, status_callback=status_callback, error_callback=error_callback)
+    capture, err_msg = start_measurement(sample_name, stimulus_path, status_callback=status_callback, error_callback=error_callback)
 
-    return success, err_msg
+    return capture, err_msg
 
 def start_measurement(sample_name, stimulus_path, status_callback=None, error_callback=None):
+    """
+    Configure REW and start a single measurement titled *sample_name*.
+
+    Returns (capture, error_message).  capture is a CaptureHandle whose
+    resolve() yields the UUID of the new measurement once REW reports it
+    complete, so callers never depend on REW's current selection.
+    """
     try:
+        capture = measurement_index.begin_capture(sample_name)
+
         # Configure REW via API
-        requests.post(f"{REW_API_BASE_URL}/measure/measurement-mode", json="Single").raise_for_status()
-        requests.post(f"{REW_API_BASE_URL}/measure/naming", json={"title": sample_name, "namingOption": "Use as entered", "prefixMeasNameWithOutput": "false"}).raise_for_status()
-        requests.post(f"{REW_API_BASE_URL}/measure/playback-mode", json="From file").raise_for_status()
-        requests.post(f"{REW_API_BASE_URL}/measure/timing/reference", json="Acoustic").raise_for_status()
-        requests.post(f"{REW_API_BASE_URL}/measure/file-playback-stimulus", json=stimulus_path).raise_for_status()
-        requests.post(f"{REW_API_BASE_URL}/generator/signal", json={"signal": "meassweep"}).raise_for_status()
+        rew_client.post("/measure/measurement-mode", json="Single")
+        rew_client.post("/measure/naming", json={"title": sample_name, "namingOption": "Use as entered", "prefixMeasNameWithOutput": "false"})
+        rew_client.post("/measure/playback-mode", json="From file")
+        rew_client.post("/measure/timing/reference", json="Acoustic")
+        rew_client.post("/measure/file-playback-stimulus", json=stimulus_path)
+        rew_client.post("/generator/signal", json={"signal": "meassweep"})
 
         # Do NOT launch sweep or trigger next — handled by REW status subscriber
-        requests.post(f"{REW_API_BASE_URL}/measure/command", json={"command": "SPL"}).raise_for_status()
+        rew_client.post("/measure/command", json={"command": "SPL"})
 
-        return True, None
+        return capture, None
 
     except requests.RequestException as e:
         err_msg = f"Error starting measurement '{sample_name}': {e}"
@@ -178,7 +195,7 @@ def cancel_measurement(status_callback=None, error_callback=None):
         if status_callback:
             status_callback('Cancelling measurement...')
 
-        requests.post(f"{REW_API_BASE_URL}/measure/command", json={"command": "Cancel"}).raise_for_status()
+        rew_client.post("/measure/command", json={"command": "Cancel"})
 
         return True, None
     
@@ -199,8 +216,7 @@ def cancel_measurement(status_callback=None, error_callback=None):
 
 def get_ir_for_measurement(measurement_uuid):
     try:
-        response = requests.get(f"{REW_API_BASE_URL}/measurements/{measurement_uuid}/impulse-response?normalised=false")
-        response.raise_for_status()
+        response = rew_client.get(f"/measurements/{measurement_uuid}/impulse-response?normalised=false")
         ir = response.json()
 
         if not ir:
@@ -216,18 +232,86 @@ def get_ir_for_measurement(measurement_uuid):
         print(f"Error parsing impulse response for {measurement_uuid}: {e}")
         return None
     
+def get_frequency_response(measurement_uuid, smoothing="None"):
+    """
+    Unsmoothed frequency response of a measurement as REW returns it
+    (startFreq, ppo and base64 magnitude/phase), or None on failure.
+    """
+    try:
+        response = rew_client.get(
+            f"/measurements/{measurement_uuid}/frequency-response",
+            params={"smoothing": smoothing},
+        )
+        fr = response.json()
+
+        if not fr or "magnitude" not in fr:
+            print(f"No frequency response found for UUID: {measurement_uuid}")
+            return None
+
+        return fr
+
+    except requests.RequestException as e:
+        print(f"REW API Error getting frequency response for {measurement_uuid}: {e}")
+        return None
+    except ValueError as e:
+        print(f"Error parsing frequency response for {measurement_uuid}: {e}")
+        return None
+
+# Concurrent metadata requests; kept below RewClient's pool_size so every
+# worker gets a pooled keep-alive connection.
+METADATA_FETCH_WORKERS = 8
+
+def fetch_measurements_metadata(measurement_ids, max_workers=METADATA_FETCH_WORKERS):
+    """
+    Fetch GET /measurements/{id} for many IDs concurrently.
+
+    Returns (results, failures):
+        results  -- list aligned with measurement_ids; metadata dict, or None if that ID failed
+        failures -- dict {id: error_message} for every ID that could not be fetched
+    """
+    measurement_ids = list(measurement_ids)
+    if not measurement_ids:
+        return [], {}
+
+    def _fetch(m_id):
+        try:
+            return rew_client.get(f"/measurements/{m_id}").json(), None
+        except (requests.RequestException, ValueError) as e:
+            return None, str(e)
+
+    workers = max(1, min(max_workers, len(measurement_ids)))
+    if workers == 1:
+        outcomes = [_fetch(m_id) for m_id in measurement_ids]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rew-meta") as pool:
+            outcomes = list(pool.map(_fetch, measurement_ids))  # map keeps input order
+
+    results = []
+    failures = {}
+    for m_id, (meta, error) in zip(measurement_ids, outcomes):
+        if error is not None:
+            failures[m_id] = error
+        results.append(meta)
+
+    if failures:
+        print(f"Failed to fetch metadata for {len(failures)}/{len(measurement_ids)} measurements")
+        for m_id, error in failures.items():
+            print(f"  {m_id}: {error}")
+
+    return results, failures
+
 def get_all_measurements():
     try:
-        response = requests.get(f"{REW_API_BASE_URL}/measurements")
-        response.raise_for_status()
+        response = rew_client.get("/measurements")
         ids = response.json()
-        num_measurements = len(ids)
+        results, _ = fetch_measurements_metadata(ids)
         measurements = []
-        for m_id in ids:
-            meta = requests.get(f"{REW_API_BASE_URL}/measurements/{m_id}").json()
+        for m_id, meta in zip(ids, results):
+            if meta is None:
+                continue
             meta["id"] = m_id
             measurements.append(meta)
-        return measurements, num_measurements
+        return measurements, len(measurements)
     except requests.RequestException as e:
         print(f"REW API Error: {e}")
         return None, -1
@@ -257,8 +341,7 @@ def save_all_measurements(file_path, status_callback=None):
             "parameters": [file_path]
         }
         
-        response = requests.post(f"{REW_API_BASE_URL}/measurements/command", json=payload)
-        response.raise_for_status()
+        response = rew_client.post("/measurements/command", json=payload)
         
         # Check response
         result = response.json()
@@ -294,8 +377,8 @@ def delete_all_measurements(status_callback=None):
         if status_callback:
             status_callback('Deleting all existing measurements...')
         
-        response = requests.delete(f"{REW_API_BASE_URL}/measurements")
-        response.raise_for_status()
+        response = rew_client.delete("/measurements")
+        measurement_index.apply_clear()
         
         result = response.json()
         message = result.get('message', '')
@@ -327,7 +410,7 @@ def delete_all_measurements(status_callback=None):
 def get_measurement_count():
     """Get the current number of measurements in REW."""
     try:
-        measurements, count = get_all_measurements()
+        count = measurement_index.count()
         return count if count != -1 else 0
     except Exception:
         return 0
@@ -336,28 +419,12 @@ def get_all_measurements_with_uuid():
     """
     Get all measurements with UUID tracking.
     Returns (measurements_list, total_count) where measurements_list contains UUID and metadata.
+    Served from the shared measurement index, which only fetches what changed.
     """
-    try:
-        response = requests.get(f"{REW_API_BASE_URL}/measurements")
-        response.raise_for_status()
-        measurement_uuids = response.json()
-        
-        measurements = []
-        for id in measurement_uuids:
-            try:
-                meta_response = requests.get(f"{REW_API_BASE_URL}/measurements/{id}")
-                meta_response.raise_for_status()
-                meta = meta_response.json()
-               # meta["uuid"] = uuid
-                measurements.append(meta)
-            except Exception as e:
-                print(f"Error getting metadata for ID {id}: {e}")
-                continue
-        
-        return measurements, len(measurements)
-    except requests.RequestException as e:
-        print(f"REW API Error: {e}")
+    measurements = measurement_index.measurements()
+    if measurements is None:
         return None, -1
+    return measurements, len(measurements)
 
 def delete_measurement_by_uuid(uuid, status_callback=None):
     """Delete a specific measurement by UUID."""
@@ -365,8 +432,8 @@ def delete_measurement_by_uuid(uuid, status_callback=None):
         if status_callback:
             status_callback(f'Deleting measurement {uuid}...')
         
-        response = requests.delete(f"{REW_API_BASE_URL}/measurements/{uuid}")
-        response.raise_for_status()
+        response = rew_client.delete(f"/measurements/{uuid}")
+        measurement_index.apply_delete(uuid)
         
         result = response.json()
         message = result.get('message', '')
@@ -410,34 +477,7 @@ def get_measurements_for_channel_with_uuid(channel):
     Returns list of {'uuid': str, 'position': int, 'title': str} dictionaries.
     """
     try:
-        measurements, _ = get_all_measurements_with_uuid()
-        if not measurements:
-            return []
-        
-        channel_measurements = []
-        
-        for measurement in measurements:
-            title = measurement.get('title', '')
-            uuid = measurement.get('uuid', '')
-            
-            # Match pattern: channel_pos# (e.g., "FL_pos0", "FR_pos1")
-            pattern = rf'^{re.escape(channel)}_pos(\d+)$'
-            match = re.match(pattern, title, re.IGNORECASE)
-            
-            if match:
-                position = int(match.group(1))
-                channel_measurements.append({
-                    'uuid': uuid,
-                    'position': position,
-                    'title': title,
-                    'measurement': measurement
-                })
-        
-        # Sort by position (0 first, then 1, 2, etc.)
-        channel_measurements.sort(key=lambda x: x['position'])
-        
-        return channel_measurements
-        
+        return measurement_index.for_channel(channel)
     except Exception as e:
         print(f"Error getting measurements for channel {channel}: {e}")
         return []
@@ -459,10 +499,12 @@ def get_selected_channels_with_measurements_uuid(selected_channels):
     
     return channels_with_data
 
-def start_cross_corr_align(channel, measurement_ids, status_callback=None, error_callback=None):
+def start_cross_corr_align(channel, measurement_ids, status_callback=None, error_callback=None,
+                           result_url=None):
     """
     Start cross correlation alignment process for a specific channel.
     Position 0 is used as the reference for alignment.
+    REW posts the result to *result_url* (default: the shared /rew-status).
     """
     if status_callback:
         status_callback(f"Starting cross correlation alignment for {channel}...")
@@ -479,12 +521,11 @@ def start_cross_corr_align(channel, measurement_ids, status_callback=None, error
         "processName": "Cross corr align",
         "measurementUUIDs": measurement_ids,
         "parameters": {},
-        "resultUrl": "http://127.0.0.1:5555/rew-status"
+        "resultUrl": result_url or _callback_url("/rew-status")
     }
     
     try:
-        response = requests.post(f"{REW_API_BASE_URL}/measurements/process-measurements", json=payload)
-        response.raise_for_status()
+        response = rew_client.post("/measurements/process-measurements", json=payload)
         
         if status_callback:
             status_callback(f"Cross correlation alignment started for {channel}")
@@ -506,9 +547,11 @@ def start_cross_corr_align(channel, measurement_ids, status_callback=None, error
             error_callback("Error", err_msg)
         return False, err_msg
 
-def start_vector_avg(channel, measurement_ids, status_callback=None, error_callback=None):
+def start_vector_avg(channel, measurement_ids, status_callback=None, error_callback=None,
+                     result_url=None):
     """
     Start vector average process for a specific channel.
+    REW posts the result to *result_url* (default: the shared /rew-status).
     """
     if status_callback:
         status_callback(f"Starting vector averaging for {channel}...")
@@ -525,12 +568,11 @@ def start_vector_avg(channel, measurement_ids, status_callback=None, error_callb
         "processName": "Vector Average",
         "measurementUUIDs": measurement_ids,
         "parameters": {},
-        "resultUrl": "http://127.0.0.1:5555/rew-status"
+        "resultUrl": result_url or _callback_url("/rew-status")
     }
     
     try:
-        response = requests.post(f"{REW_API_BASE_URL}/measurements/process-measurements", json=payload)
-        response.raise_for_status()
+        response = rew_client.post("/measurements/process-measurements", json=payload)
         
         if status_callback:
             status_callback(f"Vector averaging started for {channel}")
@@ -558,8 +600,7 @@ def get_measurement_process_result():
     Returns (process_name, new_measurement_id, message) or (None, None, None) if no result.
     """
     try:
-        response = requests.get(f"{REW_API_BASE_URL}/measurements/process-result")
-        response.raise_for_status()
+        response = rew_client.get("/measurements/process-result")
         process_result = response.json()
         
         if not process_result:
@@ -593,8 +634,7 @@ def get_measurement_uuid():
     Returns measurement_uuid or None if no result.
     """
     try:
-        response = requests.get(f"{REW_API_BASE_URL}/measurements/selected-uuid")
-        response.raise_for_status()
+        response = rew_client.get("/measurements/selected-uuid")
         measurement_uuid = response.json()
         
         if not measurement_uuid:
@@ -615,8 +655,7 @@ def get_measurement_by_uuid(measurement_uuid):
     Returns measurement_uuid or None if no result.
     """
     try:
-        response = requests.get(f"{REW_API_BASE_URL}/measurements/{measurement_uuid}")
-        response.raise_for_status()
+        response = rew_client.get(f"/measurements/{measurement_uuid}")
         measurements = response.json()
         
         if not measurements:
@@ -641,8 +680,7 @@ def get_measurement_distortion_by_uuid(measurement_uuid, ppo=96):
         ppo: Points per octave for sweep distortion (default 96 for maximum resolution)
     """
     try:
-        response = requests.get(f"{REW_API_BASE_URL}/measurements/{measurement_uuid}/distortion?ppo={ppo}")
-        response.raise_for_status()
+        response = rew_client.get(f"/measurements/{measurement_uuid}/distortion?ppo={ppo}")
         measurement_distortion = response.json()
 
         if not measurement_distortion:
@@ -665,8 +703,8 @@ def rename_measurement(measurement_id, new_name, status_callback=None):
     """
     try:
         payload = {"title": new_name}
-        response = requests.put(f"{REW_API_BASE_URL}/measurements/{measurement_id}", json=payload)
-        response.raise_for_status()
+        response = rew_client.put(f"/measurements/{measurement_id}", json=payload)
+        measurement_index.apply_rename(measurement_id, new_name)
         
         if status_callback:
             status_callback(f"Renamed measurement to: {new_name}")
@@ -677,12 +715,68 @@ def rename_measurement(measurement_id, new_name, status_callback=None):
         print(f"Error renaming measurement {measurement_id}: {e}")
         return False
 
+def import_impulse_response(name, samples, sample_rate, start_time, status_callback=None):
+    """
+    Upload an impulse response to REW as a new measurement titled *name*.
+    *samples* is a NumPy array in the scale REW returned it
+    (impulse-response?normalised=false). Returns (success, error_message).
+    """
+    payload = {
+        "identifier": name,
+        "startTime": float(start_time),
+        "sampleRate": int(sample_rate),
+        "splOffset": 0,
+        "applyCal": False,
+        "data": base64.b64encode(samples.astype('>f4').tobytes()).decode("ascii")
+    }
+    try:
+        rew_client.post("/import/impulse-response-data", json=payload)
+        measurement_index.invalidate()
+
+        if status_callback:
+            status_callback(f"Uploaded impulse response: {name}")
+
+        return True, None
+
+    except requests.RequestException as e:
+        err_msg = f"Error uploading impulse response '{name}': {e}"
+        print(err_msg)
+        return False, err_msg
+
+
+def import_frequency_response(name, magnitude_db, phase_deg, start_freq, ppo, status_callback=None):
+    """
+    Upload a log-spaced frequency response to REW as a new measurement
+    titled *name*.  *magnitude_db* and *phase_deg* are NumPy arrays on the
+    grid start_freq * 2 ** (i / ppo).  Returns (success, error_message).
+    """
+    payload = {
+        "identifier": name,
+        "unit": "SPL",
+        "startFreq": float(start_freq),
+        "ppo": int(ppo),
+        "magnitude": base64.b64encode(magnitude_db.astype('>f4').tobytes()).decode("ascii"),
+        "phase": base64.b64encode(phase_deg.astype('>f4').tobytes()).decode("ascii")
+    }
+    try:
+        rew_client.post("/import/frequency-response-data", json=payload)
+        measurement_index.invalidate()
+
+        if status_callback:
+            status_callback(f"Uploaded frequency response: {name}")
+
+        return True, None
+
+    except requests.RequestException as e:
+        err_msg = f"Error uploading frequency response '{name}': {e}"
+        print(err_msg)
+        return False, err_msg
+
 
 def get_last_warning():
     """Get the last warning from REW"""
     try:
-        response = requests.get(f"{REW_API_BASE_URL}/application/last-warning")
-        response.raise_for_status()
+        response = rew_client.get("/application/last-warning")
         warning_data = response.json()
         
         if warning_data:
@@ -701,8 +795,7 @@ def get_last_warning():
 def get_last_error():
     """Get the last error from REW"""
     try:
-        response = requests.get(f"{REW_API_BASE_URL}/application/last-error")
-        response.raise_for_status()
+        response = rew_client.get("/application/last-error")
         error_data = response.json()
         
         if error_data:
@@ -719,23 +812,21 @@ def get_last_error():
         return f"Error parsing error: {e}"
 
 def subscribe_to_rew_status():
-    try:
-        r = requests.post(f"{REW_API_BASE_URL}/measure/subscribe", json={
-            "url": "http://127.0.0.1:5555/rew-status"
-        })
-        if r.ok:
-            print("✅ Subscribed to REW status updates")
-        else:
-            print(f"⚠️ Failed to subscribe: {r.status_code} {r.text}")
-    except Exception as e:
-        print(f"❌ Subscription error: {e}")
+    r = rew_client.call("POST", "/measure/subscribe", json={
+        "url": _callback_url("/rew-status")
+    })
+    if r.ok:
+        print("✅ Subscribed to REW status updates")
+    elif r.status is not None:
+        print(f"⚠️ Failed to subscribe: {r.error}")
+    else:
+        print(f"❌ Subscription error: {r.error}")
 
 def subscribe_to_rew_warnings():
     """Subscribe to REW warnings"""
     try:
-        payload = {"url": "http://127.0.0.1:5555/rew-warnings"}
-        response = requests.post(f"{REW_API_BASE_URL}/application/warnings/subscribe", json=payload)
-        response.raise_for_status()
+        payload = {"url": _callback_url("/rew-warnings")}
+        response = rew_client.post("/application/warnings/subscribe", json=payload)
         print("✅ Subscribed to REW warnings")
         return True
     except Exception as e:
@@ -745,9 +836,8 @@ def subscribe_to_rew_warnings():
 def subscribe_to_rew_errors():
     """Subscribe to REW errors"""
     try:
-        payload = {"url": "http://127.0.0.1:5555/rew-errors"}
-        response = requests.post(f"{REW_API_BASE_URL}/application/errors/subscribe", json=payload)
-        response.raise_for_status()
+        payload = {"url": _callback_url("/rew-errors")}
+        response = rew_client.post("/application/errors/subscribe", json=payload)
         print("✅ Subscribed to REW errors")
         return True
     except Exception as e:
@@ -758,14 +848,13 @@ def subscribe_to_rta_distortion():
     """Subscribe to RTA distortion updates"""
     try:
         payload = {
-            "url": "http://127.0.0.1:5555/rta-distortion",
+            "url": _callback_url("/rta-distortion"),
             "parameters": {
                 "unit": "SPL", 
                 "distortion": "percent"
             }
         }
-        response = requests.post(f"{REW_API_BASE_URL}/rta/distortion/subscribe", json=payload)
-        response.raise_for_status()
+        response = rew_client.post("/rta/distortion/subscribe", json=payload)
         print("✅ Subscribed to RTA distortion updates")
         return True
     except Exception as e:
@@ -776,14 +865,13 @@ def unsubscribe_from_rta_distortion():
     """Unsubscribe from RTA distortion updates"""
     try:
         payload = {
-            "url": "http://127.0.0.1:5555/rta-distortion",
+            "url": _callback_url("/rta-distortion"),
             "parameters": {
                 "unit": "SPL", 
                 "distortion": "percent"
             }
         }
-        response = requests.post(f"{REW_API_BASE_URL}/rta/distortion/unsubscribe", json=payload)
-        response.raise_for_status()
+        response = rew_client.post("/rta/distortion/unsubscribe", json=payload)
         print("✅ Unsubscribed from RTA distortion updates")
         return True
     except Exception as e:
@@ -818,8 +906,7 @@ def set_rta_configuration(show_gui: bool = True) -> bool:
         }
 
     try:
-        r = requests.post(f"{REW_API_BASE_URL}/rta/configuration", json=payload, timeout=5)
-        r.raise_for_status()
+        r = rew_client.post("/rta/configuration", json=payload, timeout=5)
         print("✅ RTA configured for distortion measurement")
         return True
     except Exception as e:
@@ -848,7 +935,7 @@ def set_rta_distortion_configuration_sine():
             "monitorClockRateMatch": True           # warns if sound-card drifts
             }
 
-        response = requests.post(f"{REW_API_BASE_URL}/rta/distortion-configuration", json=payload)
+        response = rew_client.post("/rta/distortion-configuration", json=payload, raise_for_status=False)
         print("✅ RTA distortion configured for single tone sine")
         return True
     except Exception as e:
@@ -877,7 +964,7 @@ def set_rta_distortion_configuration_sweep():
             "monitorClockRateMatch": True
             }
 
-        response = requests.post(f"{REW_API_BASE_URL}/rta/distortion-configuration", json=payload)
+        response = rew_client.post("/rta/distortion-configuration", json=payload, raise_for_status=False)
         print("✅ RTA distortion configureed")
         return True
     except Exception as e:
@@ -890,8 +977,7 @@ def start_rta():
     """Start RTA mode"""
     try:
         payload = {"command": "Start"}
-        response = requests.post(f"{REW_API_BASE_URL}/rta/command", json=payload)
-        response.raise_for_status()
+        response = rew_client.post("/rta/command", json=payload)
         return True
     except Exception as e:
         print(f"❌ Failed to start RTA: {e}")
@@ -901,8 +987,7 @@ def stop_rta():
     """Stop RTA mode"""
     try:
         payload = {"command": "Stop"}
-        response = requests.post(f"{REW_API_BASE_URL}/rta/command", json=payload)
-        response.raise_for_status()
+        response = rew_client.post("/rta/command", json=payload)
         return True
     except Exception as e:
         print(f"❌ Failed to stop RTA: {e}")
@@ -929,13 +1014,8 @@ def check_rew_health():
         return {'healthy': False, 'error': str(e)}
 
 def check_rew_connection():
-    try:
-        r = requests.get(f"{REW_API_BASE_URL}", timeout=3)
-        if r.ok:
-            return True
-    except Exception:
-        pass
-    return False
+    # The bare base URL, as before the shared client
+    return rew_client.call("GET", "", timeout=3).ok
 
 def initialize_rew_subscriptions():
     """Initialize all REW subscriptions"""
@@ -0,0 +1,410 @@
+# Qrew_batch_metrics.py
+"""
+Vectorised quality metrics for many measurements at once.
+
+The per-measurement functions in ``Qrew_measurement_metrics`` stay the
+reference; this module computes the same numbers for N measurements in a
+handful of NumPy passes:
+
+* :func:`stack_impulse_responses` decodes N REW IR payloads into one
+  zero-padded ``(N, L)`` float32 matrix.
+* :func:`stack_distortion_tables` pads N distortion tables into
+  ``(N, F)`` float64 matrices (NaN where a table is shorter).
+* :func:`batch_ir_metrics`, :func:`batch_distortion_metrics` and
+  :func:`batch_score` fill one structured array (:data:`BATCH_DTYPE`);
+  the score uses the same SCORE_TERMS / RATING_THRESHOLDS tables as
+  :func:`combine_and_score_metrics`.
+* :func:`score_measurements_batch` runs the whole pipeline from raw REW
+  JSON and :func:`batch_details` turns rows back into the familiar
+  ``{"score", "rating", "detail"}`` dicts.
+"""
+import warnings
+
+import numpy as np
+
+try:
+    from .Qrew_measurement_metrics import RATING_THRESHOLDS, SCORE_TERMS, decode_ir_samples
+except ImportError:
+    from Qrew_measurement_metrics import RATING_THRESHOLDS, SCORE_TERMS, decode_ir_samples
+
+
+# One row per measurement.  Field names match the keys of the merged
+# ``detail`` dict produced by the single-measurement path.
+BATCH_DTYPE = np.dtype([
+    # impulse-response metrics (calculate_rew_metrics_from_ir)
+    ("signal_dbfs", "f8"),
+    ("dist_dbfs", "f8"),
+    ("noise_dbfs", "f8"),
+    ("snr_dB", "f8"),
+    ("sdr_dB", "f8"),
+    ("peak_idx", "i8"),
+    ("peak_value", "f8"),
+    ("peak_time_ms", "f8"),
+    ("ir_pk_noise_dB", "f8"),
+    ("signal_start", "i8"),
+    ("signal_end", "i8"),
+    ("dist_start", "i8"),
+    ("dist_end", "i8"),
+    ("noise_start", "i8"),
+    ("noise_end", "i8"),
+    # distortion-table metrics (evaluate_measurement)
+    ("info_snr_dB", "f8"),
+    ("coh_mean", "f8"),  # NaN when no coherence was supplied
+    ("mean_thd_%", "f8"),
+    ("max_thd_%", "f8"),
+    ("low_thd_%", "f8"),
+    ("h3/h2_ratio", "f8"),
+    ("mean_sdr_dB", "f8"),
+    ("max_sdr_dB", "f8"),
+    ("low_sdr_dB", "f8"),
+    ("mean_thd_n_%", "f8"),
+    ("max_thd_n_%", "f8"),
+    ("low_thd_n_%", "f8"),
+    # combine_and_score_metrics
+    ("score", "f8"),
+    ("rating", "U7"),
+])
+
+# Rows are squared in chunks so a session of long IRs never needs more than
+# roughly this many bytes of float64 scratch.
+_CHUNK_BYTES = 64 * 2**20
+
+
+# ----------------------------------------------------------------------
+# stacking
+# ----------------------------------------------------------------------
+def _encoded_samples(ir_base64):
+    """Number of float32 samples in a base64 IR payload, without decoding it."""
+    data = ir_base64.rstrip()
+    return (len(data) * 3 // 4 - (len(data) - len(data.rstrip("=")))) // 4
+
+
+def stack_impulse_responses(ir_jsons):
+    """
+    Decode REW impulse-response JSON payloads into a padded matrix.
+
+    Returns
+    -------
+    samples : (N, L + 1) float32, REW percent scale, zero padded
+    lengths : (N,) int64
+    sample_rates : (N,) float64
+    start_times : (N,) float64
+    """
+    n = len(ir_jsons)
+    # Sample counts from the base64 lengths, so every IR is decoded
+    # straight into its row
+    lengths = np.array([_encoded_samples(ir["data"]) for ir in ir_jsons], dtype=np.int64)
+    # +1 spare zero column: segment ends never reach the end of the buffer
+    samples = np.zeros((n, int(lengths.max()) + 1 if n else 0), dtype=np.float32)
+    for row, ir in zip(samples, ir_jsons):
+        decoded = decode_ir_samples(ir["data"])
+        row[:len(decoded)] = decoded
+    sample_rates = np.array([ir["sampleRate"] for ir in ir_jsons], dtype=np.float64)
+    start_times = np.array([ir["startTime"] for ir in ir_jsons], dtype=np.float64)
+    return samples, lengths, sample_rates, start_times
+
+
+def stack_distortion_tables(thd_jsons):
+    """
+    Pad N REW distortion tables into aligned matrices.
+
+    Returns a dict of (N, F) float64 arrays keyed ``freqs``, ``thd``,
+    ``noise``, ``h2``, ``h3`` plus the per-row flag ``has_noise``.
+    Missing rows are NaN; missing Noise/H2/H3 columns are zero, as in
+    :func:`evaluate_measurement`.
+    """
+    n = len(thd_jsons)
+    tables = [
+        np.asarray(t["data"], dtype=np.float64).reshape(-1, len(t["columnHeaders"]))
+        for t in thd_jsons
+    ]
+    width = max((len(t) for t in tables), default=0)
+
+    out = {key: np.full((n, width), np.nan) for key in ("freqs", "thd", "noise", "h2", "h3")}
+    has_noise = np.zeros(n, dtype=bool)
+
+    for i, (table, thd_json) in enumerate(zip(tables, thd_jsons)):
+        cols = thd_json["columnHeaders"]
+        rows = len(table)
+        out["freqs"][i, :rows] = table[:, cols.index("Freq (Hz)")]
+        thd = table[:, cols.index("THD (%)")]
+
+        if "Noise (%)" in cols:
+            out["noise"][i, :rows] = table[:, cols.index("Noise (%)")] / 10000
+            has_noise[i] = True
+        else:
+            out["noise"][i, :rows] = 0.0
+
+        # Same REW scaling work-around as evaluate_measurement
+        rescale = rows > 0 and np.nanmax(thd) > 100
+        out["thd"][i, :rows] = thd / 10000 if rescale else thd
+        for key, col in (("h2", "H2 (%)"), ("h3", "H3 (%)")):
+            if col in cols:
+                values = table[:, cols.index(col)]
+                out[key][i, :rows] = values / 10000 if rescale else values
+            else:
+                out[key][i, :rows] = 0.0
+
+    out["has_noise"] = has_noise
+    return out
+
+
+# ----------------------------------------------------------------------
+# metrics
+# ----------------------------------------------------------------------
+def _segment_reduce(ufunc, matrix, starts, ends):
+    """
+    ufunc.reduce over matrix[i, starts[i]:ends[i]] for every row at once.
+
+    Empty segments return matrix[i, starts[i]]; callers mask them.
+    """
+    n, width = matrix.shape
+    base = np.arange(n, dtype=np.int64) * width
+    bounds = np.empty(2 * n, dtype=np.int64)
+    bounds[0::2] = base + starts
+    bounds[1::2] = base + ends
+    flat = matrix.reshape(-1)
+    if bounds[-1] >= flat.size:
+        # reduceat needs every index inside the array; stacked matrices
+        # carry a spare zero column so this copy is normally avoided
+        flat = np.append(flat, matrix.dtype.type(0))
+    return ufunc.reduceat(flat, bounds)[0::2]
+
+
+def _segment_peak(samples, starts, ends):
+    """max(|samples[i, starts[i]:ends[i]]|) per row, as float64."""
+    high = _segment_reduce(np.maximum, samples, starts, ends).astype(np.float64)
+    low = _segment_reduce(np.minimum, samples, starts, ends).astype(np.float64)
+    return np.maximum(high, -low)
+
+
+def batch_ir_metrics(samples, lengths, sample_rates, start_times, harm_factor=0.5, out=None):
+    """
+    Vectorised :func:`calculate_rew_metrics_from_ir` over a stacked matrix.
+
+    Fills the impulse-response fields of *out* (a :data:`BATCH_DTYPE`
+    array, created if omitted) and returns it.
+    """
+    n = samples.shape[0]
+    if out is None:
+        out = np.zeros(n, dtype=BATCH_DTYPE)
+    if n == 0:
+        return out
+
+    lengths = np.asarray(lengths, dtype=np.int64)
+    T = 1.0 / np.asarray(sample_rates, dtype=np.float64)
+
+    # Step 1: peak per row (padding is zero so never wins over real data);
+    # argmax(|x|) from argmax / argmin, without an |x| copy of the matrix
+    rows = np.arange(n)
+    hi_idx = samples.argmax(axis=1)
+    lo_idx = samples.argmin(axis=1)
+    hi, lo = samples[rows, hi_idx], -samples[rows, lo_idx]
+    peak_idx = np.where(lo > hi, lo_idx, np.where(lo < hi, hi_idx, np.minimum(lo_idx, hi_idx)))
+    peak_value = np.maximum(hi, lo).astype(np.float64) / 100.0
+    peak_time_ms = (start_times + peak_idx * T) * 1000
+
+    # Step 2/3: windows and regions, exactly as the scalar version
+    window_samples = np.rint(harm_factor * np.log(2.0) / T).astype(np.int64)
+    analysis_start = np.maximum(0, peak_idx - window_samples // 4)
+    window_size = np.minimum(lengths // 4, lengths - analysis_start)
+
+    signal_start = analysis_start
+    signal_end = np.minimum(signal_start + window_size, lengths)
+    dist_start = np.maximum(0, analysis_start - window_size)
+    dist_end = analysis_start
+    noise_start = np.maximum(0, dist_start - window_size)
+    noise_end = dist_start
+
+    # Step 4: region energies as float64 segment sums, chunked over rows
+    signal_power = np.empty(n)
+    noise_power = np.empty(n)
+    width = samples.shape[1]
+    chunk = max(1, _CHUNK_BYTES // (8 * width))
+    for lo in range(0, n, chunk):
+        hi = min(n, lo + chunk)
+        energy = np.square(samples[lo:hi], dtype=np.float64)
+        signal_power[lo:hi] = _segment_reduce(
+            np.add, energy, signal_start[lo:hi], signal_end[lo:hi]
+        )
+        noise_power[lo:hi] = _segment_reduce(
+            np.add, energy, noise_start[lo:hi], noise_end[lo:hi]
+        )
+    signal_power /= 100.0 ** 2
+    noise_power /= 100.0 ** 2
+
+    peak_signal_power = (_segment_peak(samples, signal_start, signal_end) / 100.0) ** 2
+    dist_power = (_segment_peak(samples, dist_start, dist_end) / 100.0) ** 2
+
+    dist_power = np.where(dist_end > dist_start, dist_power, 1e-10)
+    noise_power = np.where(noise_end > noise_start, noise_power, 1e-10)
+
+    # Step 5/6: dB values
+    with np.errstate(divide="ignore"):
+        signal_dbfs = 10 * np.log10(signal_power)
+        dist_dbfs = 10 * np.log10(dist_power)
+        noise_dbfs = 10 * np.log10(noise_power)
+        sdr = 10 * np.log10(peak_signal_power) - dist_dbfs
+        peak_dbfs = 20 * np.log10(np.maximum(peak_value, 1e-12))
+
+    out["signal_dbfs"] = signal_dbfs
+    out["dist_dbfs"] = dist_dbfs
+    out["noise_dbfs"] = noise_dbfs
+    out["snr_dB"] = signal_dbfs - noise_dbfs
+    out["sdr_dB"] = sdr
+    out["peak_idx"] = peak_idx
+    out["peak_value"] = peak_value
+    out["peak_time_ms"] = peak_time_ms
+    out["ir_pk_noise_dB"] = peak_dbfs - noise_dbfs
+    out["signal_start"], out["signal_end"] = signal_start, signal_end
+    out["dist_start"], out["dist_end"] = dist_start, dist_end
+    out["noise_start"], out["noise_end"] = noise_start, noise_end
+    return out
+
+
+def _sdr_from_thd_n(thd_n_percent):
+    """Vectorised calculate_sdr from evaluate_measurement (NaN stays NaN)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(thd_n_percent <= 0, 100.0, -20 * np.log10(thd_n_percent))
+
+
+def batch_distortion_metrics(tables, info_snr=None, coherence=None,
+                             freq_band=(20, 20000), out=None):
+    """
+    Vectorised :func:`evaluate_measurement` over stacked distortion tables.
+
+    Parameters
+    ----------
+    tables : dict
+        Output of :func:`stack_distortion_tables`.
+    info_snr : (N,) array_like, optional
+        ``signalToNoisedB`` from each measurement's info JSON.
+    coherence : (N, K) array_like, optional
+        Coherence per measurement (NaN padded); omitted → ``coh_mean`` NaN.
+    """
+    freqs, thd, noise = tables["freqs"], tables["thd"], tables["noise"]
+    h2, h3 = tables["h2"], tables["h3"]
+    n = freqs.shape[0]
+    if out is None:
+        out = np.zeros(n, dtype=BATCH_DTYPE)
+    if n == 0:
+        return out
+
+    thd_n = np.sqrt(thd ** 2 + noise ** 2)
+    band = (freqs >= freq_band[0]) & (freqs <= freq_band[1])
+    low = freqs < 200
+    has_low = low.any(axis=1)
+
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows yield NaN
+        mean_thd = np.nanmean(np.where(band, thd, np.nan), axis=1)
+        max_thd = np.nanmax(np.where(band, thd, np.nan), axis=1)
+        mean_thd_n = np.nanmean(np.where(band, thd_n, np.nan), axis=1)
+        max_thd_n = np.nanmax(np.where(band, thd_n, np.nan), axis=1)
+        low_thd = np.where(has_low, np.nanmean(np.where(low, thd, np.nan), axis=1), mean_thd)
+        low_thd_n = np.where(has_low, np.nanmean(np.where(low, thd_n, np.nan), axis=1), mean_thd_n)
+
+        valid = h2 > 0
+        ratio = np.nanmedian(np.where(valid, h3 / np.where(valid, h2, 1.0), np.nan), axis=1)
+        h3_h2_ratio = np.where(valid.any(axis=1), ratio, 0.0)
+
+        if coherence is None:
+            coh_mean = np.full(n, np.nan)
+        else:
+            coh_mean = np.nanmean(np.asarray(coherence, dtype=np.float64), axis=1)
+
+    out["info_snr_dB"] = 0.0 if info_snr is None else np.asarray(info_snr, dtype=np.float64)
+    out["coh_mean"] = coh_mean
+    out["mean_thd_%"] = mean_thd
+    out["max_thd_%"] = max_thd
+    out["low_thd_%"] = low_thd
+    out["h3/h2_ratio"] = h3_h2_ratio
+    out["mean_thd_n_%"] = mean_thd_n
+    out["max_thd_n_%"] = max_thd_n
+    out["low_thd_n_%"] = low_thd_n
+    out["mean_sdr_dB"] = _sdr_from_thd_n(mean_thd_n)
+    out["max_sdr_dB"] = _sdr_from_thd_n(max_thd_n)
+    out["low_sdr_dB"] = _sdr_from_thd_n(low_thd_n)
+    return out
+
+
+def _scale_vec(value, low, high, max_pts, inverse=False):
+    """Vectorised :func:`Qrew_measurement_metrics._scale`."""
+    if inverse:
+        value = high - value + low
+    frac = (value - low) / (high - low)
+    return np.clip(frac, 0.0, 1.0) * max_pts
+
+
+def batch_score(out):
+    """Vectorised :func:`combine_and_score_metrics`; fills score / rating."""
+    score = np.zeros(len(out))
+    # Batch columns carry the detail key names; the IR snr_dB is the
+    # "snr_dB" column (the info one is "info_snr_dB")
+    for _source, key, low, high, max_pts, inverse in SCORE_TERMS:
+        points = _scale_vec(out[key], low, high, max_pts, inverse)
+        score += np.where(np.isnan(out[key]), 0.0, points) if key == "coh_mean" else points
+    score = np.round(np.clip(score, 0, 100), 1)
+    out["score"] = score
+    rating = np.full(len(out), "RETAKE", dtype=out.dtype["rating"])
+    for threshold, name in reversed(RATING_THRESHOLDS):
+        rating[score >= threshold] = name
+    out["rating"] = rating
+    return out
+
+
+# ----------------------------------------------------------------------
+# convenience
+# ----------------------------------------------------------------------
+def score_measurements_batch(ir_jsons, thd_jsons, info_jsons, harm_factor=0.5):
+    """
+    Score N measurements from raw REW JSON in one vectorised pass.
+
+    The three lists must be aligned; returns a :data:`BATCH_DTYPE` array.
+    """
+    out = np.zeros(len(ir_jsons), dtype=BATCH_DTYPE)
+    if not len(out):
+        return out
+    batch_ir_metrics(*stack_impulse_responses(ir_jsons), harm_factor=harm_factor, out=out)
+    info_snr = [info.get("signalToNoisedB", 0.0) for info in info_jsons]
+    batch_distortion_metrics(stack_distortion_tables(thd_jsons), info_snr=info_snr, out=out)
+    return batch_score(out)
+
+
+def batch_details(out):
+    """Convert :data:`BATCH_DTYPE` rows to ``{"score", "rating", "detail"}`` dicts."""
+    results = []
+    for row in out:
+        detail = {
+            "snr_dB": float(row["snr_dB"]),
+            "coh_mean": None if np.isnan(row["coh_mean"]) else float(row["coh_mean"]),
+            "mean_thd_%": float(row["mean_thd_%"]),
+            "max_thd_%": float(row["max_thd_%"]),
+            "low_thd_%": float(row["low_thd_%"]),
+            "h3/h2_ratio": float(row["h3/h2_ratio"]),
+            "mean_sdr_dB": float(row["mean_sdr_dB"]),
+            "max_sdr_dB": float(row["max_sdr_dB"]),
+            "low_sdr_dB": float(row["low_sdr_dB"]),
+            "mean_thd_n_%": float(row["mean_thd_n_%"]),
+            "max_thd_n_%": float(row["max_thd_n_%"]),
+            "low_thd_n_%": float(row["low_thd_n_%"]),
+            "signal_dbfs": float(row["signal_dbfs"]),
+            "dist_dbfs": float(row["dist_dbfs"]),
+            "noise_dbfs": float(row["noise_dbfs"]),
+            "sdr_dB": float(row["sdr_dB"]),
+            "peak_idx": int(row["peak_idx"]),
+            "peak_value": float(row["peak_value"]),
+            "peak_time_ms": float(row["peak_time_ms"]),
+            "ir_pk_noise_dB": float(row["ir_pk_noise_dB"]),
+            "analysis_regions": {
+                "signal": (int(row["signal_start"]), int(row["signal_end"])),
+                "distortion": (int(row["dist_start"]), int(row["dist_end"])),
+                "noise": (int(row["noise_start"]), int(row["noise_end"])),
+            },
+        }
+        results.append({
+            "score": float(row["score"]),
+            "rating": str(row["rating"]),
+            "detail": detail,
+        })
+    return results
@@ -0,0 +1,340 @@
+# Qrew_callback_server.py
+"""Minimal HTTP receiver for REW's callbacks
+
+REW posts status lines, processing results, warnings, errors and RTA
+updates to Qrew while a measurement runs; RTA alone can be several posts
+per second.  This server replaces Flask under gevent's WSGIServer with an
+asyncio loop in its own thread that only does HTTP:
+
+* each request is read, its body decoded once (text or JSON, per route)
+  and answered straight away;
+* POST handlers do not run on the network loop.  (handler, payload)
+  pairs go into a queue.SimpleQueue - unbounded and lock-free for the
+  producer - and one dispatcher thread runs them in arrival order, so a
+  slow handler (a print, a Qt emit, a REW call) never holds up REW;
+* GET pages run on the loop's default executor; a handler returning a
+  dict or list is answered as JSON.
+
+Routes are declared Flask-style::
+
+    server = CallbackServer()
+
+    @server.route("/rew-status/<operation>", body="text")
+    def handle_operation_status(text, operation): ...
+
+No Qt or third-party imports, so benchmarks can run it standalone.
+"""
+import asyncio
+import json
+import queue
+import re
+import threading
+import time
+from http import HTTPStatus
+from urllib.parse import parse_qsl, unquote
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 5555
+MAX_HEADERS = 100
+MAX_BODY = 16 * 1024 * 1024
+
+_STOP = object()  # dispatcher sentinel
+
+
+class _Route:
+    __slots__ = ("handler", "body", "queued", "query", "pattern")
+
+    def __init__(self, handler, body, queued, query=False, pattern=None):
+        self.handler = handler
+        self.body = body  # "text", "json" or None (no body)
+        self.queued = queued
+        self.query = query  # pass the query string as query={name: value}
+        self.pattern = pattern
+
+
+class CallbackServer:
+    """
+    HTTP/1.1 server for REW callbacks.  serve_forever() blocks the calling
+    thread (start it in a daemon thread); ``ready`` is set once the socket
+    is bound or binding failed (see ``error``).
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, record_path=None):
+        self.host = host
+        self.port = port
+        self.record_path = record_path  # append every POST as a JSON line
+        self.ready = threading.Event()
+        self.error = None
+        self.received = 0  # POSTs queued
+        self.handled = 0  # POSTs the dispatcher has finished
+        self._routes = {}  # (method, path) -> _Route
+        self._pattern_routes = []  # (method, _Route) with <param> segments
+        self._queue = queue.SimpleQueue()
+        self._loop = None
+        self._stopping = None
+        self._dispatcher = None
+        self._connections = {}  # connection task -> writer
+        self._record_file = None
+        self._started = None
+
+    # ------------------------------------------------------------------
+    # routing
+    # ------------------------------------------------------------------
+    def route(self, path, methods=("POST",), body="text", query=False):
+        """
+        Register a handler.  POST handlers get the decoded body (text, or
+        parsed JSON with body="json") plus any <param> of the path and run
+        on the dispatcher thread; their return value is ignored.  GET
+        handlers get the path params (and with query=True a ``query``
+        dict of the query string) and return the response: a str, a dict
+        or list (sent as JSON), or (response, status).
+        """
+
+        def decorator(handler):
+            for method in methods:
+                queued = method == "POST"
+                route = _Route(handler, body if queued else None, queued, query)
+                if "<" in path:
+                    route.pattern = re.compile(re.sub(r"<(\w+)>", r"(?P<\1>[^/]+)", path))
+                    self._pattern_routes.append((method, route))
+                else:
+                    self._routes[(method, path)] = route
+            return handler
+
+        return decorator
+
+    def _match(self, method, path):
+        route = self._routes.get((method, path))
+        if route is not None:
+            return route, {}
+        for route_method, route in self._pattern_routes:
+            if route_method == method:
+                match = route.pattern.fullmatch(path)
+                if match:
+                    return route, {k: unquote(v) for k, v in match.groupdict().items()}
+        return None, None
+
+    @property
+    def backlog(self):
+        """POSTs received but not handled yet."""
+        return self.received - self.handled
+
+    # ------------------------------------------------------------------
+    # lifecycle
+    # ------------------------------------------------------------------
+    def serve_forever(self):
+        self.error = None
+        self.ready.clear()
+        try:
+            asyncio.run(self._serve())
+        finally:
+            self.ready.clear()
+
+    def stop(self, timeout=2.0):
+        """Stop listening and let the dispatcher finish what is queued (≤ *timeout* s)."""
+        loop, stopping = self._loop, self._stopping
+        if loop is not None and stopping is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(stopping.set)
+            except RuntimeError:
+                pass  # loop already closed
+        dispatcher = self._dispatcher
+        if dispatcher is not None:
+            self._queue.put(_STOP)
+            dispatcher.join(timeout)
+            self._dispatcher = None
+
+    @property
+    def url(self):
+        """Base URL REW posts to: loopback, on the port actually bound."""
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def running(self):
+        return self.ready.is_set() and self.error is None
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        try:
+            server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        except OSError as e:
+            self.error = str(e)
+            print(f"❌  REW-API server failed to start: {e}")
+            self.ready.set()
+            return
+
+        if not self.port:
+            self.port = server.sockets[0].getsockname()[1]  # bound to a free port
+        if self.record_path:
+            self._record_file = open(self.record_path, "a", encoding="utf-8")
+        self._started = time.monotonic()
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="rew-callbacks", daemon=True
+        )
+        self._dispatcher.start()
+        print(f"✅  REW-API server listening on {self.url}")
+        self.ready.set()
+
+        async with server:
+            await self._stopping.wait()
+            server.close()
+            # Idle keep-alive connections would otherwise be cancelled
+            # mid-read when the loop closes
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
+        self._loop = None
+
+    # ------------------------------------------------------------------
+    # dispatcher thread
+    # ------------------------------------------------------------------
+    def _dispatch_loop(self):
+        get = self._queue.get
+        while True:
+            item = get()
+            if item is _STOP:
+                return
+            handler, payload, params = item
+            try:
+                handler(payload, **params)
+            except Exception as e:
+                print(f"Callback handler {getattr(handler, '__name__', handler)} failed: {e}")
+            self.handled += 1
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                # readline() raises ValueError for a line over the stream limit
+                try:
+                    request_line = await reader.readline()
+                    if not request_line.strip():
+                        break
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, close=True)
+                    break
+
+                try:
+                    headers = await self._read_headers(reader)
+                except ValueError:
+                    await self._respond(writer, 431, close=True)
+                    break
+
+                close = (
+                    headers.get("connection", "").lower() == "close"
+                    or (version == "HTTP/1.0" and headers.get("connection", "").lower() != "keep-alive")
+                )
+                if headers.get("expect", "").lower() == "100-continue":
+                    writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+
+                try:
+                    body = await self._read_body(reader, headers)
+                except ValueError:
+                    await self._respond(writer, 413, close=True)
+                    break
+
+                status, content = await self._handle_request(method, target, body)
+                await self._respond(writer, status, content, close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.LimitOverrunError):
+            pass
+        except asyncio.CancelledError:
+            pass  # server stopping
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _read_headers(self, reader):
+        headers = {}
+        for _ in range(MAX_HEADERS):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        raise ValueError("too many headers")
+
+    async def _read_body(self, reader, headers):
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            size = 0
+            while True:
+                chunk_size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if chunk_size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    return b"".join(chunks)
+                size += chunk_size
+                if size > MAX_BODY:
+                    raise ValueError("body too large")
+                chunks.append(await reader.readexactly(chunk_size))
+                await reader.readline()
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY:
+            raise ValueError("body too large")
+        return await reader.readexactly(length) if length else b""
+
+    async def _handle_request(self, method, target, body):
+        path, _, query = target.partition("?")
+        path = unquote(path)
+        route, params = self._match(method, path)
+        if route is None:
+            return 404, ""
+
+        if not route.queued:
+            if route.query:
+                params["query"] = dict(parse_qsl(query))
+            try:
+                result = await self._loop.run_in_executor(None, lambda: route.handler(**params))
+            except Exception as e:
+                print(f"Error handling GET {path}: {e}")
+                return 500, f"Error: {e}"
+            status = 200
+            if isinstance(result, tuple):
+                result, status = result
+            return status, result or ""
+
+        text = body.decode("utf-8", "replace")
+        if self._record_file is not None:
+            self._record(method, path, text)
+        payload = text
+        if route.body == "json":
+            try:
+                payload = json.loads(text) if text.strip() else None
+            except ValueError:
+                payload = None
+            if not payload:
+                return 400, ""
+
+        self.received += 1
+        self._queue.put((route.handler, payload, params))
+        return 200, ""
+
+    def _record(self, method, path, text):
+        line = {"t": round(time.monotonic() - self._started, 4), "method": method, "path": path, "body": text}
+        self._record_file.write(json.dumps(line) + "\n")
+        self._record_file.flush()
+
+    async def _respond(self, writer, status, content="", close=False):
+        content_type = "text/html"
+        if isinstance(content, (dict, list)):
+            content, content_type = json.dumps(content), "application/json"
+        data = content.encode("utf-8") if content else b""
+        head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        if data:
+            head.append(f"Content-Type: {content_type}; charset=utf-8")
+        head.append(f"Content-Length: {len(data)}")
+        if close:
+            head.append("Connection: close")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+        await writer.drain()
@@ -0,0 +1,437 @@
+# Qrew_cross_align.py
+"""Local cross-correlation alignment
+
+A local alternative to REW's "Cross corr align" process, based on the
+REW-style routines of misc_assets/rew_cross_align_FR_v2.py.  For one
+channel it downloads the impulse responses of every mic position once,
+estimates each position's delay against position 0 and uploads the
+aligned IRs as ``<channel>_REW_aligned_IR_pos<n>`` measurements, which
+REW's vector average then uses instead of the raw captures.  The local
+vector average (Qrew_vector_average) takes the shifts directly, so
+nothing needs uploading in that case.
+
+Alignment only moves the time axis: samples are uploaded unchanged with
+``startTime`` corrected by the estimated shift.
+
+Each iteration moves the targets by the shift accumulated so far, so the
+residual shift goes to zero and the loop stops once it is below
+``convergence_threshold`` seconds.  Spectra are computed once per
+measurement and moved by phase rotation (SpectrumStore).
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from .Qrew_api_helper import get_ir_for_measurement, import_impulse_response
+    from .Qrew_measurement_index import measurement_index
+    from .Qrew_measurement_metrics import decode_ir_samples
+except ImportError:
+    from Qrew_api_helper import get_ir_for_measurement, import_impulse_response
+    from Qrew_measurement_index import measurement_index
+    from Qrew_measurement_metrics import decode_ir_samples
+
+
+MIN_FFT_LENGTH = 16384
+IR_FETCH_WORKERS = 4
+ALIGNED_TITLE = "{channel}_REW_aligned_IR_pos{position}"
+
+
+# ----------------------------------------------------------------------
+# IR download
+# ----------------------------------------------------------------------
+def decode_impulse_response(ir_json, title=""):
+    """
+    REW /impulse-response JSON -> (samples, sample_rate, start_time,
+    timing_ref, title), the tuple rew_cross_correlation_align() takes.
+    """
+    samples = decode_ir_samples(ir_json["data"]).copy()  # decoder reuses its buffer
+    timing_ref = (
+        ir_json.get("timingRefTime", 0.0)
+        + ir_json.get("timingOffset", 0.0)
+        + ir_json.get("delay", 0.0)
+    )
+    return (
+        samples,
+        float(ir_json["sampleRate"]),
+        float(ir_json.get("startTime", 0.0)),
+        float(timing_ref),
+        title,
+    )
+
+
+def fetch_impulse_responses(measurement_ids, max_workers=IR_FETCH_WORKERS):
+    """Download the IRs of *measurement_ids* concurrently (None where one failed)."""
+    measurement_ids = list(measurement_ids)
+    if not measurement_ids:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(measurement_ids))) as pool:
+        return list(pool.map(get_ir_for_measurement, measurement_ids))
+
+
+# ----------------------------------------------------------------------
+# REW-style correlation
+# ----------------------------------------------------------------------
+def rew_circular_shift(data, shift_samples):
+    """REW's circular shift (SweepAnalyser.B), in place."""
+    n = len(data)
+    shift_samples %= n
+    if shift_samples:
+        data[:] = np.roll(data, shift_samples)
+    return data
+
+
+def rew_sinc_interpolate_peak(data, peak_idx, window_size=64):
+    """Sub-sample peak position and value (parabolic fit around the peak)."""
+    if peak_idx <= window_size or peak_idx >= len(data) - window_size:
+        if peak_idx == 0 or peak_idx == len(data) - 1:
+            return peak_idx, data[peak_idx]
+
+        y1, y2, y3 = data[peak_idx - 1], data[peak_idx], data[peak_idx + 1]
+        denom = 2 * (2 * y2 - y1 - y3)
+        if abs(denom) < 1e-10:
+            return peak_idx, y2
+
+        offset = (y3 - y1) / denom
+        a = 0.5 * (y1 + y3 - 2 * y2)
+        b = 0.5 * (y3 - y1)
+        return peak_idx + offset, a * offset**2 + b * offset + y2
+
+    start = peak_idx - window_size
+    window_data = data[start : peak_idx + window_size + 1]
+    local_peak = int(np.argmax(window_data))
+
+    if 0 < local_peak < len(window_data) - 1:
+        y1, y2, y3 = window_data[local_peak - 1 : local_peak + 2]
+        denom = 2 * (2 * y2 - y1 - y3)
+        if abs(denom) > 1e-10:
+            offset = (y3 - y1) / denom
+            a = 0.5 * (y1 + y3 - 2 * y2)
+            b = 0.5 * (y3 - y1)
+            return start + local_peak + offset, a * offset**2 + b * offset + y2
+
+    return start + local_peak, window_data[local_peak]
+
+
+@lru_cache(maxsize=8)
+def _decay_window(sample_rate, decay_factor=0.1):
+    """Exponential fade to *decay_factor* over REW's L factor (10 ms, >= 100 samples)."""
+    min_decay_samples = max(int(0.01 * sample_rate), 100)
+    decay_rate = np.log(decay_factor) / min_decay_samples
+    window = np.exp(decay_rate * np.arange(min_decay_samples)).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
+def rew_prepare_ir_for_correlation(
+    ir_data,
+    sample_rate,
+    start_time,
+    timing_ref,
+    fft_length,
+    reference_peak_time,
+    ir_start_index=None,
+    signal_squaring=True,
+):
+    """REW's IR preparation (K.A): rfft of the IR moved so the reference peak is at 0."""
+    prepared = np.zeros(fft_length, dtype=np.float32)
+    prepared[: len(ir_data)] = ir_data
+
+    # Exponential decay after the IR start (REW does this for better correlation)
+    if ir_start_index is not None and ir_start_index > 0:
+        decay_start = ir_start_index + max(int(0.001 * sample_rate), 10)
+        if decay_start < len(prepared):
+            window = _decay_window(sample_rate)[: len(prepared) - decay_start]
+            prepared[decay_start : decay_start + len(window)] *= window
+
+    # Timing-based shift (the G value from REW)
+    time_offset = (reference_peak_time - start_time) * sample_rate
+    shift_samples = int(np.round(time_offset))
+    fractional_shift = time_offset - shift_samples
+
+    # Fractional part by linear interpolation with the neighbour (REW uses
+    # xI.B for this); every output sample uses the unshifted input.  It
+    # moves the same way as the circular shift below: earlier for a
+    # positive offset.
+    if abs(fractional_shift) > 1e-6:
+        fraction = np.float32(abs(fractional_shift))
+        if fractional_shift > 0:
+            neighbour = prepared[1:] * fraction
+            body = prepared[:-1]
+        else:
+            neighbour = prepared[:-1] * fraction
+            body = prepared[1:]
+        body *= np.float32(1.0) - fraction
+        body += neighbour
+
+    rew_circular_shift(prepared, -shift_samples)
+
+    # Signal squaring (REW's var3 parameter)
+    if signal_squaring:
+        prepared = np.sign(prepared) * (prepared**2)
+
+    return np.fft.rfft(prepared)
+
+
+def rew_cross_correlate_fft(ref_fft, target_fft, use_hilbert=True, analytic=None):
+    """
+    REW's FFT-based cross-correlation with Hilbert envelope.
+
+    The one-sided (analytic) spectrum of the correlation gives the
+    correlation as its real part and the Hilbert envelope as its
+    magnitude, so both come out of one inverse FFT.  *analytic* is an
+    optional zeroed complex scratch buffer of the correlation length.
+    """
+    min_len = min(len(ref_fft), len(target_fft))
+    n = 2 * (min_len - 1)
+    if analytic is None:
+        analytic = np.zeros(n, dtype=np.complex128)
+    half = analytic[:min_len]
+    np.conjugate(ref_fft[:min_len], out=half)
+    half *= target_fft[:min_len]
+
+    if use_hilbert:
+        half[1 : n // 2] *= 2.0
+        signal = np.fft.ifft(analytic)
+        correlation = signal.real
+        envelope = np.abs(signal)
+    else:
+        correlation = np.fft.irfft(half, n)
+        envelope = np.abs(correlation)
+
+    # REW applies a quarter-shift
+    quarter_shift = n // 4
+    rew_circular_shift(correlation, quarter_shift)
+    rew_circular_shift(envelope, quarter_shift)
+
+    return {
+        "correlation": correlation,
+        "envelope": envelope,
+        "rms": np.sqrt(np.mean(correlation**2)),
+    }
+
+
+def rew_find_correlation_peak(correlation_result, time_limit_samples=None):
+    """REW's peak finding with sub-sample interpolation"""
+    envelope = correlation_result["envelope"]
+    correlation = correlation_result["correlation"]
+    rms = correlation_result["rms"]
+    n = len(correlation)
+    quarter_shift = n // 4
+
+    peak_idx = int(np.argmax(envelope))
+    if time_limit_samples is not None:
+        search_start = max(0, quarter_shift - time_limit_samples)
+        search_end = min(len(envelope), quarter_shift + time_limit_samples + 1)
+        if search_end > search_start:
+            peak_idx = search_start + int(np.argmax(envelope[search_start:search_end]))
+    peak_val = envelope[peak_idx]
+
+    refined_idx, refined_val = rew_sinc_interpolate_peak(envelope, peak_idx)
+
+    # Undo the quarter shift; lags past n/2 are negative
+    shift_samples = refined_idx
+    if shift_samples > n / 2:
+        shift_samples -= n
+    shift_samples -= quarter_shift
+
+    return {
+        "shift_samples": shift_samples,
+        "peak_value": refined_val,
+        "correlation": min(peak_val / (rms + 1e-10), 1.0),
+    }
+
+
+def correlation_fft_length(measurements_data):
+    """Next power of two that holds the longest IR, at least MIN_FFT_LENGTH."""
+    max_length = max(len(data[0]) for data in measurements_data)
+    return max(2 ** int(np.ceil(np.log2(max_length))), MIN_FFT_LENGTH)
+
+
+class SpectrumStore:
+    """
+    Prepared spectra of one alignment run.
+
+    The FFT length is fixed for the run and every measurement is prepared
+    and transformed once; the shift found so far is applied to the cached
+    spectrum as a phase rotation instead of preparing the IR again.  The
+    rotation and correlation buffers are reused across iterations.
+    """
+
+    def __init__(self, measurements_data):
+        self.measurements_data = measurements_data
+        self.fft_length = correlation_fft_length(measurements_data)
+        self.reference_peak_time = measurements_data[0][3]
+        self._spectra = {}
+
+        bins = self.fft_length // 2 + 1
+        self._bins = np.arange(bins, dtype=np.float64)
+        self._phase = np.empty(bins)
+        self._rotated = np.empty(bins, dtype=np.complex128)
+        self._analytic = np.zeros(self.fft_length, dtype=np.complex128)
+
+    def spectrum(self, index):
+        """rfft of measurement *index* prepared for correlation (cached)."""
+        spectrum = self._spectra.get(index)
+        if spectrum is None:
+            ir, rate, start_time, timing_ref, _ = self.measurements_data[index]
+            spectrum = rew_prepare_ir_for_correlation(
+                ir, rate, start_time, timing_ref, self.fft_length, self.reference_peak_time
+            )
+            self._spectra[index] = spectrum
+        return spectrum
+
+    def shifted(self, index, shift):
+        """
+        Spectrum of measurement *index* moved earlier by *shift* seconds.
+        Returns a scratch buffer that the next call overwrites.
+        """
+        spectrum = self.spectrum(index)
+        if not shift:
+            return spectrum
+        rate = self.measurements_data[index][1]
+        np.multiply(self._bins, 2.0 * np.pi * shift * rate / self.fft_length, out=self._phase)
+        np.cos(self._phase, out=self._rotated.real)
+        np.sin(self._phase, out=self._rotated.imag)
+        self._rotated *= spectrum
+        return self._rotated
+
+    def correlate(self, index, shift):
+        """Correlation of measurement *index* (moved by *shift*) with the reference."""
+        return rew_cross_correlate_fft(
+            self.spectrum(0), self.shifted(index, shift), analytic=self._analytic
+        )
+
+
+def rew_cross_correlation_align(
+    measurements_data, max_iterations=10, convergence_threshold=1e-6
+):
+    """
+    Delay of every measurement relative to the first, in seconds.
+
+    *measurements_data* is a list of (samples, sample_rate, start_time,
+    timing_ref, title) tuples; the first one is the reference.  A
+    positive shift means the measurement arrives later than the reference.
+
+    Costs one forward FFT per measurement plus one inverse FFT per
+    measurement and iteration (see SpectrumStore).
+    """
+    if len(measurements_data) < 2:
+        return [0.0] * len(measurements_data)
+
+    store = SpectrumStore(measurements_data)
+    shifts = [0.0] * len(measurements_data)
+    converged = [False] * len(measurements_data)
+    converged[0] = True
+    print(f"   Reference: {measurements_data[0][4]}")
+
+    for iteration in range(max_iterations):
+        max_residual = 0.0
+        for i, (_, rate, _, _, title) in enumerate(measurements_data):
+            if converged[i]:
+                continue
+            # Move the target by what has been found so far; only the
+            # residual is measured this time round
+            peak_info = rew_find_correlation_peak(store.correlate(i, shifts[i]))
+
+            residual = peak_info["shift_samples"] / rate
+            shifts[i] += residual
+            converged[i] = abs(residual) < convergence_threshold
+            max_residual = max(max_residual, abs(residual))
+            print(
+                f"   Iteration {iteration + 1}, {title}: shift = {shifts[i] * 1000:.3f}ms, "
+                f"corr = {peak_info['correlation']:.3f}"
+            )
+
+        if all(converged):
+            print(
+                f"   Converged after {iteration + 1} iterations "
+                f"(last residual: {max_residual * 1000:.4f}ms)"
+            )
+            break
+
+    return shifts
+
+
+# ----------------------------------------------------------------------
+# channel backend
+# ----------------------------------------------------------------------
+class ChannelAlignment:
+    """
+    Result of aligning one channel: the delay of every measurement
+    against position 0 and, if they were uploaded, the aligned copies.
+    """
+
+    def __init__(self, channel, measurement_ids, positions, shifts, aligned_uuids=None):
+        self.channel = channel
+        self.measurement_ids = list(measurement_ids)
+        self.positions = list(positions)
+        self.shifts = list(shifts)
+        self.aligned_uuids = aligned_uuids
+
+    def __repr__(self):
+        uploaded = "uploaded" if self.aligned_uuids else "not uploaded"
+        return f"ChannelAlignment({self.channel}, {len(self.shifts)} positions, {uploaded})"
+
+
+def align_channel(channel, measurement_ids, status_callback=None, upload=True):
+    """
+    Align the measurements of one channel locally.
+
+    *measurement_ids* are UUIDs sorted by mic position (position 0, the
+    reference, first).  With *upload* the aligned IRs are imported into
+    REW; without it only the shifts are estimated (the local vector
+    average applies them itself).  Returns (ChannelAlignment, error_msg).
+    """
+    measurement_ids = list(measurement_ids)
+    if len(measurement_ids) < 2:
+        return None, f"Need at least 2 measurements to align {channel}"
+
+    if status_callback:
+        status_callback(f"Downloading {len(measurement_ids)} impulse responses for {channel}...")
+
+    positions = []
+    measurements_data = []
+    for index, (uuid, ir_json) in enumerate(
+        zip(measurement_ids, fetch_impulse_responses(measurement_ids))
+    ):
+        if not ir_json or "data" not in ir_json:
+            return None, f"No impulse response for {uuid}"
+        entry = measurement_index.get(uuid) or {}
+        position = entry.get("position")
+        positions.append(index if position is None else position)
+        measurements_data.append(
+            decode_impulse_response(ir_json, entry.get("title") or f"{channel}_pos{positions[-1]}")
+        )
+
+    rates = {data[1] for data in measurements_data}
+    if len(rates) > 1:
+        return None, f"Measurements of {channel} have different sample rates: {sorted(rates)}"
+
+    print(f"🔧 Local cross-correlation alignment for {channel}...")
+    shifts = rew_cross_correlation_align(measurements_data)
+    alignment = ChannelAlignment(channel, measurement_ids, positions, shifts)
+    if not upload:
+        return alignment, None
+
+    if status_callback:
+        status_callback(f"Uploading {len(shifts)} aligned impulse responses for {channel}...")
+
+    handles = []
+    for (samples, rate, start_time, _, title), position, shift in zip(
+        measurements_data, positions, shifts
+    ):
+        name = ALIGNED_TITLE.format(channel=channel, position=position)
+        handle = measurement_index.begin_capture(name)
+        success, error_msg = import_impulse_response(name, samples, rate, start_time - shift)
+        if not success:
+            return None, error_msg
+        print(f"   {title}: shift = {shift * 1000:+.3f} ms -> {name}")
+        handles.append(handle)
+
+    aligned_uuids = [handle.resolve() for handle in handles]
+    if not all(aligned_uuids):
+        return None, f"Could not find the aligned measurements of {channel} in REW"
+    alignment.aligned_uuids = aligned_uuids
+    return alignment, None
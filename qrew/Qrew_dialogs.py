@@ -1153,7 +1153,7 @@ class SettingsDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Application Settings")
         current_values = qs.as_dict()
-        self.setFixedSize(400, 440)
+        self.setFixedSize(400, 575)
         self.setModal(True)
         center_dialog_on_parent(self, parent)
 
@@ -1162,6 +1162,7 @@ class SettingsDialog(QDialog):
             ("show_vlc_gui", "Show VLC GUI"),
             ("show_tooltips", "Show Tool Tips"),
             ("auto_pause_on_quality_issue", "Pause on Quality Issues (CAUTION/RETAKE)"),
+            ("pipelined_capture", "Score While Capturing Next Channel"),
             ("save_after_repeat", "Prompt to Save after Repeat Run"),
             ("use_light_theme", "Use Light Theme"),
         ]
@@ -1225,6 +1226,51 @@ class SettingsDialog(QDialog):
         backend_layout.addStretch()
         form.addLayout(backend_layout)
 
+        # Cross correlation backend: REW's process or the local engine
+        align_layout = QHBoxLayout()
+        align_label = QLabel("Cross Corr Align:")
+        align_label.setStyleSheet("font-size: 14px; font-weight: normal;")
+
+        self.align_combo = QComboBox()
+        self.align_combo.addItems(["REW", "Local"])
+        self.align_combo.setCurrentText(current_values.get("cross_corr_backend", "REW"))
+        self.align_combo.setStyleSheet(COMBOBOX_STYLE)
+
+        align_layout.addWidget(align_label)
+        align_layout.addWidget(self.align_combo)
+        align_layout.addStretch()
+        form.addLayout(align_layout)
+
+        # Vector average backend: REW's process or the local engine
+        avg_layout = QHBoxLayout()
+        avg_label = QLabel("Vector Average:")
+        avg_label.setStyleSheet("font-size: 14px; font-weight: normal;")
+
+        self.avg_combo = QComboBox()
+        self.avg_combo.addItems(["REW", "Local"])
+        self.avg_combo.setCurrentText(current_values.get("vector_avg_backend", "REW"))
+        self.avg_combo.setStyleSheet(COMBOBOX_STYLE)
+
+        avg_layout.addWidget(avg_label)
+        avg_layout.addWidget(self.avg_combo)
+        avg_layout.addStretch()
+        form.addLayout(avg_layout)
+
+        # How many REW processing jobs (align/average) may run at once
+        jobs_layout = QHBoxLayout()
+        jobs_label = QLabel("Processing Jobs:")
+        jobs_label.setStyleSheet("font-size: 14px; font-weight: normal;")
+
+        self.jobs_combo = QComboBox()
+        self.jobs_combo.addItems(["1", "2", "3", "4"])
+        self.jobs_combo.setCurrentText(str(current_values.get("processing_concurrency", 1)))
+        self.jobs_combo.setStyleSheet(COMBOBOX_STYLE)
+
+        jobs_layout.addWidget(jobs_label)
+        jobs_layout.addWidget(self.jobs_combo)
+        jobs_layout.addStretch()
+        form.addLayout(jobs_layout)
+
         form.addStretch()
 
         # Visualization
@@ -1287,6 +1333,9 @@ class SettingsDialog(QDialog):
         """
         result = {k: cb.isChecked() for k, cb in self.checks.items()}
         result["vlc_backend"] = self.backend_combo.currentText()
+        result["cross_corr_backend"] = self.align_combo.currentText()
+        result["vector_avg_backend"] = self.avg_combo.currentText()
+        result["processing_concurrency"] = int(self.jobs_combo.currentText())
         result["speaker_config"] = self.cfg_combo.currentText()
         result["viz_view"] = self.viz_mode_combo.currentText()
         return result
@@ -1339,6 +1388,9 @@ class SettingsDialog(QDialog):
 
         # combos
         qs.set("vlc_backend", self.backend_combo.currentText())
+        qs.set("cross_corr_backend", self.align_combo.currentText())
+        qs.set("vector_avg_backend", self.avg_combo.currentText())
+        qs.set("processing_concurrency", int(self.jobs_combo.currentText()))
         qs.set("speaker_config", self.cfg_combo.currentText())
         qs.set("viz_view", self.viz_mode_combo.currentText())
         super().accept()  # close the dialog
@@ -0,0 +1,455 @@
+# Qrew_measurement_index.py
+"""In-process index of the measurements currently loaded in REW
+
+The index is filled once from REW and then kept current incrementally:
+
+* ``/rew-status`` callbacks for finished captures / processing call
+  :meth:`MeasurementIndex.invalidate`, and the next read only fetches
+  metadata for IDs it has not seen yet.
+* ``rename_measurement`` / ``delete_measurement_by_uuid`` /
+  ``delete_all_measurements`` patch the index directly.
+
+Every read starts with a cheap consistency check when the index has been
+invalidated: one ``GET /measurements`` for an ID-set diff, plus the
+metadata of the last known ID, fetched alongside any new ones.  REW
+numbers its list 1..N, so after a delete in REW and a new capture the
+ID set looks unchanged; the UUID behind the last known ID shows the
+shift.
+
+Captures are tracked the same way: :meth:`MeasurementIndex.begin_capture`
+records the UUIDs present before a measurement starts, and the returned
+:class:`CaptureHandle` resolves to the one new UUID carrying its title.
+"""
+import re
+import threading
+import time
+
+import requests
+
+try:
+    from .Qrew_rew_client import rew_client
+    from .Qrew_common import SPEAKER_LABELS
+except ImportError:
+    from Qrew_rew_client import rew_client
+    from Qrew_common import SPEAKER_LABELS
+
+
+# Measurement kinds recognised in titles
+TITLE_RAW = "raw"  # FL_pos0
+TITLE_VECTOR_AVG = "VectorAvg"  # FL_VectorAvg, FL_REW_vector_avg_IR
+TITLE_ALIGNED = "aligned"  # FL_REW_aligned_IR_pos0
+
+_CANONICAL_CHANNELS = {label.upper(): label for label in SPEAKER_LABELS}
+
+# One pattern for every title we produce, compiled once.  Longest labels
+# first so e.g. "TFL_pos0" is never read as channel "FL".
+_TITLE_RE = re.compile(
+    r"^(?P<channel>%s)_(?:"
+    r"pos(?P<raw>\d+)"
+    r"|(?P<avg>VectorAvg|REW_vector_avg_(?:FR|IR))"
+    r"|REW_aligned_(?:FR|IR)_pos(?P<aligned>\d+)"
+    r")$"
+    % "|".join(
+        re.escape(label) for label in sorted(SPEAKER_LABELS, key=len, reverse=True)
+    ),
+    re.IGNORECASE,
+)
+
+
+def parse_measurement_title(title):
+    """
+    Map a measurement title to (channel, position, kind).
+
+    position is None for vector averages.  Returns (None, None, None)
+    for titles that were not produced by Qrew.
+    """
+    match = _TITLE_RE.match(title or "")
+    if not match:
+        return None, None, None
+    channel = _CANONICAL_CHANNELS[match.group("channel").upper()]
+    if match.group("raw") is not None:
+        return channel, int(match.group("raw")), TITLE_RAW
+    if match.group("aligned") is not None:
+        return channel, int(match.group("aligned")), TITLE_ALIGNED
+    return channel, None, TITLE_VECTOR_AVG
+
+
+def canonical_channel(channel):
+    """Return the SPEAKER_LABELS spelling of *channel* (case-insensitive)."""
+    return _CANONICAL_CHANNELS.get((channel or "").upper(), channel)
+
+
+def group_measurements_by_channel(measurements, kind=TITLE_RAW):
+    """
+    Single pass over *measurements* (metadata dicts with a 'title').
+
+    Returns {channel: [(position, measurement), ...]} sorted by position,
+    holding only titles of the given *kind*.
+    """
+    grouped = {}
+    for measurement in measurements:
+        channel, position, title_kind = parse_measurement_title(
+            measurement.get("title", "")
+        )
+        if title_kind == kind:
+            grouped.setdefault(channel, []).append((position, measurement))
+    for entries in grouped.values():
+        entries.sort(key=lambda item: item[0] or 0)
+    return grouped
+
+
+class CaptureHandle:
+    """
+    One capture started through start_measurement().
+
+    ``uuid``, ``measurement_id`` and ``metadata`` are filled in by
+    :meth:`resolve` once REW has added the measurement.
+    """
+
+    def __init__(self, index, title, baseline):
+        self._index = index
+        self.title = title
+        self.baseline = baseline  # frozenset of UUIDs present before capture
+        self.uuid = None
+        self.measurement_id = None
+        self.metadata = None
+
+    def resolve(self, attempts=3, delay=0.2):
+        """Return the UUID of the captured measurement, or None."""
+        if self.uuid is None:
+            self._index.resolve_capture(self, attempts, delay)
+        return self.uuid
+
+    def __repr__(self):
+        return f"CaptureHandle({self.title!r}, uuid={self.uuid!r})"
+
+
+class MeasurementIndex:
+    """uuid -> {uuid, id, title, channel, position, kind, metadata}"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}  # uuid -> entry
+        self._order = []  # uuids in REW list order
+        self._id_to_uuid = {}  # REW list ID -> uuid
+        self._by_channel = None  # (channel, kind) -> [uuid], built lazily
+        self._loaded = False
+        self._dirty = False
+        self._claimed = set()  # UUIDs already bound to a CaptureHandle
+
+    # ------------------------------------------------------------------
+    # loading / syncing
+    # ------------------------------------------------------------------
+    def _fetch_ids(self):
+        return list(rew_client.get("/measurements").json())
+
+    def _fetch_metadata(self, ids):
+        try:
+            from .Qrew_api_helper import fetch_measurements_metadata
+        except ImportError:
+            from Qrew_api_helper import fetch_measurements_metadata
+        return fetch_measurements_metadata(ids)
+
+    def _make_entry(self, m_id, meta):
+        uuid = meta.get("uuid") or str(m_id)
+        title = meta.get("title", "")
+        channel, position, kind = parse_measurement_title(title)
+        return {
+            "uuid": uuid,
+            "id": m_id,
+            "title": title,
+            "channel": channel,
+            "position": position,
+            "kind": kind,
+            "metadata": meta,
+        }
+
+    def _store(self, m_id, meta):
+        entry = self._make_entry(m_id, meta)
+        uuid = entry["uuid"]
+        if uuid not in self._entries:
+            self._order.append(uuid)
+        self._entries[uuid] = entry
+        self._id_to_uuid[m_id] = uuid
+        self._by_channel = None
+
+    def reload(self):
+        """Rebuild the index from scratch. Returns True on success."""
+        with self._lock:
+            try:
+                ids = self._fetch_ids()
+            except (requests.RequestException, ValueError) as e:
+                print(f"MeasurementIndex: reload failed: {e}")
+                return False
+
+            results, failures = self._fetch_metadata(ids)
+            self._entries = {}
+            self._order = []
+            self._id_to_uuid = {}
+            self._by_channel = None
+            for m_id, meta in zip(ids, results):
+                if meta is not None:
+                    self._store(m_id, meta)
+
+            self._loaded = True
+            # Anything we failed to fetch is picked up by the next sync
+            self._dirty = bool(failures)
+            print(f"MeasurementIndex: loaded {len(self._entries)} measurements")
+            return True
+
+    def sync(self):
+        """
+        Bring the index in line with REW using an ID-set diff.
+
+        New IDs are fetched individually, together with the last known ID
+        as a check.  If any known ID has disappeared, or the last known ID
+        now holds another UUID (deletes outside Qrew, REW renumbering its
+        list), the index is rebuilt, since list IDs can no longer be
+        trusted to map to UUIDs.
+
+        Returns (added, removed) counts, or None if REW could not be reached.
+        """
+        with self._lock:
+            if not self._loaded:
+                before = len(self._entries)
+                if not self.reload():
+                    return None
+                return len(self._entries) - before, 0
+
+            try:
+                ids = self._fetch_ids()
+            except (requests.RequestException, ValueError) as e:
+                print(f"MeasurementIndex: sync failed: {e}")
+                return None
+
+            current = set(ids)
+            known = set(self._id_to_uuid)
+            new_ids = [m_id for m_id in ids if m_id not in known]
+            last_known = next((m_id for m_id in reversed(ids) if m_id in known), None)
+
+            shifted = False
+            if known <= current:
+                check = [] if last_known is None else [last_known]
+                results, failures = self._fetch_metadata(check + new_ids)
+                if check:
+                    meta, results = results[0], results[1:]
+                    shifted = (
+                        meta is not None
+                        and meta.get("uuid") != self._id_to_uuid[last_known]
+                    )
+            if shifted or not known <= current:
+                before = len(self._entries)
+                if not self.reload():
+                    return None
+                return max(0, len(self._entries) - before), max(
+                    0, before - len(self._entries)
+                )
+
+            added = 0
+            for m_id, meta in zip(new_ids, results):
+                if meta is not None:
+                    self._store(m_id, meta)
+                    added += 1
+
+            self._dirty = bool(failures)
+            if added:
+                print(f"MeasurementIndex: added {added} new measurements")
+            return added, 0
+
+    def is_consistent(self):
+        """Cheap check: does REW's ID list match the index?"""
+        try:
+            ids = self._fetch_ids()
+        except (requests.RequestException, ValueError):
+            return False
+        with self._lock:
+            return self._loaded and set(ids) == set(self._id_to_uuid)
+
+    def ensure_current(self):
+        """Load or sync if needed. Returns False if REW could not be reached."""
+        with self._lock:
+            if self._loaded and not self._dirty:
+                return True
+            return self.sync() is not None
+
+    # ------------------------------------------------------------------
+    # incremental updates
+    # ------------------------------------------------------------------
+    def invalidate(self):
+        """Mark the index as possibly stale (new captures, processing results)."""
+        self._dirty = True
+
+    def apply_rename(self, measurement_id, new_title):
+        with self._lock:
+            entry = self._lookup(measurement_id)
+            if entry is None:
+                self._dirty = True
+                return
+            entry["title"] = new_title
+            # measurements() handed the old dict out; callers keep their copy
+            entry["metadata"] = dict(entry["metadata"], title=new_title)
+            entry["channel"], entry["position"], entry["kind"] = (
+                parse_measurement_title(new_title)
+            )
+            self._by_channel = None
+
+    def apply_delete(self, measurement_id):
+        with self._lock:
+            entry = self._lookup(measurement_id)
+            if entry is None:
+                self._dirty = True
+                return
+            uuid = entry["uuid"]
+            del self._entries[uuid]
+            self._order.remove(uuid)
+            self._id_to_uuid.pop(entry["id"], None)
+            self._by_channel = None
+            self._renumber_after(entry["id"])
+
+    def _renumber_after(self, deleted_id):
+        """
+        REW numbers its list 1..N, so the measurements after a deleted one
+        move up by one.  Shifting our IDs the same way keeps the next
+        sync's ID diff clean instead of forcing a full reload; should REW
+        not renumber, that diff catches the mismatch and reloads.
+        """
+        try:
+            deleted = int(deleted_id)
+        except (TypeError, ValueError):
+            self._dirty = True  # not a list index; let the next read verify
+            return
+        id_to_uuid = {}
+        for m_id, uuid in self._id_to_uuid.items():
+            try:
+                number = int(m_id)
+            except (TypeError, ValueError):
+                id_to_uuid[m_id] = uuid
+                continue
+            if number > deleted:
+                m_id = type(m_id)(number - 1)
+                self._entries[uuid] = dict(self._entries[uuid], id=m_id)
+            id_to_uuid[m_id] = uuid
+        self._id_to_uuid = id_to_uuid
+
+    def apply_clear(self):
+        with self._lock:
+            self._entries = {}
+            self._order = []
+            self._id_to_uuid = {}
+            self._by_channel = None
+            self._claimed = set()
+            self._loaded = True
+            self._dirty = False
+
+    # ------------------------------------------------------------------
+    # capture tracking
+    # ------------------------------------------------------------------
+    def begin_capture(self, title):
+        """Snapshot the current UUIDs before a capture titled *title* starts."""
+        self.ensure_current()
+        with self._lock:
+            return CaptureHandle(self, title, frozenset(self._entries))
+
+    def resolve_capture(self, handle, attempts=3, delay=0.2):
+        """
+        Bind *handle* to the measurement its capture produced: a UUID that
+        was not in the baseline, preferring a matching title and, among
+        several (repeated retakes of one title), the oldest unclaimed one.
+        REW can lag its completion message slightly, hence the retries.
+        """
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(delay)
+            self.invalidate()
+            with self._lock:
+                if self.sync() is None:
+                    continue
+                new = [
+                    uuid
+                    for uuid in self._order
+                    if uuid not in handle.baseline and uuid not in self._claimed
+                ]
+                matches = [u for u in new if self._entries[u]["title"] == handle.title]
+                if not matches and len(new) == 1:
+                    matches = new  # REW altered the title (e.g. de-duplication)
+                if matches:
+                    entry = self._entries[matches[0]]
+                    self._claimed.add(entry["uuid"])
+                    handle.uuid = entry["uuid"]
+                    handle.measurement_id = entry["id"]
+                    handle.metadata = entry["metadata"]
+                    return handle.uuid
+        print(f"MeasurementIndex: could not resolve capture {handle.title!r}")
+        return None
+
+    def _lookup(self, measurement_id):
+        entry = self._entries.get(measurement_id)
+        if entry is None:
+            uuid = self._id_to_uuid.get(measurement_id)
+            entry = self._entries.get(uuid) if uuid else None
+        return entry
+
+    # ------------------------------------------------------------------
+    # queries
+    # ------------------------------------------------------------------
+    def measurements(self):
+        """Metadata dicts in REW list order, or None if REW is unreachable."""
+        if not self.ensure_current():
+            return None
+        with self._lock:
+            return [self._entries[uuid]["metadata"] for uuid in self._order]
+
+    def count(self):
+        if not self.ensure_current():
+            return -1
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, measurement_id):
+        with self._lock:
+            return self._lookup(measurement_id)
+
+    def entries(self):
+        """Snapshot of all index entries in REW list order ([] if unreachable)."""
+        if not self.ensure_current():
+            return []
+        with self._lock:
+            return [dict(self._entries[uuid]) for uuid in self._order]
+
+    def for_channel(self, channel, kind=TITLE_RAW):
+        """
+        Measurements of *kind* for *channel*, sorted by position.
+        Returns list of {'uuid', 'position', 'title', 'measurement'} dicts.
+        """
+        if not self.ensure_current():
+            return []
+        key = (canonical_channel(channel), kind)
+        with self._lock:
+            if self._by_channel is None:
+                self._rebuild_channel_index()
+            entries = [self._entries[uuid] for uuid in self._by_channel.get(key, ())]
+        return [
+            {
+                "uuid": entry["uuid"],
+                "position": entry["position"],
+                "title": entry["title"],
+                "measurement": entry["metadata"],
+            }
+            for entry in entries
+        ]
+
+    def _rebuild_channel_index(self):
+        """(channel, kind) -> [uuid, ...] sorted by position, in one pass."""
+        by_channel = {}
+        for uuid in self._order:
+            entry = self._entries[uuid]
+            if entry["kind"] is not None:
+                key = (entry["channel"], entry["kind"])
+                by_channel.setdefault(key, []).append(uuid)
+        for uuids in by_channel.values():
+            uuids.sort(key=lambda u: self._entries[u]["position"] or 0)
+        self._by_channel = by_channel
+
+
+# Global index instance
+measurement_index = MeasurementIndex()
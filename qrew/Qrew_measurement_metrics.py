@@ -2,9 +2,14 @@
 """
 
 """
+import binascii
+import threading
+
 import numpy as np
-import pandas as pd
-import base64
+
+# Bump whenever a metric or the scoring formula changes; cached scores
+# (Qrew_quality_cache) from other versions are then ignored.
+SCORING_VERSION = 1
 
 def _scale(value, low, high, max_pts, inverse=False):
     """
@@ -17,6 +22,48 @@ def _scale(value, low, high, max_pts, inverse=False):
     frac = (value - low) / (high - low)
     return float(np.clip(frac, 0.0, 1.0) * max_pts)
 
+# Per-thread scratch buffers for IR decoding (the quality loader scores in
+# several threads); grown on demand and reused between calls.
+_ir_scratch = threading.local()
+
+
+def _scratch(name, size, dtype):
+    buf = getattr(_ir_scratch, name, None)
+    if buf is None or buf.size < size:
+        buf = np.empty(size, dtype=dtype)
+        setattr(_ir_scratch, name, buf)
+    return buf[:size]
+
+
+def decode_ir_samples(ir_base64):
+    """
+    Decode REW's base64 big-endian float32 IR into a reusable native float32
+    buffer (per thread; the next call overwrites it, so copy to keep it).
+    Non-finite samples become 0.  Samples are left in REW's percent scale;
+    callers apply the /100.
+    """
+    # a2b_base64 reads the ASCII str directly; b64decode would first copy
+    # it into a bytes object.
+    raw = np.frombuffer(binascii.a2b_base64(ir_base64), dtype='>f4')
+    samples = _scratch("samples", raw.size, np.float32)
+    np.copyto(samples, raw)  # byte-swap and copy in one pass
+    if not np.isfinite(samples).all():
+        np.nan_to_num(samples, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    return samples
+
+
+def _region_energy(samples, start, end):
+    """sum(samples[start:end] ** 2), accumulated in float64 without a temporary."""
+    region = samples[start:end]
+    return float(np.einsum("i,i->", region, region, dtype=np.float64))
+
+
+def _region_peak(samples, start, end):
+    """max(|samples[start:end]|) without allocating a temporary."""
+    region = samples[start:end]
+    return max(float(region.max()), -float(region.min()))
+
+
 def calculate_rew_metrics_from_ir(ir, harm_factor=0.5):
     """
     Calculate metrics exactly like REW using impulse response data.
@@ -29,67 +76,71 @@ def calculate_rew_metrics_from_ir(ir, harm_factor=0.5):
     timing_offset = ir.get('timingOffset', 0.0)
     delay = ir.get('delay', 0.0)
     effective_timing_ref = timing_ref_time + timing_offset + delay
-    
-    ir_bytes = base64.b64decode(ir_base64)
-    ir_array = np.frombuffer(ir_bytes, dtype='>f4')  # REW uses big-endian float32
-    ir_array = ir_array / 100  #change from percentage values  
-    # Handle NaN/Inf values
-    if np.isnan(ir_array).sum() > 0 or np.isinf(ir_array).sum() > 0:
-        ir_array = np.nan_to_num(ir_array, nan=0.0, posinf=0.0, neginf=0.0)
-    """
-    # Normalize if values are too large
-    max_val = np.max(np.abs(ir_array))
-    if max_val > 10.0:
-        ir_array = ir_array / max_val
-    
-    ir_array = np.clip(ir_array, -1.0, 1.0)
 
-    """
+    # REW sends percent values; rather than rescaling every sample, the
+    # few amplitudes / energies we use are divided by 100 / 100**2.
+    samples = decode_ir_samples(ir_base64)
+    n = samples.size
+    scale = 100.0
+    energy_scale = scale * scale
+
     T = 1.0 / sample_rate  # Sample interval
-    
+
     # Step 1: Find the absolute maximum (peak) index
-    abs_max_idx = np.argmax(np.abs(ir_array))
-    peak_value = np.abs(ir_array[abs_max_idx])
+    hi_idx = int(samples.argmax())
+    lo_idx = int(samples.argmin())
+    if -samples[lo_idx] > samples[hi_idx]:
+        abs_max_idx = lo_idx
+    elif -samples[lo_idx] < samples[hi_idx]:
+        abs_max_idx = hi_idx
+    else:
+        abs_max_idx = min(lo_idx, hi_idx)  # argmax(|x|) returns the first hit
+    peak_value = abs(float(samples[abs_max_idx])) / scale
     peak_time_sec = start_time + (abs_max_idx * T)
-    
+
     # Convert to milliseconds
     peak_time_ms = peak_time_sec * 1000
     # Step 2: Calculate time window based on harmonic factor
     time_window = harm_factor * np.log(2.0)
     window_samples = int(round(time_window / T))
-    
+
     # Step 3: Define analysis regions
     analysis_start = abs_max_idx - window_samples // 4
-    window_size = len(ir_array) // 4
-    
+    window_size = n // 4
+
     # Ensure we don't go out of bounds
     analysis_start = max(0, analysis_start)
-    window_size = min(window_size, len(ir_array) - analysis_start)
-    
+    window_size = min(window_size, n - analysis_start)
+
     # Step 4: Calculate power in each region
-    
     # SIGNAL REGION: After the peak (direct sound)
     signal_start = analysis_start
-    signal_end = min(signal_start + window_size, len(ir_array))
-    signal_power = np.sum(ir_array[signal_start:signal_end] ** 2)
-    peak_signal_power = np.max(ir_array[signal_start:signal_end] ** 2)
-    
+    signal_end = min(signal_start + window_size, n)
+
     # DISTORTION REGION: Before the peak (early reflections)
     dist_start = max(0, analysis_start - window_size)
     dist_end = analysis_start
-    if dist_end > dist_start:
-        dist_power = np.max(ir_array[dist_start:dist_end] ** 2)
-    else:
-        dist_power = 1e-10  # Avoid log(0)
-    
+
     # NOISE REGION: Further before the peak
     noise_start = max(0, dist_start - window_size)
     noise_end = dist_start
+
+    # Only two regions need an energy sum, so each is one float64 dot
+    # product; a cumulative-energy array (a sequential cumsum over the
+    # whole span) cost ten times as much.
+    signal_power = _region_energy(samples, signal_start, signal_end) / energy_scale
+    peak_signal_power = (_region_peak(samples, signal_start, signal_end) / scale) ** 2
+
+    if dist_end > dist_start:
+        dist_power = (_region_peak(samples, dist_start, dist_end) / scale) ** 2
+    else:
+        dist_power = 1e-10  # Avoid log(0)
+
     if noise_end > noise_start:
-        noise_power = np.sum(ir_array[noise_start:noise_end] ** 2)
+        noise_power = _region_energy(samples, noise_start, noise_end) / energy_scale
     else:
         noise_power = 1e-10  # Avoid log(0)
-    
+
     # Step 5: Convert to dBFS
     signal_dbfs = 10 * np.log10(signal_power)
     dist_dbfs = 10 * np.log10(dist_power)
@@ -121,6 +172,24 @@ def calculate_rew_metrics_from_ir(ir, harm_factor=0.5):
     }
 
 
+def distortion_columns(thd_json):
+    """
+    Column-oriented view of a REW distortion table.
+
+    Returns {header: 1-D float64 array} for every entry of
+    ``thd_json["columnHeaders"]``; missing values become NaN.
+    """
+    cols = thd_json["columnHeaders"]
+    table = np.asarray(thd_json["data"], dtype=np.float64).reshape(-1, len(cols))
+    return {name: table[:, i] for i, name in enumerate(cols)}
+
+
+def _nan_stat(func, values):
+    """Reduce like pandas: NaNs are skipped, empty input gives NaN."""
+    values = values[~np.isnan(values)]
+    return func(values) if values.size else np.nan
+
+
 def evaluate_measurement(thd_json: dict,
                          info_json: dict,
                          coherence_array: np.ndarray | None = None,
@@ -151,29 +220,29 @@ def evaluate_measurement(thd_json: dict,
         detail       : sub-scores for inspection
     """
     # --- unpack THD ---------------------------------------------------
-    cols  = thd_json["columnHeaders"]
-    data  = pd.DataFrame(thd_json["data"], columns=cols)
+    data  = distortion_columns(thd_json)
     freqs = data["Freq (Hz)"]
     thd   = data["THD (%)"]
 
-    if "Noise (%)" in data.columns:
+    if "Noise (%)" in data:
         noise = data["Noise (%)"]
         noise = noise / 10000
         has_noise_data = True
     else:
-        noise = pd.Series(np.zeros(len(thd)))
+        noise = np.zeros(len(thd))
         has_noise_data = False
         print("Warning: No 'Noise (%)' column found, SDR will be THD-only")
 
 
     # Fix REW API bug - THD values appear to be multiplied by 10000
     # Check if values are unreasonably high (>100% THD is very rare)
-    if thd.max() > 100:
-        print(f"THD values appear to be scaled incorrectly (max: {thd.max():.1f}%), dividing by 10000")
+    thd_max = _nan_stat(np.max, thd)
+    if thd_max > 100:
+        print(f"THD values appear to be scaled incorrectly (max: {thd_max:.1f}%), dividing by 10000")
         thd = thd / 10000
         # Also fix harmonic columns if present
         for col in ["H2 (%)", "H3 (%)", "H4 (%)", "H5 (%)", "H6 (%)", "H7 (%)", "H8 (%)", "H9 (%)"] :
-            if col in data.columns:
+            if col in data:
                 data[col] = data[col] / 10000
     
     # Band-limited THD statistics
@@ -184,10 +253,10 @@ def evaluate_measurement(thd_json: dict,
     # Calculate THD+N (Root Sum of Squares)
     thd_plus_n_band = (thd_band**2 + noise_band**2)**0.5
     
-    mean_thd = thd_band.mean()
-    max_thd = thd_band.max()
-    mean_thd_n = thd_plus_n_band.mean()
-    max_thd_n = thd_plus_n_band.max()
+    mean_thd = _nan_stat(np.mean, thd_band)
+    max_thd = _nan_stat(np.max, thd_band)
+    mean_thd_n = _nan_stat(np.mean, thd_plus_n_band)
+    max_thd_n = _nan_stat(np.max, thd_plus_n_band)
     
     # Low frequency analysis
     low_mask = freqs < 200
@@ -195,8 +264,8 @@ def evaluate_measurement(thd_json: dict,
         thd_low = thd[low_mask]
         noise_low = noise[low_mask]
         thd_plus_n_low = (thd_low**2 + noise_low**2)**0.5
-        low_thd = thd_low.mean()
-        low_thd_n = thd_plus_n_low.mean()
+        low_thd = _nan_stat(np.mean, thd_low)
+        low_thd_n = _nan_stat(np.mean, thd_plus_n_low)
     else:
         low_thd = mean_thd
         low_thd_n = mean_thd_n
@@ -212,11 +281,11 @@ def evaluate_measurement(thd_json: dict,
     low_sdr = calculate_sdr(low_thd_n)
 
     # Harmonic analysis (unchanged)
-    h2 = data.get("H2 (%)", pd.Series(np.zeros(len(thd))))
-    h3 = data.get("H3 (%)", pd.Series(np.zeros(len(thd))))
+    h2 = data.get("H2 (%)", np.zeros(len(thd)))
+    h3 = data.get("H3 (%)", np.zeros(len(thd)))
     valid_mask = (h2 > 0)
     if valid_mask.any():
-        h3_h2_ratio = (h3[valid_mask] / h2[valid_mask]).median()
+        h3_h2_ratio = _nan_stat(np.median, h3[valid_mask] / h2[valid_mask])
     else:
         h3_h2_ratio = 0
         
@@ -298,68 +367,54 @@ def evaluate_measurement(thd_json: dict,
         }
     }
 
+# Scoring table shared by combine_and_score_metrics and the batch engine
+# (Qrew_batch_metrics): (source, detail key, low, high, max points,
+# inverse).  source "ir" is calculate_rew_metrics_from_ir's detail,
+# "freq" evaluate_measurement's.
+SCORE_TERMS = (
+    ("ir", "snr_dB", 20, 75, 20, False),  # 1 · Signal-to-Noise Ratio (20-75 dB → 0-20 pts)
+    ("ir", "sdr_dB", 20, 55, 15, False),  # 2 · Signal-to-Distortion-Ratio (20-55 dB → 0-15 pts)
+    ("freq", "mean_thd_%", 2.0, 0.0, 15, True),  # 3 · Mean broadband THD (2 %→0 … 0 %→15)
+    ("freq", "max_thd_%", 10.0, 0.0, 10, True),  # 4 · Worst narrow-band THD spike (10 %→0 … 0 %→10)
+    ("freq", "low_thd_%", 15.0, 0.0, 5, True),  # 5 · Low-frequency THD, 20-200 Hz (15 %→0 … 0 %→5)
+    ("freq", "h3/h2_ratio", 1.0, 0.0, 5, True),  # 6 · Odd-order harshness H3/H2 (1.0→0 … 0→5)
+    ("freq", "coh_mean", 0.90, 0.99, 15, False),  # 7 · Coherence mean (0.90→0 … 0.99→15), skipped if None
+    ("ir", "ir_pk_noise_dB", 35, 55, 15, False),  # 8 · IR peak-to-noise (35 dB→0 … 55 dB→15)
+)
+
+# Lowest score for each rating, best first; anything lower is RETAKE
+RATING_THRESHOLDS = ((70, "PASS"), (50, "CAUTION"))
+
+
+def rating_for(score):
+    for threshold, rating in RATING_THRESHOLDS:
+        if score >= threshold:
+            return rating
+    return "RETAKE"
+
+
 def combine_and_score_metrics(rew_metrics, freq_metrics):
     """
     Score the IR-related metrics (`rew_metrics`) and the frequency-domain /
     THD metrics (`freq_metrics`) and return a single score / rating.
     """
 
-    r_det = rew_metrics.get("detail", {})
-    f_det = freq_metrics.get("detail", {})
-
-    # IR-derived
-    snr_dB         = r_det.get("snr_dB",         0.0)
-    sdr_dB         = r_det.get("sdr_dB",         0.0)
-    ir_peak_noise_dB = r_det.get("ir_pk_noise_dB", 0.0)
-
-    # frequency-domain / THD derived
-    coh_mean   = f_det.get("coh_mean",   0.0)
-    mean_thd   = f_det.get("mean_thd_%", 0.0)
-    max_thd    = f_det.get("max_thd_%",  0.0)
-    low_thd    = f_det.get("low_thd_%",  0.0)
-    h3_h2_ratio= f_det.get("h3/h2_ratio",0.0)
+    details = {
+        "ir": rew_metrics.get("detail", {}),
+        "freq": freq_metrics.get("detail", {}),
+    }
 
     score = 0.0
-
-    # 1 · Signal-to-Noise Ratio  (40-80 dB → 0-20 pts)
-    score += _scale(snr_dB, 20, 75, 20)
-
-    # 2 · Signal-to-Distortion-Ratio (SDR)  (35-55 dB → 0-15 pts)
-    score += _scale(sdr_dB, 20, 55, 15)
-
-    # 3 · Mean broadband THD  (2 %→0 pts … 0.0 %→15 pts)
-    score += _scale(mean_thd, 2.0, 0.0, 15, inverse=True)
-
-    # 4 · Worst narrow-band THD spike  (10 %→0 … 0 %→10)
-    score += _scale(max_thd, 10.0, 0.0, 10, inverse=True)
-
-    # 5 · Low-frequency THD (20-200 Hz)  (15 %→0 … 0 %→5)
-    score += _scale(low_thd, 15.0, 0.0, 5, inverse=True)
-
-    # 6 · Odd-order harshness  H3/H2 (1.0→0 … 0→5)
-    score += _scale(h3_h2_ratio, 1.0, 0.0, 5, inverse=True)
-
-    # 7 · Coherence mean  (0.90→0 … 0.99→15)
-    if coh_mean is not None:
-        score += _scale(coh_mean, 0.90, 0.99, 15)    
-    else:
-        score += 0
-
-    # 8 · IR peak-to-noise  (35 dB→0 … 55 dB→15)
-    score += _scale(ir_peak_noise_dB, 35, 55, 15)
+    for source, key, low, high, max_pts, inverse in SCORE_TERMS:
+        value = details[source].get(key, 0.0)
+        if value is not None:  # no coherence data
+            score += _scale(value, low, high, max_pts, inverse=inverse)
 
     score = round(float(np.clip(score, 0, 100)), 1)
 
-    if score >= 70:
-        rating = "PASS"
-    elif score >= 50:
-        rating = "CAUTION"
-    else:
-        rating = "RETAKE"
-
     return {
         "score": score,
-        "rating": rating
+        "rating": rating_for(score)
     }
 
 
@@ -1,21 +1,54 @@
 # Qrew_message_handlers.py
+import math
 import numpy as np
 import time
-from flask import Flask, request, jsonify
-from collections import deque
-from threading import Event
+import secrets
+from threading import Event, Lock
 from PyQt5.QtCore import QObject, pyqtSignal
-from gevent.pywsgi import WSGIServer
 
 try:
     from .Qrew_api_helper import get_last_error, get_last_warning
+    from .Qrew_measurement_index import measurement_index
     from .Qrew_vlc_helper_v2 import play_file, find_sweep_file
+    from .Qrew_callback_server import CallbackServer
+    from .Qrew_rta_buffer import rta_buffer, RunningStats, Throttle
+    from .Qrew_status_log import StatusLog
+    from . import Qrew_settings as qs
+    from .Qrew_status_events import (
+        status_bus,
+        parse_status,
+        StatusEvent,
+        NoiseFloorProgress,
+        SweepProgress,
+        MeasurementComplete,
+        ProcessResult,
+        Abort,
+        Error,
+    )
 except ImportError:
     from Qrew_api_helper import get_last_error, get_last_warning
+    from Qrew_measurement_index import measurement_index
     from Qrew_vlc_helper_v2 import play_file, find_sweep_file
+    from Qrew_callback_server import CallbackServer
+    from Qrew_rta_buffer import rta_buffer, RunningStats, Throttle
+    from Qrew_status_log import StatusLog
+    import Qrew_settings as qs
+    from Qrew_status_events import (
+        status_bus,
+        parse_status,
+        StatusEvent,
+        NoiseFloorProgress,
+        SweepProgress,
+        MeasurementComplete,
+        ProcessResult,
+        Abort,
+        Error,
+    )
 
 
-status_log = deque(maxlen=100)
+# Status lines, warnings and errors for the /status-log endpoint;
+# settings.json only: also append them to this JSON-lines file
+status_log = StatusLog(segment_path=qs.get("status_log_file") or None)
 
 
 class MessageBridge(QObject):
@@ -36,21 +69,98 @@ class MessageBridge(QObject):
         print(f"MessageBridge: Emitting Error: {error}")
         self.error_received.emit(error)
 
+    def on_status_event(self, event):
+        """status_bus subscriber: user-facing messages for REW status."""
+        op = coordinators.get(event.operation) if event.operation else None
+        ch, pos = (op.channel, op.position) if op else (None, None)
+        if isinstance(event, NoiseFloorProgress):
+            if event.percent == 100:
+                self.emit_message("Noise floor captured")
+        elif isinstance(event, SweepProgress):
+            if event.percent == 6 and "Waiting for timing reference" in event.text:
+                self.emit_message("Waiting for timing reference...")
+            elif event.percent == 8 and "Remaining sweeps: 1" in event.text:
+                self.emit_message("Sweep in progress...")
+        elif isinstance(event, MeasurementComplete):
+            if ch and pos is not None:
+                self.emit_message(f"Completed {ch}_pos{pos}")
+        elif isinstance(event, Abort):
+            self.emit_error("Measurement aborted - will retry")
+        elif isinstance(event, Error):
+            if ch and pos is not None:
+                self.emit_error(f"REW error detected: {event.raw}")
+        elif isinstance(event, ProcessResult):
+            operation = PROCESS_OPERATIONS.get(event.process_name.lower())
+            if operation and ch and pos == operation:
+                label = PROCESS_LABELS[operation]
+                if event.completed:
+                    self.emit_message(f"{label} completed for {ch}")
+                elif event.failed:
+                    self.emit_error(f"{label} failed for {ch}")
+
 
 # Global bridge instance
 message_bridge = MessageBridge()
 
 
+class CoordinatorSignals(QObject):
+    """Qt side of the coordinators, emitted once per finished operation.
+
+    Triggers come from the callback server thread, so connected workers
+    receive the result as a queued call in their own thread.
+    """
+
+    result_ready = pyqtSignal(str, str, str)  # operation id, status, error message
+
+
+# REW processName -> coordinator "position" of the matching operation
+PROCESS_OPERATIONS = {"cross corr align": "cross_corr", "vector average": "vector_avg"}
+PROCESS_LABELS = {"cross_corr": "Cross correlation", "vector_avg": "Vector averaging"}
+
+# Callback path for process-measurements; each operation appends its id
+# so REW posts the result straight to the right coordinator
+STATUS_PATH = "/rew-status"
+
+
 # Keep the same MeasurementCoordinator class
 class MeasurementCoordinator:
-    def __init__(self):
+    """
+    One operation: a capture (position is a mic position) or a processing
+    job (position is "cross_corr" / "vector_avg").  Every reset() starts a
+    new operation with a fresh ``op_id`` and registers it, so results of
+    an earlier attempt can never settle the current one.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry
         self.event = Event()
         self.channel = None
         self.position = None
         self.status = None  # 'success', 'abort', 'error', 'timeout'
         self.error_message = None
+        self.op_id = None
+        self.uuids = []  # input measurements of a processing job
+        self.results = {}  # ProcessResult.results of a processing job
+        self.signals = registry.signals if registry else CoordinatorSignals()
+
+    @property
+    def kind(self):
+        return self.position if self.position in PROCESS_LABELS else "capture"
+
+    @property
+    def pending(self):
+        return (
+            self.channel is not None
+            and self.position is not None
+            and self.status is None
+        )
 
-    def reset(self, channel, position):
+    @property
+    def result_url(self):
+        """resultUrl for process-measurements that routes back to this operation."""
+        return callback_url(f"{STATUS_PATH}/{self.op_id}")
+
+    def reset(self, channel, position, uuids=None):
         if isinstance(position, str):
             print(f"Coordinator: Reset to {channel}_{position}")
         else:
@@ -60,7 +170,29 @@ class MeasurementCoordinator:
         self.position = position
         self.status = None
         self.error_message = None
+        self.op_id = secrets.token_hex(8)
+        self.uuids = list(uuids or [])
+        self.results = {}
         self.event.clear()
+        if self.registry is not None:
+            self.registry.register(self)
+
+    def new_measurement_id(self):
+        """ID of the measurement a processing job created (first results key)."""
+        if not self.results:
+            return None
+        measurement_id = next(iter(self.results))
+        if isinstance(measurement_id, str) and measurement_id.isdigit():
+            measurement_id = int(measurement_id)
+        return measurement_id
+
+    def _finish(self, status, message=None):
+        if self.status is not None:
+            return  # first result wins; later ones belong to nobody
+        self.status = status
+        self.error_message = message
+        self.event.set()
+        self.signals.result_ready.emit(self.op_id or "", status, message or "")
 
     def trigger_success(self):
         if isinstance(self.position, str):
@@ -68,24 +200,36 @@ class MeasurementCoordinator:
         else:
             print(f"Coordinator: Triggered for {self.channel}_pos{self.position}")
 
-        self.status = "success"
-        self.error_message = None
-        self.event.set()
+        self._finish("success")
 
     def trigger_abort(self, message=None):
-        self.status = "abort"
-        self.error_message = message
-        self.event.set()
+        self._finish("abort", message)
 
     def trigger_error(self, message=None):
-        self.status = "error"
-        self.error_message = message
-        self.event.set()
-
-    def trigger_timeout(self):
-        self.status = "timeout"
-        self.error_message = "Operation timed out"
-        self.event.set()
+        self._finish("error", message)
+
+    def trigger_timeout(self, message="Operation timed out"):
+        self._finish("timeout", message)
+
+    def on_status_event(self, event):
+        """Settle this operation from an event routed to it."""
+        if isinstance(event, MeasurementComplete):
+            if self.channel and self.position is not None:
+                print(f"Triggering completion for {self.channel}_pos{self.position}")
+                self.trigger_success()
+        elif isinstance(event, Abort):
+            self.trigger_abort("Measurement was aborted")
+        elif isinstance(event, Error):
+            if self.channel and self.position is not None:
+                self.trigger_error(f"REW error: {event.raw}")
+        elif isinstance(event, ProcessResult):
+            operation = PROCESS_OPERATIONS.get(event.process_name.lower())
+            if operation and self.channel and self.position == operation:
+                if event.completed:
+                    self.results = event.results
+                    self.trigger_success()
+                elif event.failed:
+                    self.trigger_error(f"{PROCESS_LABELS[operation]} failed")
 
     def wait_for_result(self, timeout=300):  # 5 minutes default
         if isinstance(self.position, str):
@@ -100,102 +244,340 @@ class MeasurementCoordinator:
         return self.status, self.error_message
 
 
-# Global coordinator instance
-coordinator = MeasurementCoordinator()
+class CoordinatorRegistry:
+    """
+    Coordinators of the operations in flight, keyed by operation id.
+
+    REW callbacks are routed to one of them:
+      * by the id in the callback URL (``/rew-status/<op_id>``),
+      * for an untagged process result, by processName plus the input
+        UUIDs (or, if REW does not echo them, the oldest pending job of
+        that kind),
+      * for capture status lines, to the capture in progress - REW only
+        runs one sweep at a time.
+    So a channel can be processed while the next one is captured, and
+    several process-measurements jobs can be queued in REW at once.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._operations = {}  # op_id -> MeasurementCoordinator, oldest first
+        self.signals = CoordinatorSignals()
+
+    def begin(self, channel, position, uuids=None):
+        """Start and register a new operation; returns its coordinator."""
+        op = MeasurementCoordinator(self)
+        op.reset(channel, position, uuids)
+        return op
+
+    def register(self, op):
+        with self._lock:
+            # Finished operations stay reachable until the next one starts,
+            # so late subscribers can still look them up by id
+            self._operations = {
+                op_id: other
+                for op_id, other in self._operations.items()
+                if other is not op and other.status is None
+            }
+            self._operations[op.op_id] = op
+
+    def discard(self, op):
+        """Forget an abandoned operation (worker stopped before its result)."""
+        if op is None:
+            return
+        with self._lock:
+            self._operations.pop(op.op_id, None)
+
+    def get(self, op_id):
+        with self._lock:
+            return self._operations.get(op_id)
+
+    def pending(self, kind=None):
+        with self._lock:
+            return [
+                op
+                for op in self._operations.values()
+                if op.pending and (kind is None or op.kind == kind)
+            ]
+
+    @property
+    def capture(self):
+        """Coordinator of the capture in progress, or None."""
+        captures = self.pending("capture")
+        return captures[-1] if captures else None
+
+    def oldest_processing(self):
+        for op in self.pending():
+            if op.kind != "capture":
+                return op
+        return None
+
+    def route(self, event):
+        """Coordinator an event belongs to, or None."""
+        if event.operation:
+            return self.get(event.operation)
+        if isinstance(event, ProcessResult):
+            kind = PROCESS_OPERATIONS.get(event.process_name.lower())
+            candidates = self.pending(kind) if kind else []
+            uuids = set(event.measurement_uuids)
+            if uuids:
+                candidates = [op for op in candidates if uuids == set(op.uuids)]
+            return candidates[0] if candidates else None
+        return self.capture
+
+    def on_status_event(self, event):
+        """status_bus subscriber: settle the operation an event belongs to."""
+        op = self.route(event)
+        if op is None:
+            return
+        event.operation = op.op_id  # later subscribers see the routing
+        op.on_status_event(event)
+
+
+# Global registry; every coordinator registers itself on reset()
+coordinators = CoordinatorRegistry()
+
+# Single-slot coordinator kept for the legacy workers
+coordinator = MeasurementCoordinator(coordinators)
 
 
 class RTAVerificationCoordinator:
-    def __init__(self):
+    """
+    Collects an RTA verification run.  Samples are not copied: the run is
+    the range of rta_buffer rows between two cursors.  Running statistics
+    are updated as each row arrives, so the result is ready the moment
+    collection stops, and with early_stop the run ends as soon as the THD
+    spread has settled instead of after the full duration.  With
+    ci_limits (adaptive mode) it ends once the confidence interval on the
+    mean of every listed metric is inside its limit.  ``done`` is set
+    whenever a run stops, so waiters need not poll.
+    """
+
+    # REW's first updates come from a partly filled FFT
+    MIN_SAMPLES_PROCESSED = 50000
+    # Leading share of the run treated as settling and left out of the stats
+    SETTLE_FRACTION = 0.25
+    # Metrics (rta_buffer columns) with running statistics
+    METRICS = ("thd", "thd_plus_n", "snr", "enob", "imd")
+    # THD std has converged once its smoothed per-sample change is below
+    # this share of the std (or of STD_FLOOR, in % THD, for very clean runs)
+    STD_TOLERANCE = 0.02
+    STD_FLOOR = 0.002
+    # Two-sided 95% confidence interval on a mean.  It assumes independent
+    # samples, but consecutive updates come from FFTs that overlap by
+    # RTA_OVERLAP (set_rta_configuration's maximumOverlap), so only about
+    # one update in 1 / (1 - RTA_OVERLAP) brings new data: the interval
+    # uses that effective count, n * (1 - RTA_OVERLAP), instead of n.
+    # Below MIN_EFFECTIVE_SAMPLES the normal approximation is too optimistic
+    # and the interval is treated as unbounded.
+    CI_Z = 1.96
+    RTA_OVERLAP = 0.9375
+    MIN_EFFECTIVE_SAMPLES = 4
+
+    def __init__(self, buffer=rta_buffer):
+        self.buffer = buffer
         self.collecting = False
-        self.samples = []
         self.start_time = None
+        self.start_cursor = 0
+        self.end_cursor = 0
+        self.sample_count = 0
         self.target_duration = 10  # seconds
+        self.settle_time = self.target_duration * self.SETTLE_FRACTION
         self.min_samples = 20
-
-    def start_collection(self, duration=10):
-        """Start collecting RTA samples"""
+        self.min_duration = 0.0
+        self.early_stop = False
+        self.ci_limits = {}  # metric -> max CI half-width (adaptive mode)
+        self.early_stopped = False
+        self.last_received = None
+        self.stats = {metric: RunningStats() for metric in self.METRICS}
+        self._last_thd_std = 0.0
+        self._thd_std_drift = math.inf
+        self.result = None
+        self.done = Event()
+
+    def start_collection(
+        self, duration=10, early_stop=False, ci_limits=None, min_duration=0.0, settle_time=None
+    ):
+        """
+        Start collecting RTA samples for at most *duration* seconds.
+        early_stop ends on converged THD std, ci_limits ({metric: half
+        width}) on tight confidence intervals; neither before
+        *min_duration*.  Rows before *settle_time* (default: a quarter of
+        *duration*) are left out of the statistics.
+        """
+        self.done.clear()
         self.collecting = True
-        self.samples = []
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
+        self.start_cursor = self.end_cursor = self.buffer.count
+        self.sample_count = 0
         self.target_duration = duration
-        print(f"🎯 Starting RTA verification collection for {duration}s")
+        self.settle_time = (
+            duration * self.SETTLE_FRACTION if settle_time is None else settle_time
+        )
+        self.min_duration = min_duration
+        self.early_stop = early_stop
+        self.ci_limits = dict(ci_limits or {})
+        self.early_stopped = False
+        self.last_received = None
+        for stats in self.stats.values():
+            stats.reset()
+        self._last_thd_std = 0.0
+        self._thd_std_drift = math.inf
+        self.result = None
+        mode = (
+            " (adaptive)" if self.ci_limits else " (early stop on stable THD)" if early_stop else ""
+        )
+        print(f"🎯 Starting RTA verification collection for {duration}s{mode}")
 
-    def add_sample(self, rta_data):
-        """Add RTA sample if collecting"""
+    def add_sample(self, cursor):
+        """Account for the rta_buffer row at *cursor* if collecting"""
         if not self.collecting:
             return
 
+        row = self.buffer.row(cursor)
         # Skip samples with too few processed samples (settling)
-        if rta_data.get("samples_processed", 0) < 50000:
+        if row["samples_processed"] < self.MIN_SAMPLES_PROCESSED:
             return
 
-        elapsed = time.time() - self.start_time
+        elapsed = row["received"] - self.start_time
         if elapsed <= self.target_duration:
-            self.samples.append({"elapsed_time": elapsed, **rta_data})
+            self.sample_count += 1
+            self.end_cursor = cursor + 1
+            self.last_received = float(row["received"])
+            if elapsed >= self.settle_time:
+                self._update_stats(row)
+
+        # Auto-stop when duration reached AND we have enough samples
+        if elapsed >= self.target_duration and self.sample_count >= self.min_samples:
             print(
-                f"📊 RTA sample {len(self.samples)}: THD={rta_data.get('thd_percent', 0):.3f}%"
+                f"🏁 Auto-stopping RTA: {elapsed:.1f}s elapsed, {self.sample_count} samples"
             )
-        # Auto-stop when duration reached AND we have enough samples
-        if elapsed >= self.target_duration and len(self.samples) >= self.min_samples:
+            self.stop_collection()
+        elif elapsed >= self.min_duration and (
+            (self.ci_limits and self.confidence_reached())
+            or (self.early_stop and self.is_stable())
+        ):
             print(
-                f"🏁 Auto-stopping RTA: {elapsed:.1f}s elapsed, {len(self.samples)} samples"
+                f"🏁 RTA stable after {elapsed:.1f}s: THD {self.stats['thd'].mean:.4f}"
+                f" ±{self.confidence_interval('thd'):.4f}%, {self.sample_count} samples"
             )
+            self.early_stopped = True
             self.stop_collection()
 
+    def _update_stats(self, row):
+        for metric, stats in self.stats.items():
+            stats.add(float(row[metric]))
+        thd = self.stats["thd"]
+        std = thd.std
+        change = abs(std - self._last_thd_std)
+        self._last_thd_std = std
+        if thd.count == 2:
+            self._thd_std_drift = change
+        elif thd.count > 2:
+            self._thd_std_drift += thd.alpha * (change - self._thd_std_drift)
+
+    def is_stable(self):
+        """True once enough settled samples are in and the THD std has converged."""
+        thd = self.stats["thd"]
+        if thd.count < self.min_samples:
+            return False
+        return self._thd_std_drift <= self.STD_TOLERANCE * max(thd.std, self.STD_FLOOR)
+
+    def effective_samples(self, count):
+        """Independent samples *count* overlapping updates are worth."""
+        return count * (1.0 - self.RTA_OVERLAP)
+
+    def confidence_interval(self, metric):
+        """Half width of the 95% confidence interval on *metric*'s mean."""
+        stats = self.stats[metric]
+        n_eff = self.effective_samples(stats.count)
+        if n_eff < self.MIN_EFFECTIVE_SAMPLES:
+            return math.inf
+        return self.CI_Z * stats.std / math.sqrt(n_eff)
+
+    def confidence_reached(self):
+        """True once every ci_limits metric's interval is inside its limit."""
+        if self.stats["thd"].count < self.min_samples:
+            return False
+        return all(
+            self.confidence_interval(metric) <= limit
+            for metric, limit in self.ci_limits.items()
+        )
+
+    @property
+    def samples(self):
+        """Rows of the current/last run that count (a structured array)."""
+        rows, _ = self.buffer.since(self.start_cursor, self.end_cursor)
+        keep = (rows["samples_processed"] >= self.MIN_SAMPLES_PROCESSED) & (
+            rows["received"] - self.start_time <= self.target_duration
+        )
+        return rows if keep.all() else rows[keep]
+
     def stop_collection(self):
-        """Stop collecting and return results"""
+        """Stop collecting and return results (those of the last run if already stopped)"""
         if not self.collecting:
-            return None
+            return self.result
 
         self.collecting = False
-        print(f"🏁 RTA collection complete: {len(self.samples)} samples")
-        return self.analyze_samples()
+        print(f"🏁 RTA collection complete: {self.sample_count} samples")
+        try:
+            self.result = self.analyze_samples()
+        finally:
+            self.done.set()
+        return self.result
+
+    def wait_for_result(self, timeout):
+        """
+        Block until the run stops (max duration, early stop, or a
+        stop_collection() from elsewhere) or *timeout* seconds pass;
+        stops it in the latter case.  Returns the result (None if
+        insufficient).
+        """
+        if not self.done.wait(timeout):
+            print(f"⏱️ RTA verification timed out after {timeout:.1f}s")
+        return self.stop_collection()
 
     def analyze_samples(self):
-        """Analyze collected RTA samples"""
-        print(f"🔍 Analyzing {len(self.samples)} total samples")
+        """Summarise the run from its running statistics"""
+        thd = self.stats["thd"]
+        print(f"🔍 Analyzing {self.sample_count} total samples")
 
-        if len(self.samples) < self.min_samples:
+        if self.sample_count < self.min_samples:
             print(
-                f"⚠️ Insufficient RTA samples: {len(self.samples)} < {self.min_samples}"
+                f"⚠️ Insufficient RTA samples: {self.sample_count} < {self.min_samples}"
             )
             return None
 
-        # Skip first 25% of samples (settling time)
-        stable_start = len(self.samples) // 4
-        stable_samples = self.samples[stable_start:]
         print(
-            f"📈 Using {len(stable_samples)} stable samples (skipped first {stable_start})"
+            f"📈 Using {thd.count} stable samples "
+            f"(skipped first {self.sample_count - thd.count})"
         )
 
-        if not stable_samples:
+        if not thd.count:
             return None
 
-        # Extract metrics
-        thd_values = [s["thd_percent"] for s in stable_samples]
-        thd_plus_n_values = [s["thd_plus_n_percent"] for s in stable_samples]
-        snr_values = [s["snr_db"] for s in stable_samples]
-        enob_values = [s["enob"] for s in stable_samples]
-        imd_values = [s["imd_percent"] for s in stable_samples]
-
+        snr = self.stats["snr"]
         return {
-            "total_samples": len(self.samples),
-            "stable_samples": len(stable_samples),
-            "duration": self.samples[-1]["elapsed_time"] if self.samples else 0,
-            "thd_mean": np.mean(thd_values),
-            "thd_max": np.max(thd_values),
-            "thd_std": np.std(thd_values),
-            "thd_plus_n_mean": np.mean(thd_plus_n_values),
-            "snr_mean": np.mean(snr_values),
-            "snr_min": np.min(snr_values),
-            "enob_mean": np.mean(enob_values),
-            "imd_mean": np.mean(imd_values),
-            "stability_good": np.std(thd_values) < 0.05,  # THD variation < 0.05%
+            "total_samples": self.sample_count,
+            "stable_samples": thd.count,
+            "duration": self.last_received - self.start_time,
+            "thd_mean": thd.mean,
+            "thd_max": thd.max,
+            "thd_std": thd.std,
+            "thd_ewma": thd.ewma,
+            "thd_plus_n_mean": self.stats["thd_plus_n"].mean,
+            "snr_mean": snr.mean,
+            "snr_min": snr.min,
+            "enob_mean": self.stats["enob"].mean,
+            "imd_mean": self.stats["imd"].mean,
+            "stability_good": thd.std < 0.05,  # THD variation < 0.05%
             "signal_quality": (
-                "excellent"
-                if np.mean(snr_values) > 80
-                else "good" if np.mean(snr_values) > 60 else "poor"
+                "excellent" if snr.mean > 80 else "good" if snr.mean > 60 else "poor"
             ),
+            "early_stopped": self.early_stopped,
+            "thd_ci": self.confidence_interval("thd"),
+            "thd_plus_n_ci": self.confidence_interval("thd_plus_n"),
+            "snr_ci": self.confidence_interval("snr"),
         }
 
     def is_collecting(self):
@@ -204,223 +586,238 @@ class RTAVerificationCoordinator:
 
     def get_sample_count(self):
         """Get current sample count"""
-        return len(self.samples)
+        return self.sample_count
 
 
 # Global RTA coordinator
 rta_coordinator = RTAVerificationCoordinator()
 
-# Flask server code
-app = Flask(__name__)
+# settings.json only: seconds between RTA updates sent to the GUI
+rta_notify_throttle = Throttle(float(qs.get("rta_notify_interval_s", 0.25)))
 
+# REW callback server (Qrew_callback_server); handlers below run on its
+# dispatcher thread, in the order REW posted
+app = CallbackServer()
 
-@app.route("/rew-status", methods=["POST"])
-def handle_status():
-    msg = request.data.decode().strip('"')
-    status_log.appendleft(msg)
-    print(f"REW status update: {msg}")
 
-    # Send messages directly via Qt signal (thread-safe)
-    if "Capturing noise floor...100%" in msg:
-        message_bridge.emit_message("Noise floor captured")
+def callback_url(path):
+    """URL REW should post *path* to, on the port the callback server bound."""
+    return app.url + path
 
-    elif "100% Measurement complete" in msg:
-        if coordinator.channel and coordinator.position is not None:
-            print(
-                f"Triggering completion for {coordinator.channel}_pos{coordinator.position}"
-            )
-            coordinator.trigger_success()
-            message_bridge.emit_message(
-                f"Completed {coordinator.channel}_pos{coordinator.position}"
-            )
 
-    elif "Waiting for timing reference" in msg and "6%" in msg:
-        message_bridge.emit_message("Waiting for timing reference...")
-
-    elif "Remaining sweeps: 1" in msg and "8%" in msg:
-        message_bridge.emit_message("Sweep in progress...")
-
-    # Handle REW errors that might cause measurement to fail
-    elif "Measurement aborted" in msg or "Measurement cancelled" in msg:
-        # Handle measurement aborts
-        coordinator.trigger_abort("Measurement was aborted")
-        message_bridge.emit_error("Measurement aborted - will retry")
-
-    elif any(
-        error_phrase in msg.lower()
-        for error_phrase in [
-            "error",
-            "failed",
-            "timeout",
-            "cannot",
-            "unable",
-            "invalid",
-        ]
-    ):
-        if coordinator.channel and coordinator.position is not None:
-            coordinator.trigger_error(f"REW error: {msg}")
-            message_bridge.emit_error(f"REW error detected: {msg}")
-
-    # Handle processing completion messages
-    if "processName" in msg:
-        if "Cross corr align" in msg:
-            if "Completed" in msg:
-                if coordinator.channel and coordinator.position == "cross_corr":
-                    coordinator.trigger_success()
-                    message_bridge.emit_message(
-                        f"Cross correlation completed for {coordinator.channel}"
-                    )
-            elif "Failed" in msg or "Error" in msg:
-                if coordinator.channel and coordinator.position == "cross_corr":
-                    coordinator.trigger_error("Cross correlation failed")
-                    message_bridge.emit_error(
-                        f"Cross correlation failed for {coordinator.channel}"
-                    )
-
-        elif "Vector average" in msg:
-            if "Completed" in msg:
-                if coordinator.channel and coordinator.position == "vector_avg":
-                    coordinator.trigger_success()
-                    message_bridge.emit_message(
-                        f"Vector averaging completed for {coordinator.channel}"
-                    )
-            elif "Failed" in msg or "Error" in msg:
-                if coordinator.channel and coordinator.position == "vector_avg":
-                    coordinator.trigger_error("Vector averaging failed")
-                    message_bridge.emit_error(
-                        f"Vector averaging failed for {coordinator.channel}"
-                    )
-
-    # Play sweep file when needed
-    if "100%" in msg and "Capturing noise floor" in msg:
-        ch = coordinator.channel
-        pos = coordinator.position
-        if ch and pos is not None:
-            sweep_file = find_sweep_file(ch)
-            if sweep_file:
-                print(f"Playing sweep file for {ch}: {sweep_file}")
-                play_file(sweep_file)
-                message_bridge.emit_message(f"Playing sweep for {ch}")
-
-    return "", 200
-
-
-@app.route("/rew-result", methods=["POST"])
-def handle_result():
-    data = request.json
+# ------------------------------------------------------------------
+# /rew-status subscribers, in the order they run for each event
+# ------------------------------------------------------------------
+STATUS_LOG_KINDS = {
+    NoiseFloorProgress: "progress",
+    SweepProgress: "progress",
+    MeasurementComplete: "complete",
+    ProcessResult: "result",
+    Abort: "abort",
+    Error: "error",
+}
+
+
+def log_entry(kind, text, operation=None):
+    """Add *text* to status_log, tagged with the channel/position it concerns."""
+    op = coordinators.get(operation) if operation else coordinators.capture
+    if op is None:
+        status_log.append(kind, text)
+    else:
+        status_log.append(kind, text, op.channel, op.position)
+
+
+def log_status_event(event):
+    # An untagged process result is routed later; the capture is not its owner
+    kind = STATUS_LOG_KINDS.get(type(event), "status")
+    if kind == "result" and not event.operation:
+        status_log.append(kind, event.raw)
+    else:
+        log_entry(kind, event.raw, event.operation)
+    print(f"REW status update: {event.raw}")
+
+
+def invalidate_index_on_result(event):
+    # New captures add measurements; processing adds or rewrites them
+    if isinstance(event, MeasurementComplete) or event.completed:
+        measurement_index.invalidate()
+
+
+def play_sweep_after_noise_floor(event):
+    if event.percent != 100:
+        return
+    capture = coordinators.capture
+    if capture is not None:
+        ch = capture.channel
+        sweep_file = find_sweep_file(ch)
+        if sweep_file:
+            print(f"Playing sweep file for {ch}: {sweep_file}")
+            play_file(sweep_file)
+            message_bridge.emit_message(f"Playing sweep for {ch}")
+
+
+status_bus.subscribe(StatusEvent, log_status_event)
+status_bus.subscribe(MeasurementComplete, invalidate_index_on_result)
+status_bus.subscribe(ProcessResult, invalidate_index_on_result)
+status_bus.subscribe(StatusEvent, coordinators.on_status_event)
+status_bus.subscribe(StatusEvent, message_bridge.on_status_event)
+status_bus.subscribe(NoiseFloorProgress, play_sweep_after_noise_floor)
+
+
+@app.route("/rew-status")
+def handle_status(text):
+    status_bus.publish(parse_status(text))
+
+
+@app.route("/rew-status/<operation>")
+def handle_operation_status(text, operation):
+    """Results of a process-measurements job started with op.result_url."""
+    status_bus.publish(parse_status(text, operation))
+
+
+@app.route("/rew-result", body="json")
+def handle_result(data):
     print("Measurement result received:")
     print(data)
-    return jsonify({"status": "received"}), 200
 
 
 @app.route("/rew-status", methods=["GET"])
 def show_last_status():
-    log_html = "<br>".join(f'<div class="entry">{msg}</div>' for msg in status_log)
-    return f"""
-    <html>
-    <head>
-        <title>REW Live Status</title>
-        <style>
-            body {{ font-family: sans-serif; background: #f4f4f4; padding: 20px; }}
-            h2 {{ color: #333; }}
-            .log {{ background: #fff; padding: 15px; border-radius: 6px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); height: 70vh; overflow-y: scroll; }}
-            .entry {{ margin-bottom: 8px; font-size: 14px; }}
-            .controls {{ margin-bottom: 15px; }}
-            button {{ padding: 5px 10px; font-size: 14px; }}
-        </style>
-        <script>
-            let autoRefresh = true;
-
-            function toggleRefresh() {{
-                autoRefresh = !autoRefresh;
-                document.getElementById("toggleBtn").textContent = autoRefresh ? "Pause" : "Resume";
-            }}
-
-            function refreshLoop() {{
-                if (autoRefresh) {{
-                    window.location.reload();
-                }} else {{
-                    setTimeout(refreshLoop, 1000);
-                }}
-            }}
-
-            setTimeout(refreshLoop, 1000);
-        </script>
-    </head>
-    <body>
-        <h2>REW Status Log (Live)</h2>
-        <div class="controls">
-            <button id="toggleBtn" onclick="toggleRefresh()">Pause</button>
-        </div>
-        <div class="log">
-            {log_html}
-        </div>
-    </body>
-    </html>
-    """
+    """Live log page; it fetches only new entries from /status-log."""
+    return STATUS_PAGE
 
 
-@app.route("/rta-distortion", methods=["POST"])
-def handle_rta_distortion():
-    """Handle RTA distortion subscription updates"""
+@app.route("/status-log", methods=["GET"], query=True)
+def query_status_log(query):
+    """
+    Entries after ?since=<id> (default: the latest), oldest first, as JSON
+    {"entries": [...], "next": id, "oldest": id}.  ?wait=<s> long-polls
+    until there is something new; ?limit, ?kind and ?channel narrow it.
+    """
     try:
-        rta_data = request.json
-        if not rta_data:
-            return "", 400
-        # print(rta_data)
-        # Process RTA data
-        if isinstance(rta_data, list) and len(rta_data) > 0:
-            # Take first channel if stereo
-            distortion_data = rta_data[0]
-        else:
-            distortion_data = rta_data
-
-        # Extract key metrics
-        processed_data = {
-            "timestamp": distortion_data.get("nanotime", 0),
-            "samples_processed": distortion_data.get("totalSamplesProcessed", 0),
-            "fundamental_freq": distortion_data.get("fundamentalFrequency", 0),
-            "fundamental_dbfs": distortion_data.get("fundamentaldBFS", 0),
-            "thd_percent": distortion_data.get("thd", {}).get("value", 0),
-            "thd_plus_n_percent": distortion_data.get("thdPlusN", {}).get("value", 0),
-            "snr_db": distortion_data.get("snrdB", 0),
-            "enob": distortion_data.get("enob", 0),
-            "imd_percent": distortion_data.get("imd", {}).get("value", 0),
-            "gain_db": distortion_data.get("gaindB", 0),
-            "harmonics": distortion_data.get("harmonics", []),
-            "coherent_averaging": distortion_data.get("coherentAveraging", False),
-            "averages": distortion_data.get("averages", 0),
+        since = int(query["since"]) if "since" in query else None
+        limit = max(1, min(int(query.get("limit", 100)), status_log.capacity))
+        wait = float(query.get("wait", 0))
+    except ValueError:
+        return {"error": "since, limit and wait must be numbers"}, 400
+
+    if since is not None and since > status_log.count:
+        since = None  # cursor from before a restart
+    if since is not None and wait > 0:
+        status_log.wait(since, wait)
+    entries, next_id = status_log.since(
+        since, limit, kind=query.get("kind"), channel=query.get("channel")
+    )
+    return {"entries": entries, "next": next_id, "oldest": status_log.oldest}
+
+
+STATUS_PAGE = """
+<html>
+<head>
+    <title>REW Live Status</title>
+    <style>
+        body { font-family: sans-serif; background: #f4f4f4; padding: 20px; }
+        h2 { color: #333; }
+        .log { background: #fff; padding: 15px; border-radius: 6px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); height: 70vh; overflow-y: scroll; }
+        .entry { margin-bottom: 8px; font-size: 14px; }
+        .entry .meta { color: #888; margin-right: 8px; }
+        .warning { color: #b36b00; }
+        .error, .abort { color: #c00; }
+        .controls { margin-bottom: 15px; }
+        button { padding: 5px 10px; font-size: 14px; }
+    </style>
+    <script>
+        const MAX_ENTRIES = 500;
+        // A line after a quiet spell shows at once; while lines stream in
+        // they are batched into one request per MIN_POLL_MS
+        const MIN_POLL_MS = 1000;
+        let paused = false, resume = null, cursor = null;
+
+        function toggleRefresh() {
+            paused = !paused;
+            document.getElementById("toggleBtn").textContent = paused ? "Resume" : "Pause";
+            if (!paused && resume) { resume(); resume = null; }
         }
 
-        # Send to Qt interface
-        message_bridge.rta_distortion_received.emit(processed_data)
+        function show(entry) {
+            const div = document.createElement("div");
+            div.className = "entry " + entry.kind;
+            const meta = document.createElement("span");
+            meta.className = "meta";
+            const where = entry.channel ? " " + entry.channel + (entry.position !== null ? " " + entry.position : "") : "";
+            meta.textContent = new Date(entry.t * 1000).toLocaleTimeString() + where;
+            div.appendChild(meta);
+            div.appendChild(document.createTextNode(entry.text));
+            const log = document.getElementById("log");
+            log.insertBefore(div, log.firstChild);
+            while (log.childNodes.length > MAX_ENTRIES) log.removeChild(log.lastChild);
+        }
 
-        print(
-            f"RTA Update: THD={processed_data['thd_percent']:.3f}%, SNR={processed_data['snr_db']:.1f}dB, ENOB={processed_data['enob']:.1f}"
-        )
+        async function poll() {
+            while (true) {
+                if (paused) await new Promise(r => resume = r);
+                const started = Date.now();
+                try {
+                    const url = cursor === null ? "/status-log" : "/status-log?wait=25&since=" + cursor;
+                    const data = await (await fetch(url)).json();
+                    data.entries.forEach(show);
+                    cursor = data.next;
+                    const early = MIN_POLL_MS - (Date.now() - started);
+                    if (early > 0) await new Promise(r => setTimeout(r, early));
+                } catch (e) {
+                    await new Promise(r => setTimeout(r, 2000));  // server restarting
+                }
+            }
+        }
+
+        window.onload = poll;
+    </script>
+</head>
+<body>
+    <h2>REW Status Log (Live)</h2>
+    <div class="controls">
+        <button id="toggleBtn" onclick="toggleRefresh()">Pause</button>
+    </div>
+    <div class="log" id="log"></div>
+</body>
+</html>
+"""
+
+
+@app.route("/rta-distortion", body="json")
+def handle_rta_distortion(rta_data):
+    """Handle RTA distortion subscription updates"""
+    try:
+        # Take first channel if stereo
+        distortion_data = rta_data[0] if isinstance(rta_data, list) else rta_data
+
+        cursor = rta_buffer.append(distortion_data)
+        rta_coordinator.add_sample(cursor)
 
-        return "", 200
+        # The GUI and the console only need a few updates a second
+        if rta_notify_throttle.ready():
+            processed_data = rta_buffer.as_dict(cursor)
+            message_bridge.rta_distortion_received.emit(processed_data)
+            print(
+                f"RTA Update: THD={processed_data['thd_percent']:.3f}%, SNR={processed_data['snr_db']:.1f}dB, "
+                f"ENOB={processed_data['enob']:.1f} ({rta_buffer.count} updates)"
+            )
 
     except Exception as e:
         print(f"Error handling RTA distortion: {e}")
-        return "", 500
 
 
-@app.route("/rew-warnings", methods=["POST"])
-def handle_warnings():
+@app.route("/rew-warnings", body="json")
+def handle_warnings(warning_data):
     """Handle REW warning notifications"""
     try:
-        warning_data = request.json
-        if not warning_data:
-            return "", 400
-
         time_str = warning_data.get("time", "Unknown time")
         title = warning_data.get("title", "Unknown warning")
         message = warning_data.get("message", "No message")
 
         warning_msg = f"REW Warning: {title} - {message}"
         print(f"\nREW Warning [{time_str}]: {title} - {message}")
-        status_log.appendleft(f"WARNING: {title} - {message}")
+        log_entry("warning", f"{title} - {message}")
 
         # Send to Qt interface
         message_bridge.emit_warning(f"{warning_msg}")
@@ -439,32 +836,25 @@ def handle_warnings():
         ):
             # These might indicate more serious issues
             print(f"Potential measurement issue: {title}")
-            if coordinator.channel and coordinator.position is not None:
+            if coordinators.capture is not None:
                 # Don't automatically abort, but log for potential retry decision
                 message_bridge.emit_warning(f"Warning may affect measurement: {title}")
 
-        return "", 200
-
     except Exception as e:
         print(f"Error handling REW warning: {e}")
-        return "", 500
 
 
-@app.route("/rew-errors", methods=["POST"])
-def handle_errors():
+@app.route("/rew-errors", body="json")
+def handle_errors(error_data):
     """Handle REW error notifications"""
     try:
-        error_data = request.json
-        if not error_data:
-            return "", 400
-
         time_str = error_data.get("time", "Unknown time")
         title = error_data.get("title", "Unknown error")
         message = error_data.get("message", "No message")
 
         error_msg = f"REW Error: {title} - {message}"
         print(f"REW Error [{time_str}]: {title} - {message}")
-        status_log.appendleft(f"ERROR: {title} - {message}")
+        log_entry("error", f"{title} - {message}")
 
         # Send to Qt interface
         message_bridge.emit_error(error_msg)
@@ -475,8 +865,9 @@ def handle_errors():
             for keyword in ["measurement", "capture", "recording", "input", "output"]
         ):
             # These are measurement-related errors - trigger retry
-            if coordinator.channel and coordinator.position is not None:
-                coordinator.trigger_error(f"REW Error: {title} - {message}")
+            capture = coordinators.capture
+            if capture is not None:
+                capture.trigger_error(f"REW Error: {title} - {message}")
                 message_bridge.emit_error(
                     f"Measurement error detected, will retry: {title}"
                 )
@@ -491,12 +882,11 @@ def handle_errors():
                 "correlation",
             ]
         ):
-            # These are processing-related errors
-            if coordinator.channel and coordinator.position in [
-                "cross_corr",
-                "vector_avg",
-            ]:
-                coordinator.trigger_error(f"REW Processing Error: {title} - {message}")
+            # These are processing-related errors; REW runs queued jobs
+            # in order, so the oldest pending one is the failing one
+            job = coordinators.oldest_processing()
+            if job is not None:
+                job.trigger_error(f"REW Processing Error: {title} - {message}")
                 message_bridge.emit_error(
                     f"Processing error detected, will retry: {title}"
                 )
@@ -505,11 +895,8 @@ def handle_errors():
             # General errors - log but may not need retry
             print(f"General REW error: {title}")
 
-        return "", 200
-
     except Exception as e:
         print(f"Error handling REW error: {e}")
-        return "", 500
 
 
 @app.route("/test-endpoints", methods=["GET"])
@@ -531,7 +918,7 @@ def test_endpoints():
             <h3>Last Error:</h3>
             <pre>{last_error}</pre>
             <h3>Recent Status Log:</h3>
-            <div>{'<br>'.join(list(status_log)[:10])}</div>
+            <div>{'<br>'.join(status_log.latest(10))}</div>
         </body>
         </html>
         """
@@ -543,37 +930,41 @@ def test_endpoints():
 # public helper so other modules (MainWindow / signal handler) can
 # shut the server down cleanly
 # ------------------------------------------------------------------
-def stop_flask_server(timeout: float = 2.0):
+def stop_callback_server(timeout: float = 2.0):
     """
-    Ask gevent’s WSGIServer to shut down and wait (≤ *timeout* s).
+    Stop the callback server and let queued callbacks finish (≤ *timeout* s).
     Safe to call more than once.
     """
-    global http_server
-    srv = http_server
-    http_server = None  # prevent double-stop
-
-    if srv and not srv.closed:
+    if app.running:
         print("🛑  Stopping REW-API server …")
-        srv.stop(timeout)
+    app.stop(timeout)
+    status_log.wake_all()  # long-polls would hold the server's executor
+    status_log.flush(timeout)
 
 
-def run_flask_server():
-    import logging
+def wait_for_callback_server(timeout: float = 5.0) -> bool:
+    """
+    Block until the callback server is listening (≤ *timeout* s).
+    Returns True if it is up, False on timeout or bind failure.
+    """
+    if not app.ready.wait(timeout):
+        print(f"⚠️  REW-API server not ready after {timeout:.1f}s")
+        return False
+    return app.error is None
+
 
-    global http_server
-    # Debug/Development
-    # app.run(host="0.0.0.0", port=5555, debug=False, use_reloader=False, threaded=True)
+def run_callback_server():
+    """
+    Run the REW callback server in the calling thread until
+    stop_callback_server().
+    """
+    # settings.json only: append every callback to this file for
+    # benchmarks/callback_server_load.py to replay
+    app.record_path = qs.get("callback_record_file") or None
+    app.serve_forever()
 
-    # app.config['ENV'] = 'production'
-    # Production
-    app.config["ENV"] = "production"
-    app.config["DEBUG"] = False
 
-    http_server = WSGIServer(
-        ("0.0.0.0", 5555),
-        app,
-        log=logging.getLogger("http_server"),
-        error_log=logging.getLogger("http_server_error"),
-    )
-    print("✅  REW-API server listening on http://127.0.0.1:5555")
-    http_server.serve_forever()
+# Names from when the server ran on Flask, kept for existing callers
+run_flask_server = run_callback_server
+stop_flask_server = stop_callback_server
+wait_for_flask_server = wait_for_callback_server
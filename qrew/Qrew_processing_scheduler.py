@@ -0,0 +1,259 @@
+# Qrew_processing_scheduler.py
+"""Per-channel processing jobs scheduled as a small DAG
+
+Each channel gets up to three jobs::
+
+    cross_corr  ->  vector_avg  ->  rename
+
+and the scheduler hands out every job whose dependencies are settled, up
+to ``max_concurrent`` at a time, so channels are processed side by side
+instead of strictly one after another.  The processing modes of the main
+window are presets that pick which of the steps are planned.
+
+A failed cross correlation does not block the vector average (the
+average is still useful, just unaligned), but a rename needs the
+measurement its vector average created, so it is skipped if that failed.
+
+The scheduler has no Qt or REW code; ProcessingWorker starts the jobs and
+reports back with complete() / fail().
+"""
+import time
+
+# mode -> steps planned per channel, in dependency order
+PROCESSING_PRESETS = {
+    "cross_corr_only": ("cross_corr",),
+    "vector_avg_only": ("vector_avg", "rename"),
+    "full": ("cross_corr", "vector_avg", "rename"),
+}
+
+# step -> (step it waits for, whether that step has to have succeeded)
+STEP_DEPENDENCIES = {
+    "vector_avg": ("cross_corr", False),
+    "rename": ("vector_avg", True),
+}
+
+STEP_LABELS = {
+    "cross_corr": "Cross correlation",
+    "vector_avg": "Vector averaging",
+    "rename": "Rename",
+}
+
+DEFAULT_CONCURRENCY = 1  # raise once concurrent jobs are verified against REW
+DEFAULT_RETRIES = 2
+
+PENDING, RUNNING, DONE, FAILED, SKIPPED = (
+    "pending",
+    "running",
+    "done",
+    "failed",
+    "skipped",
+)
+
+
+class ProcessingJob:
+    """One step for one channel."""
+
+    def __init__(self, channel, step, measurement_ids, after=None, needs_success=False):
+        self.channel = channel
+        self.step = step
+        self.measurement_ids = list(measurement_ids)
+        self.after = after  # ProcessingJob this one waits for, or None
+        self.needs_success = needs_success
+        self.state = PENDING
+        self.attempts = 0
+        self.error = None
+        self.result = None  # e.g. the measurement id a vector average created
+        self.not_before = 0.0  # monotonic time a retry may start
+        self.started = None
+        self.elapsed = None
+
+    @property
+    def name(self):
+        return f"{self.channel}:{self.step}"
+
+    @property
+    def label(self):
+        return f"{STEP_LABELS.get(self.step, self.step)} for {self.channel}"
+
+    @property
+    def settled(self):
+        return self.state in (DONE, FAILED, SKIPPED)
+
+    def __repr__(self):
+        return f"ProcessingJob({self.name}, {self.state}, attempts={self.attempts})"
+
+
+class ProcessingScheduler:
+    """
+    Plan and hand out the processing jobs of one run.
+
+    *channel_measurements* maps channel -> measurement UUIDs (or the
+    {'uuid', 'position'} dicts of get_selected_channels_with_measurements_uuid),
+    *mode* is a PROCESSING_PRESETS key.
+    """
+
+    def __init__(
+        self,
+        channel_measurements,
+        mode="full",
+        max_concurrent=DEFAULT_CONCURRENCY,
+        max_retries=DEFAULT_RETRIES,
+    ):
+        if mode not in PROCESSING_PRESETS:
+            raise ValueError(f"Unknown processing mode: {mode}")
+        self.mode = mode
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_retries = max(0, int(max_retries))
+        self.jobs = []
+        self.empty_channels = []
+        self.started = time.monotonic()
+
+        steps = PROCESSING_PRESETS[mode]
+        for channel, measurements in channel_measurements.items():
+            measurement_ids = _sorted_ids(measurements)
+            if not measurement_ids:
+                self.empty_channels.append(channel)
+                continue
+            planned = {}
+            for step in steps:
+                dependency, needs_success = STEP_DEPENDENCIES.get(step, (None, False))
+                job = ProcessingJob(
+                    channel,
+                    step,
+                    measurement_ids,
+                    after=planned.get(dependency),
+                    needs_success=needs_success,
+                )
+                planned[step] = job
+                self.jobs.append(job)
+
+    # ------------------------------------------------------------------
+    # dispatch
+    # ------------------------------------------------------------------
+    @property
+    def running(self):
+        return [job for job in self.jobs if job.state == RUNNING]
+
+    @property
+    def finished(self):
+        return all(job.settled for job in self.jobs)
+
+    def _ready(self, job, now):
+        if job.state != PENDING or job.not_before > now:
+            return False
+        dependency = job.after
+        if dependency is None:
+            return True
+        if not dependency.settled:
+            return False
+        if job.needs_success and dependency.state != DONE:
+            job.state = SKIPPED
+            job.error = f"{dependency.label} did not succeed"
+            return False
+        return True
+
+    def next_jobs(self):
+        """
+        Jobs to start now, already marked running.  Oldest channel first;
+        at most max_concurrent REW jobs are in flight (renames are quick
+        and do not take a slot).
+        """
+        now = time.monotonic()
+        slots = self.max_concurrent - sum(
+            1 for job in self.running if job.step != "rename"
+        )
+        started = []
+        for job in self.jobs:
+            if not self._ready(job, now):
+                continue
+            if job.step != "rename":
+                if slots <= 0:
+                    continue
+                slots -= 1
+            job.state = RUNNING
+            job.attempts += 1
+            job.started = now
+            started.append(job)
+        return started
+
+    # ------------------------------------------------------------------
+    # results
+    # ------------------------------------------------------------------
+    def complete(self, job, result=None):
+        job.state = DONE
+        job.result = result
+        job.error = None
+        job.elapsed = time.monotonic() - job.started
+
+    def fail(self, job, error, retry_delay=0.0, retry=True):
+        """
+        Record a failed attempt.  Returns True if the job will be retried
+        (after *retry_delay* seconds), False if it has been given up -
+        straight away with ``retry=False``, for failures a retry can't fix.
+        """
+        job.error = error
+        job.elapsed = time.monotonic() - job.started
+        if retry and job.attempts <= self.max_retries:
+            job.state = PENDING
+            job.not_before = time.monotonic() + retry_delay
+            return True
+        job.state = FAILED
+        return False
+
+    def cancel(self):
+        """Mark everything not yet settled as skipped."""
+        for job in self.jobs:
+            if not job.settled:
+                job.state = SKIPPED
+                job.error = "Cancelled"
+
+    # ------------------------------------------------------------------
+    # progress
+    # ------------------------------------------------------------------
+    def counts(self):
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0, SKIPPED: 0}
+        for job in self.jobs:
+            counts[job.state] += 1
+        return counts
+
+    def progress(self):
+        """One-line progress, e.g. '5/14 jobs done, 2 running, 1 failed'."""
+        counts = self.counts()
+        parts = [f"{counts[DONE]}/{len(self.jobs)} jobs done"]
+        for state in (RUNNING, FAILED, SKIPPED):
+            if counts[state]:
+                parts.append(f"{counts[state]} {state}")
+        return ", ".join(parts)
+
+    def summary(self):
+        """Multi-line summary for the end of a run."""
+        lines = [
+            f"Processing summary ({self.mode}, {time.monotonic() - self.started:.1f}s): "
+            + self.progress()
+        ]
+        for job in self.jobs:
+            if job.state == DONE:
+                retries = f", {job.attempts - 1} retries" if job.attempts > 1 else ""
+                lines.append(f"  ✅ {job.label} ({job.elapsed or 0:.1f}s{retries})")
+            else:
+                lines.append(f"  ❌ {job.label}: {job.state} - {job.error}")
+        for channel in self.empty_channels:
+            lines.append(f"  ⏭️ {channel}: no measurements")
+        return "\n".join(lines)
+
+
+def _sorted_ids(measurements):
+    """UUIDs sorted by mic position (0 first) - position 0 is the reference."""
+    if not measurements:
+        return []
+    if isinstance(measurements[0], str):
+        return list(measurements)
+    try:
+        return [
+            m["uuid"] for m in sorted(measurements, key=lambda x: x.get("position", 0))
+        ]
+    except (TypeError, KeyError, AttributeError):
+        # backward-compatibility with the old tuple format: (uuid, position, ...)
+        return [
+            m[0] for m in sorted(measurements, key=lambda x: x[1] if len(x) > 1 else 0)
+        ]
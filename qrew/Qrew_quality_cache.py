@@ -0,0 +1,124 @@
+# Qrew_quality_cache.py
+"""Persistent cache of measurement quality scores
+
+REW measurements are immutable once captured, so the score computed from
+their IR and distortion data only changes when the scoring code does.
+Results are stored in a small SQLite file next to ``settings.json`` keyed
+by (measurement UUID, SCORING_VERSION) and evicted least-recently-used
+once the table grows past ``max_entries``.
+"""
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+
+try:
+    from .Qrew_measurement_metrics import SCORING_VERSION
+except ImportError:
+    from Qrew_measurement_metrics import SCORING_VERSION
+
+
+_FILE = pathlib.Path(__file__).with_name("quality_cache.sqlite3")
+MAX_ENTRIES = 5000
+
+
+def _to_builtin(value):
+    """json.dumps fallback for numpy scalars / arrays and tuples."""
+    if hasattr(value, "item") and getattr(value, "ndim", 0) == 0:
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class QualityCache:
+    """uuid -> {'score', 'rating', 'detail'} for the current SCORING_VERSION."""
+
+    def __init__(self, path=_FILE, version=SCORING_VERSION, max_entries=MAX_ENTRIES):
+        self.path = pathlib.Path(path)
+        self.version = str(version)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS quality ("
+                " uuid TEXT NOT NULL,"
+                " version TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (uuid, version))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS quality_last_used ON quality (last_used)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, uuid):
+        """Return the cached result for *uuid*, or None."""
+        if not uuid:
+            return None
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT payload FROM quality WHERE uuid = ? AND version = ?",
+                    (uuid, self.version),
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE quality SET last_used = ? WHERE uuid = ? AND version = ?",
+                    (time.time(), uuid, self.version),
+                )
+                conn.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Quality cache read failed for {uuid}: {e}")
+            return None
+
+    def put(self, uuid, score, rating, detail):
+        """Store a scored result and evict the oldest entries if needed."""
+        if not uuid:
+            return
+        try:
+            payload = json.dumps(
+                {"score": score, "rating": rating, "detail": detail},
+                default=_to_builtin,
+            )
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO quality (uuid, version, payload, last_used)"
+                    " VALUES (?, ?, ?, ?)",
+                    (uuid, self.version, payload, time.time()),
+                )
+                self._evict(conn)
+                conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Quality cache write failed for {uuid}: {e}")
+
+    def _evict(self, conn):
+        (count,) = conn.execute("SELECT COUNT(*) FROM quality").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM quality WHERE rowid IN ("
+                " SELECT rowid FROM quality ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global cache instance
+quality_cache = QualityCache()
@@ -0,0 +1,182 @@
+# Qrew_rew_client.py
+"""Pooled REW HTTP client
+
+Every REW API call goes through a single :class:`RewClient`.  It owns one
+``requests.Session`` with a keep-alive connection pool, applies a timeout
+chosen per endpoint, retries idempotent calls with exponential backoff and
+can hand back typed :class:`RewResult` objects instead of raising.
+"""
+import re
+from collections import namedtuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from .Qrew_common import REW_API_BASE_URL
+except ImportError:
+    from Qrew_common import REW_API_BASE_URL
+
+
+# (connect, read) seconds.  First matching pattern wins.
+DEFAULT_TIMEOUT = (3.05, 10.0)
+ENDPOINT_TIMEOUTS = [
+    # Large payloads – a 1M-sample IR is several MB of base64
+    (re.compile(r"^/measurements/[^/]+/impulse-response"), (3.05, 60.0)),
+    (re.compile(r"^/measurements/[^/]+/distortion"), (3.05, 60.0)),
+    (re.compile(r"^/measurements/[^/]+/frequency-response"), (3.05, 60.0)),
+    (re.compile(r"^/import/"), (3.05, 60.0)),
+    # "Save all" writes every measurement to disk before answering
+    (re.compile(r"^/measurements/command"), (3.05, 300.0)),
+    (re.compile(r"^/measurements/process-measurements"), (3.05, 30.0)),
+    (re.compile(r"^/measurements$"), (3.05, 30.0)),
+    # Configuration / command posts answer immediately
+    (re.compile(r"^/(measure|generator|rta|application)/"), (3.05, 5.0)),
+]
+
+# Only calls that are safe to repeat are retried.  ``/measure/command`` and
+# ``process-measurements`` are POSTs and are never replayed.
+RETRY_METHODS = frozenset({"GET", "PUT", "DELETE", "HEAD", "OPTIONS"})
+RETRY_STATUS = (502, 503, 504)
+
+
+RewResult = namedtuple("RewResult", ["ok", "status", "data", "error"])
+RewResult.__doc__ = """Outcome of a REW call that never raises.
+
+ok      -- True for a 2xx answer
+status  -- HTTP status code, or None if no answer was received
+data    -- decoded JSON body (None if empty or not JSON)
+error   -- human readable error text when ``ok`` is False
+"""
+
+
+def _make_retry(total, backoff):
+    """Build a urllib3 Retry, coping with the pre-1.26 keyword name."""
+    kwargs = dict(
+        total=total,
+        connect=total,
+        read=0,  # never re-send a request REW may already be acting on
+        status=total,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUS,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(allowed_methods=RETRY_METHODS, **kwargs)
+    except TypeError:
+        return Retry(method_whitelist=RETRY_METHODS, **kwargs)
+
+
+class RewClient:
+    """Shared entry point for all REW API traffic."""
+
+    def __init__(
+        self,
+        base_url=REW_API_BASE_URL,
+        pool_size=16,
+        retries=2,
+        backoff=0.2,
+        default_timeout=DEFAULT_TIMEOUT,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.default_timeout = default_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+
+        self.session = requests.Session()  # keep-alive is the default
+        self._mount(self.session)
+
+    def _mount(self, session):
+        adapter = HTTPAdapter(
+            pool_connections=1,  # we only talk to one host
+            pool_maxsize=self.pool_size,
+            max_retries=_make_retry(self.retries, self.backoff),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    # ------------------------------------------------------------------
+    # plumbing
+    # ------------------------------------------------------------------
+    def url(self, path):
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        if path and not path.startswith("/"):
+            path = "/" + path
+        return f"{self.base_url}{path}"
+
+    def timeout_for(self, path):
+        """Return the (connect, read) timeout for *path*."""
+        bare = path.split("?", 1)[0]
+        for pattern, timeout in ENDPOINT_TIMEOUTS:
+            if pattern.search(bare):
+                return timeout
+        return self.default_timeout
+
+    def request(self, method, path, timeout=None, raise_for_status=True, **kwargs):
+        """
+        Perform a request over the pooled session.
+
+        Raises ``requests.RequestException`` (including ``HTTPError`` for
+        non-2xx answers when *raise_for_status* is True) so existing
+        ``except requests.RequestException`` handlers keep working.
+        """
+        if timeout is None:
+            timeout = self.timeout_for(path)
+        response = self.session.request(
+            method, self.url(path), timeout=timeout, **kwargs
+        )
+        if raise_for_status:
+            response.raise_for_status()
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def get_json(self, path, **kwargs):
+        """GET *path* and return the decoded JSON body."""
+        return self.get(path, **kwargs).json()
+
+    # ------------------------------------------------------------------
+    # typed, non-raising variant
+    # ------------------------------------------------------------------
+    def call(self, method, path, **kwargs):
+        """Like :meth:`request` but always returns a :class:`RewResult`."""
+        try:
+            response = self.request(method, path, raise_for_status=False, **kwargs)
+        except requests.RequestException as e:
+            return RewResult(False, None, None, str(e))
+
+        data = None
+        if response.content:
+            try:
+                data = response.json()
+            except ValueError:
+                data = None
+
+        if response.ok:
+            return RewResult(True, response.status_code, data, None)
+        return RewResult(
+            False,
+            response.status_code,
+            data,
+            f"{response.status_code} {response.reason}: {response.text}",
+        )
+
+    def close(self):
+        self.session.close()
+
+
+# Global client instance
+rew_client = RewClient()
@@ -0,0 +1,290 @@
+# Qrew_rta_buffer.py
+"""Preallocated ring buffer for REW's RTA distortion callbacks
+
+With 64k FFTs at 93.75% overlap REW posts several distortion updates a
+second.  Instead of turning each one into dicts (and copying those again
+for analysis), /rta-distortion writes the numbers straight into one row
+of a structured NumPy array, and readers take zero-copy views by
+cursor::
+
+    index = rta_buffer.append(distortion)      # callback thread
+    rows, harmonics = rta_buffer.since(cursor)  # analysis
+
+A cursor is the running count of appended rows, so it stays valid across
+wrap-around as long as the reader is less than ``capacity`` rows behind.
+There is one writer (the callback dispatcher) and it never locks; a row
+is packed straight into the array's memory with one struct call.
+
+Converting the harmonics list is most of the cost of an update and
+nothing on the callback path reads it, so append() only keeps REW's list
+(which as_dict() passes on unchanged, as the GUI signal always carried
+it).  since() converts the rows it returns into the harmonics matrix the
+first time they are asked for; that is the only place readers write, and
+it holds a lock so concurrent readers do not convert the same rows.
+
+RunningStats keeps per-metric statistics up to date one value at a time,
+so a verification run can be summarised (or judged stable) without
+revisiting its rows.
+"""
+import math
+import struct
+import threading
+import time
+
+import numpy as np
+
+RTA_CAPACITY = 4096  # minutes of updates at REW's fastest rates
+MAX_HARMONICS = 9  # H2 .. H10
+
+RTA_DTYPE = np.dtype(
+    [
+        ("received", "f8"),  # time.monotonic() when the callback arrived
+        ("timestamp", "i8"),  # REW's nanotime
+        ("samples_processed", "i8"),
+        ("fundamental_freq", "f4"),
+        ("fundamental_dbfs", "f4"),
+        ("thd", "f4"),  # %
+        ("thd_plus_n", "f4"),  # %
+        ("snr", "f4"),  # dB
+        ("enob", "f4"),
+        ("imd", "f4"),  # %
+        ("gain", "f4"),  # dB
+        ("averages", "i4"),
+        ("coherent", "?"),
+    ]
+)
+
+# RTA_DTYPE's layout (native byte order, packed) for writing whole rows
+_ROW = struct.Struct("=dqqffffffffi?")
+assert _ROW.size == RTA_DTYPE.itemsize
+
+# Level of one harmonic entry, by preference
+_HARMONIC_LEVEL_KEYS = ("percent", "value", "dBFS", "dBr", "level")
+_NAN = float("nan")
+
+
+def _number(value, default=0.0):
+    """REW reports some metrics as {"value": x, "unit": ...}."""
+    if type(value) is float:
+        return value
+    if isinstance(value, dict):
+        value = value.get("value", default)
+        if type(value) is float:
+            return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _integer(value):
+    return value if type(value) is int else int(_number(value))
+
+
+def _harmonic(entry):
+    """(frequency, level) of one harmonics entry."""
+    if type(entry) is dict:
+        frequency, level = entry.get("frequency"), entry.get("percent")
+        if type(frequency) is float and type(level) is float:
+            return frequency, level
+    if not isinstance(entry, dict):
+        return _NAN, _number(entry, _NAN)
+    frequency = _number(entry.get("frequency"), _NAN)
+    for key in _HARMONIC_LEVEL_KEYS:
+        if key in entry:
+            return frequency, _number(entry[key], _NAN)
+    return frequency, _NAN
+
+
+def _row_values(distortion, received):
+    """One RTA_DTYPE row from any REW distortion dict (NumPy saturates)."""
+    get = distortion.get
+    return (
+        received,
+        _integer(get("nanotime")),
+        _integer(get("totalSamplesProcessed")),
+        _number(get("fundamentalFrequency")),
+        _number(get("fundamentaldBFS")),
+        _number(get("thd")),
+        _number(get("thdPlusN")),
+        _number(get("snrdB")),
+        _number(get("enob")),
+        _number(get("imd")),
+        _number(get("gaindB")),
+        _integer(get("averages")),
+        bool(get("coherentAveraging", False)),
+    )
+
+
+class RTARingBuffer:
+    def __init__(self, capacity=RTA_CAPACITY, max_harmonics=MAX_HARMONICS):
+        self.capacity = capacity
+        self.rows = np.zeros(capacity, dtype=RTA_DTYPE)
+        self._row_bytes = memoryview(self.rows.view(np.uint8))
+        # (frequency Hz, level) per harmonic, NaN where REW sent none
+        self.harmonics = np.full((capacity, max_harmonics, 2), np.nan, dtype=np.float32)
+        self._harmonics_flat = self.harmonics.reshape(capacity, max_harmonics * 2)
+        self._nan_pad = [_NAN] * (max_harmonics * 2)
+        # REW's harmonics list per slot, and the cursor whose list has
+        # been converted into the matrix row
+        self._harmonic_lists = [None] * capacity
+        self._harmonics_at = [-1] * capacity
+        self._harmonics_lock = threading.Lock()
+        self.count = 0  # rows appended so far (the write cursor)
+
+    def append(self, distortion):
+        """Write one REW distortion dict; returns its cursor."""
+        index = self.count
+        slot = index % self.capacity
+        get = distortion.get
+        received = time.monotonic()
+        # REW's numbers go straight into the row (struct checks their
+        # types); anything else - metrics as {"value": x} aside, missing
+        # or non-numeric fields - takes the converting path
+        thd, thd_plus_n, imd = get("thd"), get("thdPlusN"), get("imd")
+        try:
+            _ROW.pack_into(
+                self._row_bytes,
+                slot * _ROW.size,
+                received,
+                get("nanotime"),
+                get("totalSamplesProcessed"),
+                get("fundamentalFrequency"),
+                get("fundamentaldBFS"),
+                thd["value"] if type(thd) is dict else thd,
+                thd_plus_n["value"] if type(thd_plus_n) is dict else thd_plus_n,
+                get("snrdB"),
+                get("enob"),
+                imd["value"] if type(imd) is dict else imd,
+                get("gaindB"),
+                get("averages"),
+                get("coherentAveraging", False),
+            )
+        except (struct.error, KeyError, OverflowError):
+            self.rows[slot] = _row_values(distortion, received)
+
+        self._harmonic_lists[slot] = get("harmonics")
+
+        self.count = index + 1  # publish the row only once it is complete
+        return index
+
+    def _fill_harmonics(self, cursor):
+        """
+        Convert the harmonics list kept for *cursor* into its matrix row
+        (with _harmonics_lock held).
+        """
+        slot = cursor % self.capacity
+        if self._harmonics_at[slot] == cursor:
+            return
+        # Harmonics as one flat list of floats: a single conversion
+        flat = []
+        for entry in (self._harmonic_lists[slot] or [])[: self.harmonics.shape[1]]:
+            flat.extend(_harmonic(entry))
+        flat.extend(self._nan_pad[len(flat) :])
+        self._harmonics_flat[slot] = flat
+        self._harmonics_at[slot] = cursor
+
+    def row(self, cursor):
+        """The row written at *cursor* (a view)."""
+        return self.rows[cursor % self.capacity]
+
+    def since(self, cursor, end=None):
+        """
+        (rows, harmonics) appended from *cursor* up to *end* (default:
+        now).  Zero-copy views unless the range wraps around the end of
+        the buffer; rows older than ``capacity`` are gone and skipped.
+        """
+        end = self.count if end is None else min(end, self.count)
+        cursor = max(cursor, end - self.capacity, 0)
+        if cursor >= end:
+            return self.rows[:0], self.harmonics[:0]
+        with self._harmonics_lock:
+            for pending in range(cursor, end):
+                self._fill_harmonics(pending)
+        start, stop = cursor % self.capacity, end % self.capacity or self.capacity
+        if start < stop:
+            return self.rows[start:stop], self.harmonics[start:stop]
+        return (
+            np.concatenate((self.rows[start:], self.rows[:stop])),
+            np.concatenate((self.harmonics[start:], self.harmonics[:stop])),
+        )
+
+    def as_dict(self, cursor):
+        """The row at *cursor* in the dict layout the GUI signal carries."""
+        # One item() call converts the whole row to Python scalars
+        (_, timestamp, samples, freq, dbfs, thd, thd_plus_n, snr, enob, imd,
+         gain, averages, coherent) = self.rows.item(cursor % self.capacity)
+        return {
+            "timestamp": timestamp,
+            "samples_processed": samples,
+            "fundamental_freq": freq,
+            "fundamental_dbfs": dbfs,
+            "thd_percent": thd,
+            "thd_plus_n_percent": thd_plus_n,
+            "snr_db": snr,
+            "enob": enob,
+            "imd_percent": imd,
+            "gain_db": gain,
+            "harmonics": self._harmonic_lists[cursor % self.capacity] or [],  # as REW sent it
+            "coherent_averaging": coherent,
+            "averages": averages,
+        }
+
+
+class RunningStats:
+    """
+    Welford mean/variance, min/max and an EWMA of one metric, O(1) per
+    value.  ``variance`` is the population variance, like np.var.
+    """
+
+    __slots__ = ("alpha", "count", "mean", "_m2", "min", "max", "ewma")
+
+    def __init__(self, alpha=0.1):
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.ewma = _NAN
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.ewma = value if self.count == 1 else self.ewma + self.alpha * (value - self.ewma)
+
+    @property
+    def variance(self):
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class Throttle:
+    """True at most once per *interval* seconds."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._next = 0.0
+
+    def ready(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now < self._next:
+            return False
+        self._next = now + self.interval
+        return True
+
+
+# Global buffer for /rta-distortion
+rta_buffer = RTARingBuffer()
@@ -0,0 +1,98 @@
+# Qrew_startup.py
+"""Startup phase timing
+
+Enabled with ``--profile-startup`` on the command line or
+``QREW_PROFILE_STARTUP=1``.  main() marks each phase (imports,
+QApplication, REW check, main window, first paint, callback server) and
+a breakdown is printed once the main window has painted for the first
+time.  ``QREW_EXIT_AFTER_PAINT=1`` quits right after that report, which
+is what benchmarks/startup_time.py relies on.
+
+For a per-module import breakdown run ``python -X importtime -m qrew``
+or ``benchmarks/startup_time.py --imports``.
+"""
+import json
+import os
+import sys
+import time
+
+PROFILE_FLAG = "--profile-startup"
+REPORT_PREFIX = "QREW_STARTUP_PROFILE "
+
+
+def _env_flag(name):
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class StartupProfile:
+    """Records (phase, seconds since this module was imported)."""
+
+    def __init__(self):
+        self.enabled = PROFILE_FLAG in sys.argv or _env_flag("QREW_PROFILE_STARTUP")
+        self.exit_after_paint = _env_flag("QREW_EXIT_AFTER_PAINT")
+        if PROFILE_FLAG in sys.argv:
+            sys.argv.remove(PROFILE_FLAG)  # keep it away from QApplication
+        self.start = time.perf_counter()
+        self.start_wall = time.time()
+        self.phases = []
+        self.first_paint_wall = None
+        self._paint_filter = None
+
+    def mark(self, phase):
+        """Record the end of *phase*."""
+        self.phases.append((phase, time.perf_counter() - self.start))
+
+    def watch_first_paint(self, window):
+        """Mark 'first_paint' when *window* (or a child) first paints."""
+        if not (self.enabled or self.exit_after_paint):
+            return
+
+        from PyQt5.QtCore import QObject, QEvent, QTimer
+        from PyQt5.QtWidgets import QApplication
+
+        profile = self
+
+        class _FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if (
+                    event.type() == QEvent.Paint
+                    and hasattr(obj, "window")
+                    and obj.window() is window
+                ):
+                    QApplication.instance().removeEventFilter(self)
+                    profile._paint_filter = None
+                    profile.mark("first_paint")
+                    profile.first_paint_wall = time.time()
+                    profile.report()
+                    if profile.exit_after_paint:
+                        QTimer.singleShot(0, QApplication.quit)
+                return False
+
+        self._paint_filter = _FirstPaintFilter()
+        QApplication.instance().installEventFilter(self._paint_filter)
+
+    def report(self):
+        """Print the phase breakdown (only when profiling is enabled)."""
+        if not (self.enabled or self.exit_after_paint):
+            return
+        print("⏱️  Startup profile (seconds):")
+        previous = 0.0
+        for phase, elapsed in self.phases:
+            print(f"   {phase:<20} +{elapsed - previous:7.3f}  ={elapsed:7.3f}")
+            previous = elapsed
+        print(
+            REPORT_PREFIX
+            + json.dumps(
+                {
+                    "start_wall": self.start_wall,
+                    "first_paint_wall": self.first_paint_wall,
+                    "phases": dict(self.phases),
+                }
+            ),
+            flush=True,
+        )
+
+
+# Global profile instance; import this module first so its clock starts
+# before the heavy imports.
+startup_profile = StartupProfile()
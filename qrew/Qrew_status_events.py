@@ -0,0 +1,298 @@
+# Qrew_status_events.py
+"""Typed REW status events and a small publish/subscribe bus
+
+REW posts every status line of a measurement (dozens per sweep) and every
+processing result to ``/rew-status``.  :func:`parse_status` classifies a
+message by its leading token (a percentage or a keyword) and returns one
+of the event classes below; :data:`status_bus` then hands it to whoever
+subscribed to that event type (coordinator, MessageBridge, logging, ...).
+
+Error detection only looks at how a message starts or at "<operation>
+failed" phrases, so words like "error" inside a measurement title are no
+longer mistaken for a REW failure.
+"""
+import json
+import re
+import threading
+
+
+# ----------------------------------------------------------------------
+# events
+# ----------------------------------------------------------------------
+class StatusEvent:
+    """
+    Any message posted to /rew-status.  ``raw`` is the decoded text;
+    ``operation`` is the id of the operation it belongs to, taken from the
+    callback URL or filled in when the coordinator registry routes it.
+    """
+
+    __slots__ = ("raw", "operation")
+
+    def __init__(self, raw, operation=None):
+        self.raw = raw
+        self.operation = operation
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.raw!r})"
+
+
+class NoiseFloorProgress(StatusEvent):
+    __slots__ = ("percent",)
+
+    def __init__(self, raw, percent, operation=None):
+        self.raw = raw  # not super().__init__: progress lines are the hot path
+        self.operation = operation
+        self.percent = percent
+
+
+class SweepProgress(StatusEvent):
+    """Progress of the sweep itself; ``text`` is the message without the %."""
+
+    __slots__ = ("percent", "text")
+
+    def __init__(self, raw, percent, text, operation=None):
+        self.raw = raw  # not super().__init__: progress lines are the hot path
+        self.operation = operation
+        self.percent = percent
+        self.text = text
+
+
+class MeasurementComplete(StatusEvent):
+    __slots__ = ()
+
+
+class ProcessResult(StatusEvent):
+    """Result of /measurements/process-measurements (parsed JSON body)."""
+
+    __slots__ = ("process_name", "message", "results", "data")
+
+    def __init__(self, raw, data):
+        super().__init__(raw)
+        self.data = data
+        self.process_name = data.get("processName", "") or ""
+        self.message = data.get("message", "") or ""
+        self.results = data.get("results") or {}
+
+    @property
+    def measurement_uuids(self):
+        """Input UUIDs if REW echoed them back, else an empty list."""
+        return list(self.data.get("measurementUUIDs") or [])
+
+    @property
+    def completed(self):
+        return self.message.strip().lower().startswith("complete")
+
+    @property
+    def failed(self):
+        return not self.completed and bool(_PROCESS_FAILED_RE.search(self.message))
+
+
+class Abort(StatusEvent):
+    __slots__ = ()
+
+
+class Error(StatusEvent):
+    __slots__ = ()
+
+
+class StatusMessage(StatusEvent):
+    """Anything else (informational)."""
+
+    __slots__ = ()
+
+
+# ----------------------------------------------------------------------
+# grammar
+# ----------------------------------------------------------------------
+_ERROR_WORDS = r"error|fail(?:ed|ure)?|time(?:d)?\s*out|cannot|can't|unable|invalid"
+_OPERATIONS = r"measurement|capture|sweep|playback|recording|process(?:ing)?|input|output"
+
+# Most lines are "<n>% <text>" progress; they are recognised by their
+# leading digit, and one scan for hint words decides whether any of the
+# other patterns can match at all.  Priority, highest first: measurement
+# complete, noise floor, abort, error, progress.
+_LEADING_PCT_RE = re.compile(r"(\d{1,3})\s*%")
+_NOISE_FLOOR_RE = re.compile(r"Capturing noise floor\W*(\d{1,3})\s*%", re.IGNORECASE)
+_ABORT_RE = re.compile(r"Measurement (?:aborted|cancell?ed)", re.IGNORECASE)
+_ERROR_RE = re.compile(
+    r"^\W*(?:" + _ERROR_WORDS + r")\b|\b(?:" + _OPERATIONS + r")\s+(?:" + _ERROR_WORDS + r")\b",
+    re.IGNORECASE,
+)
+_PROCESS_FAILED_RE = re.compile(r"fail|error|abort|cancel", re.IGNORECASE)
+
+
+def decode_status_body(body):
+    """REW posts status lines as JSON strings; unquote them."""
+    body = body.strip()
+    if body.startswith('"'):
+        if body.endswith('"') and "\\" not in body and len(body) > 1:
+            return body[1:-1]  # nothing escaped: no need for a JSON parse
+        try:
+            return json.loads(body)
+        except ValueError:
+            return body.strip('"')
+    return body
+
+
+# Every word the noise floor, abort and error patterns need after a
+# leading percentage ("can" covers cannot/can't)
+_HINT_WORDS = ("noise floor", "measurement ", "error", "fail", "time", "can", "unable", "invalid")
+
+_NOISE_FLOOR_PREFIX = '"Capturing noise floor '
+
+# REW posts the same '"<n>% <text>"' bodies sweep after sweep, so a plain
+# progress line is parsed once: body -> (raw, percent, text).  Bounded,
+# since a sweep only has ~100 distinct lines.
+_progress_lines = {}
+_PROGRESS_LINES_MAX = 512
+
+
+def _progress_line(body):
+    """(raw, percent, text) if *body* is a plain progress line, else None."""
+    pct = body.find("%", 2, 5)
+    if pct < 0 or not body[1:pct].isdecimal() or body[-1:] != '"' or "\\" in body:
+        return None
+    rest = body[pct + 1 : -1]
+    lower = rest.lower()
+    if any(word in lower for word in _HINT_WORDS):
+        return None
+    line = (body[1:-1], int(body[1:pct]), rest.strip(" .-:"))
+    if len(_progress_lines) < _PROGRESS_LINES_MAX:
+        _progress_lines[body] = line
+    return line
+
+
+def parse_status(body, operation=None):
+    """Turn one /rew-status POST body into a StatusEvent subclass."""
+    # Fast paths for the bulk of a sweep, '"<n>% <text>"' progress and
+    # '"Capturing noise floor <n>%"' lines, before any regex or classification
+    if type(body) is str:
+        line = _progress_lines.get(body)
+        if line is None and body[1:2].isdecimal() and body[:1] == '"':
+            line = _progress_line(body)
+        if line is not None:
+            raw, percent, text = line
+            return SweepProgress(raw, percent, text, operation)
+        if body.startswith(_NOISE_FLOOR_PREFIX) and body[-2:] == '%"':
+            digits = body[len(_NOISE_FLOOR_PREFIX) : -2]
+            if 0 < len(digits) <= 3 and digits.isdecimal():
+                return NoiseFloorProgress(body[1:-1], int(digits), operation)
+
+    event = _classify(body)
+    event.operation = operation
+    return event
+
+
+def _classify(body):
+    msg = decode_status_body(body) if isinstance(body, str) else body
+
+    if isinstance(msg, dict):
+        return ProcessResult(json.dumps(msg), msg)
+    if not isinstance(msg, str):
+        return StatusMessage(str(msg))
+
+    if msg.startswith("{"):
+        try:
+            data = json.loads(msg)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return ProcessResult(msg, data)
+
+    return _classify_line(msg)
+
+
+def _classify_line(msg):
+    head = msg.lstrip()
+    leading = _LEADING_PCT_RE.match(head) if head[:1].isdigit() else None
+    if leading is not None:
+        rest = head[leading.end() :]
+        if leading.group(1) == "100" and rest.lstrip()[:20].lower() == "measurement complete":
+            return MeasurementComplete(msg)
+
+    # Plain ``in`` tests are several times cheaper than any regex here;
+    # together they cover every word _NOISE_FLOOR_RE, _ABORT_RE and
+    # _ERROR_RE can match
+    lower = msg.lower()
+    if (
+        "noise floor" in lower
+        or "measurement " in lower
+        or "error" in lower
+        or "fail" in lower
+        or "time" in lower
+        or "cannot" in lower
+        or "can't" in lower
+        or "unable" in lower
+        or "invalid" in lower
+    ):
+        match = _NOISE_FLOOR_RE.search(msg)
+        if match:
+            return NoiseFloorProgress(msg, int(match.group(1)))
+        if _ABORT_RE.search(msg):
+            return Abort(msg)
+        if _ERROR_RE.search(msg):
+            return Error(msg)
+
+    if leading is not None:
+        return SweepProgress(msg, int(leading.group(1)), rest.strip(" .-:"))
+    if "%" in msg:
+        match = _LEADING_PCT_RE.search(msg)
+        if match:
+            text = (msg[: match.start()] + msg[match.end() :]).strip(" .-:")
+            return SweepProgress(msg, int(match.group(1)), text)
+    return StatusMessage(msg)
+
+
+# ----------------------------------------------------------------------
+# bus
+# ----------------------------------------------------------------------
+class EventBus:
+    """
+    Synchronous pub/sub keyed by event class.
+
+    A handler subscribed to a class also receives its subclasses
+    (subscribe to StatusEvent for everything).  Handlers run in the
+    publishing thread, in subscription order; one failing handler does
+    not stop the others.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = []  # (event class, handler) in subscription order
+        self._dispatch = {}  # concrete class -> tuple of handlers (cache)
+
+    def subscribe(self, event_type, handler):
+        with self._lock:
+            self._subscriptions.append((event_type, handler))
+            self._dispatch = {}
+        return handler
+
+    def unsubscribe(self, event_type, handler):
+        with self._lock:
+            if (event_type, handler) in self._subscriptions:
+                self._subscriptions.remove((event_type, handler))
+            self._dispatch = {}
+
+    def _handlers_for(self, cls):
+        handlers = self._dispatch.get(cls)
+        if handlers is None:
+            with self._lock:
+                handlers = tuple(
+                    handler
+                    for event_type, handler in self._subscriptions
+                    if issubclass(cls, event_type)
+                )
+                self._dispatch[cls] = handlers
+        return handlers
+
+    def publish(self, event):
+        for handler in self._handlers_for(type(event)):
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"Status handler {getattr(handler, '__name__', handler)} failed: {e}")
+        return event
+
+
+# Global bus for /rew-status events
+status_bus = EventBus()
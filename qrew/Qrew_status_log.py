@@ -0,0 +1,155 @@
+# Qrew_status_log.py
+"""Bounded, structured log of REW status lines, warnings and errors
+
+Every entry is a (timestamp, kind, channel, position, text) tuple in a
+preallocated ring; its id is the running count of entries, so a client
+that remembers the last id it saw asks only for what is new::
+
+    status_log.append("warning", "Low signal-to-noise ratio", "FL", 3)
+    entries, next_id = status_log.since(last_id)
+    status_log.wait(next_id, timeout=25)   # long-poll: block until more
+
+Optionally every entry is also appended to a JSON-lines segment on disk
+(rotated to ``<file>.1`` past ``segment_max_bytes``), so a session's log
+outlives the ring.  A writer thread does the file I/O, so append() never
+waits on the disk while holding the lock readers need.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+STATUS_LOG_CAPACITY = 1000
+SEGMENT_MAX_BYTES = 5 * 1024 * 1024
+MAX_WAIT = 25.0  # seconds a long-poll may block
+
+
+class StatusLog:
+    def __init__(self, capacity=STATUS_LOG_CAPACITY, segment_path=None,
+                 segment_max_bytes=SEGMENT_MAX_BYTES):
+        self.capacity = capacity
+        self.segment_path = segment_path
+        self.segment_max_bytes = segment_max_bytes
+        self._entries = [None] * capacity
+        self._cond = threading.Condition(threading.Lock())
+        self._waiters = 0  # wait() calls blocked on _cond
+        self._segment = None
+        self._pending = None  # queue of (id, entry) for the writer thread
+        self._wakeups = 0  # bumped by wake_all() to release long-polls
+        self.count = 0  # entries appended so far (the next id)
+
+    @property
+    def oldest(self):
+        """Id of the oldest entry still in the ring."""
+        return max(0, self.count - self.capacity)
+
+    def append(self, kind, text, channel=None, position=None):
+        """Add one entry; returns its id."""
+        entry = (time.time(), kind, channel, position, str(text))
+        with self._cond:
+            index = self.count
+            self._entries[index % self.capacity] = entry
+            self.count = index + 1
+            if self.segment_path:
+                # Queued under the lock so the file keeps id order
+                if self._pending is None:
+                    self._start_writer()
+                self._pending.put((index, entry))
+            if self._waiters:
+                self._cond.notify_all()
+        return index
+
+    def since(self, cursor=None, limit=100, kind=None, channel=None):
+        """
+        (entries, next_id): up to *limit* entries from id *cursor* on,
+        oldest first, as dicts.  Without a cursor, the latest *limit*.
+        *kind* / *channel* filter the entries but not the cursor, so
+        next_id always moves past everything examined.
+        """
+        with self._cond:
+            end = self.count
+            if cursor is None:
+                cursor = end - limit
+            cursor = max(cursor, self.oldest)
+            entries = []
+            index = cursor
+            while index < end and len(entries) < limit:
+                t, k, ch, pos, text = self._entries[index % self.capacity]
+                if (kind is None or k == kind) and (channel is None or ch == channel):
+                    entries.append(
+                        {"id": index, "t": t, "kind": k, "channel": ch,
+                         "position": pos, "text": text}
+                    )
+                index += 1
+        return entries, index
+
+    def latest(self, n=10):
+        """Texts of the last *n* entries, newest first."""
+        with self._cond:
+            return [
+                self._entries[i % self.capacity][4]
+                for i in range(self.count - 1, max(self.oldest, self.count - n) - 1, -1)
+            ]
+
+    def wait(self, cursor, timeout=MAX_WAIT):
+        """Block until an entry with id >= *cursor* exists (True) or *timeout* / wake_all()."""
+        timeout = min(max(timeout, 0.0), MAX_WAIT)
+        with self._cond:
+            wakeups = self._wakeups
+            self._waiters += 1
+            try:
+                return self._cond.wait_for(
+                    lambda: self.count > cursor or self._wakeups != wakeups, timeout
+                ) and self.count > cursor
+            finally:
+                self._waiters -= 1
+
+    def wake_all(self):
+        """Release every pending wait() (server shutting down)."""
+        with self._cond:
+            self._wakeups += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Block until the segment writer has caught up (True) or *timeout*."""
+        pending = self._pending
+        if pending is None:
+            return True
+        done = threading.Event()
+        pending.put(done)
+        return done.wait(timeout)
+
+    def _start_writer(self):
+        self._pending = queue.SimpleQueue()
+        threading.Thread(
+            target=self._write_segment, args=(self._pending,), name="status-log-writer", daemon=True
+        ).start()
+
+    def _write_segment(self, pending):
+        """Writer thread: append queued entries, flushing whenever it catches up."""
+        while True:
+            item = pending.get()
+            if isinstance(item, threading.Event):
+                item.set()  # flush() marker: everything before it is written
+                continue
+            if self.segment_path is None:
+                continue  # disabled after an error; drain the queue
+            index, (t, kind, channel, position, text) = item
+            try:
+                if self._segment is None:
+                    self._segment = open(self.segment_path, "a", encoding="utf-8")
+                self._segment.write(
+                    json.dumps({"id": index, "t": t, "kind": kind, "channel": channel,
+                                "position": position, "text": text}) + "\n"
+                )
+                if pending.empty():
+                    self._segment.flush()
+                if self._segment.tell() > self.segment_max_bytes:
+                    self._segment.close()
+                    self._segment = None
+                    os.replace(self.segment_path, self.segment_path + ".1")
+            except OSError as e:
+                print(f"⚠️ Status log file disabled: {e}")
+                self.segment_path = None
+                self._segment = None
@@ -0,0 +1,178 @@
+# Qrew_vector_average.py
+"""Local vector average
+
+A local alternative to REW's "Vector average" process, the production
+version of fetch_align_upload_frequency_responses_rew_accurate() in
+misc_assets/rew_cross_align_FR_v2.py.  For one channel it downloads the
+frequency responses of every mic position concurrently, decodes them
+into one (positions x bins) complex64 matrix, removes the delays found by
+the local alignment with a single broadcast phase correction and uploads
+the complex mean as ``<channel>_VectorAvg``.
+
+The per-position aligned responses are only uploaded when asked for
+(``upload_aligned``); by default REW receives the average alone.
+"""
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from .Qrew_api_helper import get_frequency_response, import_frequency_response
+    from .Qrew_measurement_index import measurement_index
+except ImportError:
+    from Qrew_api_helper import get_frequency_response, import_frequency_response
+    from Qrew_measurement_index import measurement_index
+
+
+FR_FETCH_WORKERS = 4
+AVERAGE_TITLE = "{channel}_VectorAvg"
+ALIGNED_FR_TITLE = "{channel}_REW_aligned_FR_pos{position}"
+
+
+@lru_cache(maxsize=32)
+def rew_frequencies(start_freq, ppo, num_points):
+    """REW's log-spaced grid start_freq * 2 ** (i / ppo) (read-only, cached)."""
+    frequencies = start_freq * np.exp2(np.arange(num_points) / ppo)
+    frequencies.setflags(write=False)
+    return frequencies
+
+
+def _decode_floats(data):
+    """REW base64 big-endian float32 -> native float32 array."""
+    return np.frombuffer(base64.b64decode(data), dtype=">f4").astype(np.float32)
+
+
+def fetch_frequency_responses(measurement_ids, max_workers=FR_FETCH_WORKERS):
+    """Download the FRs of *measurement_ids* concurrently (None where one failed)."""
+    measurement_ids = list(measurement_ids)
+    if not measurement_ids:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(measurement_ids))) as pool:
+        return list(pool.map(get_frequency_response, measurement_ids))
+
+
+def stack_frequency_responses(fr_jsons, shifts=None):
+    """
+    Decode REW /frequency-response JSONs into one complex64 matrix.
+
+    Returns (matrix, start_freq, ppo): one row per measurement, cut to the
+    shortest response.  *shifts* (seconds, positive = later than the
+    reference) are removed as phase corrections in the same pass.
+    Raises ValueError if the responses are not on the same grid.
+    """
+    grids = {(float(fr["startFreq"]), float(fr["ppo"])) for fr in fr_jsons}
+    if len(grids) > 1:
+        raise ValueError(f"Frequency responses are on different grids: {sorted(grids)}")
+    start_freq, ppo = grids.pop()
+
+    magnitudes = [_decode_floats(fr["magnitude"]) for fr in fr_jsons]
+    phases = [_decode_floats(fr["phase"]) for fr in fr_jsons]
+    num_points = min(min(len(m) for m in magnitudes), min(len(p) for p in phases))
+
+    rows = len(fr_jsons)
+    gain = np.empty((rows, num_points), dtype=np.float32)
+    phase = np.empty((rows, num_points), dtype=np.float32)
+    for row in range(rows):
+        gain[row] = magnitudes[row][:num_points]
+        phase[row] = phases[row][:num_points]
+
+    # dB -> linear, degrees -> radians
+    gain *= np.float32(np.log(10.0) / 20.0)
+    np.exp(gain, out=gain)
+    phase *= np.float32(np.pi / 180.0)
+
+    if shifts is not None and any(shifts):
+        # A delay t shows up as -2 pi f t; add it back to move the response earlier
+        frequencies = rew_frequencies(start_freq, ppo, num_points)
+        correction = np.multiply.outer(np.asarray(shifts, dtype=np.float64), frequencies)
+        # wrap in float64 so the float32 phase keeps its precision
+        np.remainder(correction, 1.0, out=correction)
+        correction *= 2.0 * np.pi
+        phase += correction.astype(np.float32)
+
+    matrix = np.empty((rows, num_points), dtype=np.complex64)
+    np.cos(phase, out=matrix.real)
+    np.sin(phase, out=matrix.imag)
+    matrix *= gain
+    return matrix, start_freq, ppo
+
+
+def to_magnitude_phase(response):
+    """Complex response -> (magnitude dB, phase degrees) as float32."""
+    magnitude_db = (20.0 * np.log10(np.abs(response) + 1e-10)).astype(np.float32)
+    phase_deg = np.degrees(np.angle(response)).astype(np.float32)
+    return magnitude_db, phase_deg
+
+
+def upload_response(name, response, start_freq, ppo, status_callback=None):
+    """Import one complex response into REW; returns (uuid, error_msg)."""
+    handle = measurement_index.begin_capture(name)
+    magnitude_db, phase_deg = to_magnitude_phase(response)
+    success, error_msg = import_frequency_response(
+        name, magnitude_db, phase_deg, start_freq, ppo, status_callback
+    )
+    if not success:
+        return None, error_msg
+    uuid = handle.resolve()
+    if uuid is None:
+        return None, f"Could not find '{name}' in REW after uploading it"
+    return uuid, None
+
+
+def average_channel(
+    channel, measurement_ids, shifts=None, positions=None, upload_aligned=False, status_callback=None
+):
+    """
+    Vector-average the measurements of one channel locally and upload it.
+
+    *measurement_ids* are UUIDs sorted by mic position; *shifts* are the
+    matching delays from the local alignment (None if the measurements
+    are already aligned).  With *upload_aligned* every aligned response is
+    uploaded as well.  Returns (average_uuid, error_msg).
+    """
+    measurement_ids = list(measurement_ids)
+    if not measurement_ids:
+        return None, f"No measurements to average for {channel}"
+    if shifts is not None and len(shifts) != len(measurement_ids):
+        return None, f"Got {len(shifts)} shifts for {len(measurement_ids)} measurements of {channel}"
+
+    if status_callback:
+        status_callback(f"Downloading {len(measurement_ids)} frequency responses for {channel}...")
+
+    fr_jsons = fetch_frequency_responses(measurement_ids)
+    for uuid, fr_json in zip(measurement_ids, fr_jsons):
+        if not fr_json:
+            return None, f"No frequency response for {uuid}"
+
+    try:
+        matrix, start_freq, ppo = stack_frequency_responses(fr_jsons, shifts)
+    except (KeyError, ValueError) as e:
+        return None, f"Could not decode the frequency responses of {channel}: {e}"
+
+    print(f"🧮 Local vector average for {channel} ({matrix.shape[0]} x {matrix.shape[1]})...")
+    average = matrix.mean(axis=0, dtype=np.complex128)
+
+    name = AVERAGE_TITLE.format(channel=channel)
+    average_uuid, error_msg = upload_response(name, average, start_freq, ppo, status_callback)
+    if average_uuid is None:
+        return None, error_msg
+
+    if upload_aligned:
+        if positions is None:
+            positions = [
+                (measurement_index.get(uuid) or {}).get("position") for uuid in measurement_ids
+            ]
+        for row, position in enumerate(positions):
+            if position is None:
+                position = row
+            aligned_name = ALIGNED_FR_TITLE.format(channel=channel, position=position)
+            success, error_msg = import_frequency_response(
+                aligned_name, *to_magnitude_phase(matrix[row]), start_freq, ppo
+            )
+            if not success:
+                # The average is in REW already; a missing copy is not fatal
+                print(f"⚠️ {error_msg}")
+
+    return average_uuid, None
@@ -10,6 +10,7 @@ import shutil
 import re
 import signal
 import ctypes
+import struct
 from pathlib import Path
 from typing import Callable, Optional
 
@@ -175,66 +176,86 @@ def setup_vlc_environment():
 # Actual VLC loading
 # ----------------------------------------------------------------------
 
-# First run diagnostics
-debug_vlc_paths()
+# Loading python-vlc means probing the filesystem for libvlc (and, on
+# Windows, test-loading the DLL), so it is deferred until the first
+# playback or an explicit load_vlc() call instead of running at import.
+vlc = None
+_vlc_probed = False
+_vlc_lock = threading.Lock()
 
-# PyInstaller frozen environment handling
-if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
-    print("Running from PyInstaller bundle - using bundled VLC libraries")
-    # Environment variables should be set by our runtime hook
-    if os.environ.get("VLC_PLUGIN_PATH"):
-        print(f"VLC_PLUGIN_PATH: {os.environ.get('VLC_PLUGIN_PATH')}")
 
-# Set up environment BEFORE importing vlc
-vlc = None
-if setup_vlc_environment():
-    try:
-        print("Attempting to import vlc module...")
-        import vlc
+def load_vlc():
+    """
+    Set up the VLC environment and import python-vlc, once.
+    Thread-safe; returns the vlc module or None if it is unavailable.
+    """
+    global vlc, _vlc_probed
+    with _vlc_lock:
+        if _vlc_probed:
+            return vlc
+        _vlc_probed = True
+
+        # First run diagnostics
+        debug_vlc_paths()
+
+        # PyInstaller frozen environment handling
+        if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+            print("Running from PyInstaller bundle - using bundled VLC libraries")
+            # Environment variables should be set by our runtime hook
+            if os.environ.get("VLC_PLUGIN_PATH"):
+                print(f"VLC_PLUGIN_PATH: {os.environ.get('VLC_PLUGIN_PATH')}")
+
+        # Set up environment BEFORE importing vlc
+        if setup_vlc_environment():
+            try:
+                print("Attempting to import vlc module...")
+                import vlc
 
-        print(
-            f"✅ Successfully imported vlc module (version: {vlc.libvlc_get_version().decode()})"
-        )
-    except ImportError as e:
-        print(f"❌ Failed to import vlc: {e}")
+                print(
+                    f"✅ Successfully imported vlc module (version: {vlc.libvlc_get_version().decode()})"
+                )
+            except ImportError as e:
+                print(f"❌ Failed to import vlc: {e}")
 
-        # Additional diagnostics for architecture issues
-        print("\nTrying to diagnose the issue...")
-        python_arch = "64-bit" if sys.maxsize > 2**32 else "32-bit"
-        print(f"Python architecture: {python_arch}")
+                # Additional diagnostics for architecture issues
+                print("\nTrying to diagnose the issue...")
+                python_arch = "64-bit" if sys.maxsize > 2**32 else "32-bit"
+                print(f"Python architecture: {python_arch}")
 
-        # Try to load VLC libraries with detailed error reporting
-        try:
-            from .Qrew_find_vlc import find_vlc_lib_dir
-        except ImportError:
-            from Qrew_find_vlc import find_vlc_lib_dir
+                # Try to load VLC libraries with detailed error reporting
+                try:
+                    from .Qrew_find_vlc import find_vlc_lib_dir
+                except ImportError:
+                    from Qrew_find_vlc import find_vlc_lib_dir
+
+                lib_dir = find_vlc_lib_dir()
+                if lib_dir and platform.system() == "Windows":
+                    try:
+                        dll_path = os.path.join(lib_dir, "libvlc.dll")
+                        with open(dll_path, "rb") as f:
+                            # Read PE header to determine architecture
+                            f.seek(0x3C)
+                            pe_offset = struct.unpack("<I", f.read(4))[0]
+                            f.seek(pe_offset + 4)
+                            machine_type = struct.unpack("<H", f.read(2))[0]
+                            vlc_arch = "64-bit" if machine_type == 0x8664 else "32-bit"
+                            print(f"VLC architecture: {vlc_arch}")
+                            if python_arch != vlc_arch:
+                                print(
+                                    f"❌ Architecture mismatch! Python is {python_arch} but VLC is {vlc_arch}"
+                                )
+                                print(
+                                    f"   Solution: Install {python_arch} version of VLC or use {vlc_arch} Python"
+                                )
+                    except Exception as e:
+                        print(f"Could not determine VLC architecture: {e}")
 
-        lib_dir = find_vlc_lib_dir()
-        if lib_dir and platform.system() == "Windows":
-            try:
-                dll_path = os.path.join(lib_dir, "libvlc.dll")
-                with open(dll_path, "rb") as f:
-                    # Read PE header to determine architecture
-                    f.seek(0x3C)
-                    pe_offset = struct.unpack("<I", f.read(4))[0]
-                    f.seek(pe_offset + 4)
-                    machine_type = struct.unpack("<H", f.read(2))[0]
-                    vlc_arch = "64-bit" if machine_type == 0x8664 else "32-bit"
-                    print(f"VLC architecture: {vlc_arch}")
-                    if python_arch != vlc_arch:
-                        print(
-                            f"❌ Architecture mismatch! Python is {python_arch} but VLC is {vlc_arch}"
-                        )
-                        print(
-                            f"   Solution: Install {python_arch} version of VLC or use {vlc_arch} Python"
-                        )
-            except Exception as e:
-                print(f"Could not determine VLC architecture: {e}")
+        return vlc
 
 
 # ----------------------------------------------------------------------
 # Rest of the VLC player implementation
-# All code after this point can assume vlc has been imported if available
+# Call load_vlc() before relying on the module-level vlc binding
 # ----------------------------------------------------------------------
 
 
@@ -267,6 +288,7 @@ class VLCPlayer:
         *on_finished* is called in a background thread when playback ends.
         """
         self.stop_and_exit()
+        load_vlc()
 
         if backend == "auto":
             backend = "libvlc" if vlc else "subprocess"
@@ -635,7 +657,7 @@ def test_vlc_nonblocking():
     else:
         print("⚠️ VLC not found in standard locations")
 
-    if vlc:
+    if load_vlc():
         print("✅ python-vlc library available")
     else:
         print("⚠️ python-vlc library not available")
@@ -1,5 +1,6 @@
 # Qrew_workers.py
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from PyQt5.QtCore import QThread, pyqtSignal, QTimer
 
 try:
@@ -20,7 +21,6 @@ try:
         rename_measurement,
         get_measurement_by_uuid,
         get_measurement_distortion_by_uuid,
-        get_measurement_uuid,
         get_ir_for_measurement,
         delete_measurement_by_uuid,
         subscribe_to_rta_distortion,
@@ -36,7 +36,9 @@ try:
         set_rta_configuration,
         set_rta_distortion_configuration_sine,
     )
-    from .Qrew_message_handlers import coordinator, rta_coordinator
+    from .Qrew_api_helper import get_all_measurements_with_uuid
+    from .Qrew_measurement_index import parse_measurement_title, TITLE_RAW
+    from .Qrew_message_handlers import coordinators, rta_coordinator
 
     from .Qrew_measurement_metrics import (
         evaluate_measurement,
@@ -44,7 +46,16 @@ try:
         combine_sweep_and_rta_results,
         combine_and_score_metrics,
     )
-    from .Qrew_vlc_helper_v2 import find_sweep_file, play_file_with_callback
+    from .Qrew_vlc_helper_v2 import (
+        find_sweep_file,
+        play_file_with_callback,
+        is_playing,
+        stop_vlc_and_exit,
+    )
+    from .Qrew_quality_cache import quality_cache
+    from .Qrew_processing_scheduler import ProcessingScheduler, DEFAULT_CONCURRENCY
+    from .Qrew_cross_align import align_channel, ChannelAlignment
+    from .Qrew_vector_average import average_channel
     from . import Qrew_settings as qs
 except ImportError:
     from Qrew_api_helper import (
@@ -56,7 +67,6 @@ except ImportError:
         rename_measurement,
         get_measurement_by_uuid,
         get_measurement_distortion_by_uuid,
-        get_measurement_uuid,
         get_ir_for_measurement,
         delete_measurement_by_uuid,
         subscribe_to_rta_distortion,
@@ -67,7 +77,9 @@ except ImportError:
         set_rta_distortion_configuration_sine,
         set_rta_distortion_configuration_sweep,
     )
-    from Qrew_message_handlers import coordinator, rta_coordinator
+    from Qrew_api_helper import get_all_measurements_with_uuid
+    from Qrew_measurement_index import parse_measurement_title, TITLE_RAW
+    from Qrew_message_handlers import coordinators, rta_coordinator
 
     from Qrew_measurement_metrics import (
         evaluate_measurement,
@@ -75,10 +87,128 @@ except ImportError:
         combine_sweep_and_rta_results,
         combine_and_score_metrics,
     )
-    from Qrew_vlc_helper_v2 import find_sweep_file, play_file_with_callback
+    from Qrew_vlc_helper_v2 import (
+        find_sweep_file,
+        play_file_with_callback,
+        is_playing,
+        stop_vlc_and_exit,
+    )
+    from Qrew_quality_cache import quality_cache
+    from Qrew_processing_scheduler import ProcessingScheduler, DEFAULT_CONCURRENCY
+    from Qrew_cross_align import align_channel, ChannelAlignment
+    from Qrew_vector_average import average_channel
     import Qrew_settings as qs
 
 
+# Pacing between steps (ms) and the per-operation timeout (s).  Completion
+# itself is event driven, so any of these can be set to 0 in settings.json.
+STEP_TIMING_DEFAULTS = {
+    "step_delay_ms": 500,  # after a successful capture / processing step
+    "retry_delay_ms": 2000,  # before retrying a failed step
+    "skip_delay_ms": 1000,  # after giving up on a step
+    "dialog_delay_ms": 100,  # after the position dialog closes
+    "operation_timeout_s": 300,
+}
+
+
+def step_timing(key):
+    """Configured value for a STEP_TIMING_DEFAULTS key (never negative)."""
+    default = STEP_TIMING_DEFAULTS[key]
+    try:
+        return max(0.0, float(qs.get(key, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+# RTA verification (settings.json keys).  Adaptive runs end as soon as the
+# 95% confidence interval on the mean THD, THD+N and SNR is inside its
+# limit, but not before the minimum nor after the maximum duration.
+RTA_VERIFICATION_DEFAULTS = {
+    "rta_adaptive": True,
+    "rta_min_duration_s": 2.0,
+    "rta_max_duration_s": 8.0,
+    "rta_ci_thd": 0.002,  # ± % THD
+    "rta_ci_thd_plus_n": 0.002,  # ± % THD+N
+    "rta_ci_snr_db": 0.5,  # ± dB
+}
+
+
+def rta_setting(key):
+    """Configured value for a RTA_VERIFICATION_DEFAULTS key."""
+    default = RTA_VERIFICATION_DEFAULTS[key]
+    value = qs.get(key, default)
+    if isinstance(default, bool):
+        return bool(value)
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def schedule_step(key, slot):
+    """Run *slot* after the configured *key* delay."""
+    QTimer.singleShot(int(step_timing(key)), slot)
+
+
+def processing_concurrency():
+    """How many REW processing jobs may run at once (settings key)."""
+    try:
+        return max(1, int(qs.get("processing_concurrency", DEFAULT_CONCURRENCY)))
+    except (TypeError, ValueError):
+        return DEFAULT_CONCURRENCY
+
+
+def cross_corr_backend():
+    """'local' to align in Qrew (Qrew_cross_align), 'rew' for REW's process."""
+    return "local" if str(qs.get("cross_corr_backend", "REW")).lower() == "local" else "rew"
+
+
+def vector_avg_backend():
+    """'local' to average in Qrew (Qrew_vector_average), 'rew' for REW's process."""
+    return "local" if str(qs.get("vector_avg_backend", "REW")).lower() == "local" else "rew"
+
+
+def score_measurement(measurement_uuid, measurement_info=None):
+    """
+    Fetch info, distortion and IR for one measurement from REW and score it.
+    *measurement_info* (e.g. CaptureHandle.metadata) saves the info request.
+
+    Returns (result, error_msg); result holds score, rating, uuid and
+    detail and is stored in quality_cache.  Safe to call from any thread.
+    """
+    measurements = measurement_info or get_measurement_by_uuid(measurement_uuid)
+    if not measurements:
+        return None, f"No measurements found for ID: {measurement_uuid}"
+
+    measurement_distortion = get_measurement_distortion_by_uuid(measurement_uuid)
+    if not measurement_distortion:
+        return None, f"No distortion data found for measurement ID: {measurement_uuid}"
+
+    impulse_response = get_ir_for_measurement(measurement_uuid)
+    if not impulse_response:
+        return None, (
+            f"No impulse response data found for measurement ID: {measurement_uuid}"
+        )
+
+    # Evaluate metrics
+    rew_metrics = calculate_rew_metrics_from_ir(impulse_response)
+    freq_metrics = evaluate_measurement(measurement_distortion, measurements, None)
+    if not freq_metrics:
+        return None, "Failed to evaluate measurement metrics."
+    combined_score = combine_and_score_metrics(rew_metrics, freq_metrics)
+
+    result = {
+        "score": combined_score["score"],
+        "rating": combined_score["rating"],
+        "uuid": measurement_uuid,
+        "detail": {**freq_metrics["detail"], **rew_metrics["detail"]},
+    }
+    quality_cache.put(
+        measurement_uuid, result["score"], result["rating"], result["detail"]
+    )
+    return result, None
+
+
 class MeasurementWorker(QThread):
     """Worker thread for handling measurements with error recovery"""
 
@@ -94,6 +224,9 @@ class MeasurementWorker(QThread):
     visualization_update = pyqtSignal(
         int, list, bool
     )  # position, active_speakers, flash
+    _score_done = pyqtSignal(str, dict, str)  # uuid, result, error (pool -> worker)
+
+    SCORE_WORKERS = 2  # pipelined scoring threads
 
     def __init__(self, measurement_state, parent_window=None):
         super().__init__()
@@ -115,6 +248,27 @@ class MeasurementWorker(QThread):
         # self._poll_timer.moveToThread(self)
 
         self._waiting_for_position_dialog = False
+        self._capture = None  # CaptureHandle of the capture in progress
+
+        # Completion is pushed by the capture's coordinator; one timer per
+        # wait enforces the timeout
+        self._op = None  # coordinator of the capture in progress
+        self._wait_operation = None
+        self._deadline = None
+        coordinators.signals.result_ready.connect(self._on_coordinator_result)
+
+        # Pipelined mode: capture N+1 while N is scored on a thread pool;
+        # quality pauses are deferred to the end of each position
+        self._pipelined = bool(qs.get("pipelined_capture", False)) and not (
+            measurement_state.get("repeat_mode", False)
+        )
+        self._score_pool = None
+        self._score_futures = []
+        self._pending_scores = {}  # uuid -> (channel, position)
+        self._waiting_for_scores = False
+        self._reviewed_uuids = set()
+        self._retake_channels = []  # re-captures queued at the current position
+        self._score_done.connect(self._on_score_done)
 
     def run(self):
         QTimer.singleShot(0, self.continue_measurement)
@@ -142,7 +296,11 @@ class MeasurementWorker(QThread):
         pos = state["current_position"]
 
         # Check if we've done all channels for this position
-        if state["channel_index"] >= len(state["channels"]):
+        if state["channel_index"] >= len(state["channels"]) and not (
+            self._retake_channels
+        ):
+            if self._pipelined and not self._position_reviewed():
+                return  # resumed by _on_score_done or the quality dialog
             state["channel_index"] = 0
             state["current_position"] += 1
             self.current_retry = 0  # Reset retry count for new position
@@ -162,7 +320,7 @@ class MeasurementWorker(QThread):
             return
 
         # Process current channel
-        ch = state["channels"][state["channel_index"]]
+        ch = self._measuring_channel()
         sample_name = f"{ch}_pos{pos}"
 
         # Update grid to show current position and start flash
@@ -177,17 +335,18 @@ class MeasurementWorker(QThread):
         )
         self.status_update.emit(f"Starting measurement for {sample_name}{retry_msg}...")
 
-        # Reset coordinator and start measurement
-        coordinator.reset(ch, pos)
+        # New operation for this attempt, then start measurement
+        self._op = coordinators.begin(ch, pos)
         # time.sleep(0.1) #optional
-        success, error_msg = start_capture(
+        capture, error_msg = start_capture(
             ch,
             pos,
             status_callback=self.status_update.emit,
             error_callback=self.error_occurred.emit,
         )
+        self._capture = capture or None
 
-        if not success:
+        if not capture:
             self.status_update.emit(f"Failed to start capture for {sample_name}")
             self.handle_measurement_failure("Failed to start capture")
             return
@@ -204,7 +363,7 @@ class MeasurementWorker(QThread):
             self._waiting_for_position_dialog = False
 
         # Continue with measurement
-        QTimer.singleShot(100, self.continue_measurement)
+        schedule_step("dialog_delay_ms", self.continue_measurement)
 
     def handle_repeat_mode(self):
         """
@@ -266,23 +425,24 @@ class MeasurementWorker(QThread):
         )
         self.status_update.emit(f"Remeasuring {sample_name}{retry_msg}...")
 
-        coordinator.reset(channel, position)
+        self._op = coordinators.begin(channel, position)
         # time.sleed(0.1)  #optional
-        success, err = start_capture(
+        capture, err = start_capture(
             channel,
             position,
             status_callback=self.status_update.emit,
             error_callback=self.error_occurred.emit,
         )
+        self._capture = capture or None
 
-        if not success:
+        if not capture:
             self.status_update.emit(f"Failed to start capture for {sample_name}")
             self.handle_measurement_failure("Failed to start capture")
             return
 
         self.visualization_update.emit(position, [channel], True)
 
-        self.start_completion_check()  # poll coordinator
+        self.start_completion_check()  # wait for coordinator result
 
     def check_measurement_quality_and_pause(self):
         """Check if measurement quality requires user intervention"""
@@ -335,11 +495,25 @@ class MeasurementWorker(QThread):
         # Clear the pending quality check
         state["quality_check_pending"] = False
 
+        if self._pipelined:
+            # Raised from _position_reviewed(): every channel of this
+            # position is captured, so a retake is queued explicitly and
+            # "continue" moves on to the next flagged capture or position
+            if action == "remeasure":
+                self.current_retry = 0
+                self._retake_channels.append(state["quality_check_channel"])
+                schedule_step("step_delay_ms", self.continue_measurement)
+            elif action == "continue":
+                schedule_step("step_delay_ms", self.continue_measurement)
+            elif action == "stop":
+                self.stop_and_finish()
+            return
+
         if action == "remeasure":
             # Reset for remeasurement of the same position/channel
             self.current_retry = 0
             # Don't increment channel_index, stay on same measurement
-            QTimer.singleShot(500, self.continue_measurement)
+            schedule_step("step_delay_ms", self.continue_measurement)
         elif action == "continue":
             # Continue with next measurement
             # self.grid_flash_signal.emit(False)
@@ -349,148 +523,191 @@ class MeasurementWorker(QThread):
 
             self.current_retry = 0
             self.measurement_state["channel_index"] += 1
-            QTimer.singleShot(500, self.continue_measurement)
+            schedule_step("step_delay_ms", self.continue_measurement)
         elif action == "stop":
             # Stop the measurement process
             self.stop_and_finish()
 
     # ─────────────────────────────────────────────────────────────
-    #  Completion Polling
+    #  Completion (pushed by the coordinator)
     # ─────────────────────────────────────────────────────────────
-    def _init_poll_timer(self):
-        """Internal: one-time timer setup."""
-        if getattr(self, "_poll_timer", None) is None:
-            self._poll_timer = QTimer(self)
-            self._poll_timer.setInterval(200)  # ms
-            self._poll_timer.timeout.connect(self._poll_measurement)
-
     def start_completion_check(self):
         """
-        Begin / restart polling coordinator for measurement completion.
-        Safe to call repeatedly; idempotent.
+        Wait for the result of the capture in self._op.  The result
+        arrives through coordinators.signals.result_ready; a single-shot
+        deadline timer turns a missing result into a timeout.  Safe to
+        call repeatedly.
         """
-        self.timeout_count = 0
-        self._init_poll_timer()
-        if not self._poll_timer.isActive():
-            self._poll_timer.start()
-
-    def _poll_measurement(self):
-        """Timer slot: check coordinator + timeout."""
-        if not self.running:
-            return
-
-        # finished? (coordinator event set by API helper)
-        if coordinator.event.is_set():
-            status, error_msg = coordinator.status, coordinator.error_message
-
-            if status == "success":
-                self.on_measurement_success()
-            elif status in ("abort", "error"):
-                self.handle_measurement_failure(error_msg or f"Measurement {status}")
-            elif status == "timeout":
-                self.handle_measurement_failure("Measurement timed out")
-            else:
-                # Unknown -> treat as success (backward compat)
-                self.on_measurement_success()
-            return  # handled; wait for next cycle to restart
+        self._wait_operation = self._op.op_id
+        if self._deadline is None:
+            self._deadline = QTimer(self)
+            self._deadline.setSingleShot(True)
+            self._deadline.timeout.connect(self._on_deadline)
+        self._deadline.start(int(step_timing("operation_timeout_s") * 1000))
+
+    def _on_deadline(self):
+        op = self._op
+        if self.running and op is not None and self._wait_operation == op.op_id:
+            op.trigger_timeout(
+                f"Measurement timed out after {step_timing('operation_timeout_s'):.0f} s"
+            )
 
-        # not yet finished: check for overall timeout
-        self.timeout_count += 1
-        if self.timeout_count >= 1500:  # 5 min @200ms
-            coordinator.trigger_timeout()
-            self.handle_measurement_failure("Measurement timed out after 5 minutes")
+    def _on_coordinator_result(self, op_id, status, error_msg):
+        """Slot: a coordinator finished an operation."""
+        if not self.running or op_id != self._wait_operation:
+            return  # not ours, or a late result for an abandoned attempt
+        self._wait_operation = None
+
+        if status == "success":
+            self.on_measurement_success()
+        elif status in ("abort", "error"):
+            self.handle_measurement_failure(error_msg or f"Measurement {status}")
+        elif status == "timeout":
+            self.handle_measurement_failure(error_msg or "Measurement timed out")
+        else:
+            # Unknown -> treat as success (backward compat)
+            self.on_measurement_success()
 
     def calculate_measurement_metrics(self):
-        """Evaluate and emit measurement metrics"""
+        """Evaluate and emit metrics for the capture that just completed"""
         try:
-            measurement_uuid = get_measurement_uuid()
+            capture = self._capture
+            measurement_uuid = capture.resolve() if capture else None
             if not measurement_uuid:
                 self.status_update.emit("No measurement UUID found for evaluation.")
                 return
 
-            measurements = get_measurement_by_uuid(measurement_uuid)
-            if not measurements:
-                self.status_update.emit(
-                    f"No measurements found for ID: {measurement_uuid}"
-                )
+            result, error_msg = score_measurement(measurement_uuid, capture.metadata)
+            if result is None:
+                self.status_update.emit(error_msg)
                 return
 
-            measurement_distortion = get_measurement_distortion_by_uuid(
-                measurement_uuid
+            result["channel"] = self._measuring_channel()
+            result["position"] = self.measurement_state["current_position"]
+            self.metrics_update.emit(result)
+
+        except Exception as e:
+            print(f"Error in calculate_measurement_metrics: {e}")
+            self.status_update.emit(f"Error evaluating metrics: {str(e)}")
+
+    # ─────────────────────────────────────────────────────────────
+    #  Pipelined scoring
+    # ─────────────────────────────────────────────────────────────
+    def _submit_scoring(self, channel, position):
+        """
+        Score the capture that just finished on the scoring pool, so the
+        next capture can start right away.  The result comes back through
+        _score_done and joins measurement_qualities via metrics_update.
+        """
+        capture = self._capture
+        # Resolve now, before the next capture starts
+        measurement_uuid = capture.resolve() if capture else None
+        if not measurement_uuid:
+            self.status_update.emit("No measurement UUID found for evaluation.")
+            return
+        measurement_info = capture.metadata
+        if self._score_pool is None:
+            self._score_pool = ThreadPoolExecutor(
+                max_workers=self.SCORE_WORKERS, thread_name_prefix="qrew-score"
             )
-            if not measurement_distortion:
-                self.status_update.emit(
-                    f"No distortion data found for measurement ID: {measurement_uuid}"
-                )
-                return
-            impulse_response = get_ir_for_measurement(measurement_uuid)
+        self._pending_scores[measurement_uuid] = (channel, position)
+
+        def job():
+            try:
+                result, error_msg = score_measurement(measurement_uuid, measurement_info)
+            except Exception as e:
+                result, error_msg = None, f"Error evaluating metrics: {e}"
+            try:
+                self._score_done.emit(measurement_uuid, result or {}, error_msg or "")
+            except RuntimeError:
+                pass  # worker already deleted
+
+        self._score_futures.append(self._score_pool.submit(job))
+
+    def _on_score_done(self, measurement_uuid, result, error_msg):
+        """Slot (worker's thread): one pipelined score is ready."""
+        channel, position = self._pending_scores.pop(measurement_uuid, (None, None))
+        if channel is None:
+            return
+        if result:
+            result["channel"] = channel
+            result["position"] = position
+            self.metrics_update.emit(result)
+        elif error_msg:
+            self.status_update.emit(f"{channel}_pos{position}: {error_msg}")
 
-            if not impulse_response:
-                self.status_update.emit(
-                    f"No impulse response data found for measurement ID: {measurement_uuid}"
-                )
+        if self._waiting_for_scores and not self._scores_pending_for(position):
+            self._waiting_for_scores = False
+            QTimer.singleShot(0, self.continue_measurement)
 
-            # Extract data
-            thd_json = measurement_distortion
-            info_json = measurements
-            ir_json = impulse_response
-            coherence_array = None
+    def _scores_pending_for(self, position):
+        return any(pos == position for _, pos in self._pending_scores.values())
 
-            if not thd_json or not info_json or not ir_json:
-                self.status_update.emit("Incomplete measurement data for evaluation.")
-                return
-            channel = self.measurement_state["channels"][
-                self.measurement_state["channel_index"]
-            ]
-            position = self.measurement_state["current_position"]
-            # Evaluate metrics
-            rew_metrics = calculate_rew_metrics_from_ir(ir_json)
-            freq_metrics = evaluate_measurement(thd_json, info_json, coherence_array)
-            combined_score = combine_and_score_metrics(rew_metrics, freq_metrics)
-            if not freq_metrics:
-                self.status_update.emit("Failed to evaluate measurement metrics.")
-                return
+    def _position_reviewed(self):
+        """
+        Pipelined mode, called once every channel of the current position
+        has been captured.  Waits for the outstanding scores and, with
+        auto_pause_on_quality_issue, raises the quality dialog for each
+        CAUTION / RETAKE capture before the next position dialog.
 
-            # Emit metrics for display
-            # result['uuid'] = measurement_uuid
-            # result['channel']   = channel
-            # result['position']  = position
-            # self.metrics_update.emit(result)
-            # Combine results
-            result = {
-                "score": combined_score["score"],
-                "rating": combined_score["rating"],
-                "channel": channel,
-                "position": position,
-                "uuid": measurement_uuid,
-                "detail": {
-                    **freq_metrics["detail"],
-                    **rew_metrics["detail"],
-                    #     'peak_value': rew_metrics['peak_value'],
-                    #     'peak_time_ms': rew_metrics['peak_time_ms'],
-                    #    'rew_snr_dB': rew_metrics['snr_dB'],      # REW's exact SNR
-                    #   'rew_sdr_dB': rew_metrics['sdr_dB'],      # REW's exact SDR
-                    #  'ir_peak_noise_dB': rew_metrics['ir_peak_noise_dB'],
-                    # 'signal_dbfs': rew_metrics['signal_dbfs'],
-                    #   'dist_dbfs': rew_metrics['dist_dbfs'],
-                    #  'noise_dbfs': rew_metrics['noise_dbfs']
-                },
-            }
-            self.metrics_update.emit(result)
-            # Send detailed info to status
-        #      detail = result.get("detail", {})
-        #     detail_str = ", ".join(f"{k}: {v:.2f}" if isinstance(v, (int, float)) else f"{k}: {v}"
-        #                         for k, v in detail.items())
-        #   self.status_update.emit(f"Metrics: {detail_str}")
+        Returns True when the run may move on to the next position.
+        """
+        state = self.measurement_state
+        pos = state["current_position"]
 
-        except Exception as e:
-            print(f"Error in calculate_measurement_metrics: {e}")
-            self.status_update.emit(f"Error evaluating metrics: {str(e)}")
+        if self._scores_pending_for(pos):
+            self._waiting_for_scores = True
+            self.status_update.emit(f"Waiting for quality scores of position {pos}...")
+            return False
+
+        if not qs.get("auto_pause_on_quality_issue", False) or not self.parent_window:
+            return True
+
+        qualities = self.parent_window.measurement_qualities
+        for ch in state["channels"]:
+            quality = qualities.get((ch, pos))
+            if (
+                quality
+                and quality["rating"] in ("CAUTION", "RETAKE")
+                and quality["uuid"] not in self._reviewed_uuids
+            ):
+                self._reviewed_uuids.add(quality["uuid"])
+                self.visualization_update.emit(pos, [], False)
+                state["quality_check_pending"] = True
+                state["quality_check_channel"] = ch
+                state["quality_check_position"] = pos
+                self.show_quality_dialog.emit(
+                    {
+                        "channel": ch,
+                        "position": pos,
+                        "rating": quality["rating"],
+                        "score": quality["score"],
+                        "detail": quality["detail"],
+                        "uuid": quality["uuid"],
+                    }
+                )
+                return False
+
+        return True
+
+    def _measuring_channel(self):
+        """Channel of the capture in progress (retakes come first)."""
+        if self._retake_channels:
+            return self._retake_channels[0]
+        return self.measurement_state["channels"][
+            self.measurement_state["channel_index"]
+        ]
+
+    def _advance_channel(self):
+        if self._retake_channels:
+            self._retake_channels.pop(0)
+        else:
+            self.measurement_state["channel_index"] += 1
 
     def on_measurement_success(self):
         """Called when measurement completes successfully"""
-        # STOP the timer to prevent multiple calls
-        self._stop_poll_timer()
+        # Stop the deadline so it cannot fire for a finished operation
+        self._stop_deadline()
         state = self.measurement_state
 
         if state.get("repeat_mode", False):
@@ -528,16 +745,23 @@ class MeasurementWorker(QThread):
             state["re_idx"] += 1
             # Reset retry count and continue with next pair
             self.current_retry = 0
-            QTimer.singleShot(500, self.continue_measurement)
+            schedule_step("step_delay_ms", self.continue_measurement)
         else:
             # Original logic for normal measurements
-            current_ch = self.measurement_state["channels"][
-                self.measurement_state["channel_index"]
-            ]
+            current_ch = self._measuring_channel()
             self.status_update.emit(
                 f"Completed {current_ch}_pos{self.measurement_state['current_position']}"
             )
 
+            if self._pipelined:
+                # Score in the background and go straight to the next capture
+                self._submit_scoring(current_ch, state["current_position"])
+                self.visualization_update.emit(state["current_position"], [], False)
+                self.current_retry = 0
+                self._advance_channel()
+                schedule_step("step_delay_ms", self.continue_measurement)
+                return
+
             # Evaluate metrics before moving on
             self.calculate_measurement_metrics()
 
@@ -555,12 +779,12 @@ class MeasurementWorker(QThread):
             self.measurement_state["channel_index"] += 1
 
             # Continue with next measurement
-            QTimer.singleShot(500, self.continue_measurement)
+            schedule_step("step_delay_ms", self.continue_measurement)
 
     def handle_measurement_failure(self, error_msg):
         """Handle measurement failure with retry logic"""
-        # STOP the timer to prevent multiple calls
-        self._stop_poll_timer()
+        # Stop the deadline so it cannot fire for a finished operation
+        self._stop_deadline()
         if "stimulus" in error_msg.lower() or "no stimulus" in error_msg.lower():
             self.status_update.emit("Measurement aborted: stimulus file not loaded.")
             self.error_occurred.emit(
@@ -568,9 +792,7 @@ class MeasurementWorker(QThread):
             )
             self.stop_and_finish()
             return
-        current_ch = self.measurement_state["channels"][
-            self.measurement_state["channel_index"]
-        ]
+        current_ch = self._measuring_channel()
         current_pos = self.measurement_state["current_position"]
 
         # Turn off flash on failure
@@ -586,30 +808,44 @@ class MeasurementWorker(QThread):
                 f"Retrying {current_ch}_pos{current_pos} ({self.current_retry}/{self.max_retries})..."
             )
             # Retry the same measurement after a brief delay
-            QTimer.singleShot(2000, self.continue_measurement)
+            schedule_step("retry_delay_ms", self.continue_measurement)
         else:
             # Max retries reached, skip to next channel
             self.status_update.emit(
                 f"Max retries reached for {current_ch}_pos{current_pos}, skipping..."
             )
             self.current_retry = 0
-            self.measurement_state["channel_index"] += 1
-            QTimer.singleShot(1000, self.continue_measurement)
+            self._advance_channel()
+            schedule_step("skip_delay_ms", self.continue_measurement)
 
     # ─────────────────────────────────────────────────────────────
     #  Shutdown helpers
     # ─────────────────────────────────────────────────────────────
-    def _stop_poll_timer(self):
-        t = getattr(self, "_poll_timer", None)
+    def _stop_deadline(self):
+        self._wait_operation = None
+        coordinators.discard(self._op)
+        t = self._deadline
         if t is not None:
             t.stop()
             t.deleteLater()
-            self._poll_timer = None
+            self._deadline = None
+
+    def _shutdown_score_pool(self, cancel):
+        pool = self._score_pool
+        self._score_pool = None
+        if pool is not None:
+            if cancel:
+                for future in self._score_futures:
+                    future.cancel()
+            # Scores already running still reach measurement_qualities
+            pool.shutdown(wait=False)
+        self._score_futures = []
 
     def stop(self):
         """Immediate stop requested by UI (close / cancel)."""
         self.running = False
-        self._stop_poll_timer()
+        self._stop_deadline()
+        self._shutdown_score_pool(cancel=True)
 
         self.quit()
         self.wait()
@@ -617,7 +853,7 @@ class MeasurementWorker(QThread):
     def stop_and_finish(self):
         """
         Graceful normal completion.
-        Emits finished(), stops polling, ends thread loop.
+        Emits finished(), stops the deadline timer, ends thread loop.
         """
         if self.running:
             self.running = False
@@ -629,248 +865,282 @@ class MeasurementWorker(QThread):
                 [],  # No active speakers
                 False,  # No flash
             )
-        self._stop_poll_timer()
+        self._stop_deadline()
+        self._shutdown_score_pool(cancel=False)
         self.quit()
 
 
 class ProcessingWorker(QThread):
-    """Worker thread for handling cross correlation and vector averaging with error recovery"""
+    """
+    Worker thread for cross correlation, vector averaging and renaming.
+
+    The jobs of all channels are planned by ProcessingScheduler and run
+    side by side, up to processing_concurrency() REW jobs at a time; each
+    job is retried on its own.
+    """
 
     status_update = pyqtSignal(str)
     error_occurred = pyqtSignal(str, str)
     finished = pyqtSignal()
+    _local_done = pyqtSignal(object, object, str)  # job, result, error
 
     def __init__(self, processing_state):
         super().__init__()
         self.processing_state = processing_state
         self.running = True
-        self.timeout_count = 0
         self.max_retries = 2
-        self.current_retry = 0
-        # self.check_timer = None
-
-    #   self._poll_timer = QTimer()
-    #  self._poll_timer.setSingleShot(True)
-    # self._poll_timer.timeout.connect(self.check_measurement_complete)
-    # ensure timer runs in worker thread once thread starts
-    # self._poll_timer.moveToThread(self)
+        self.scheduler = None
+        # REW jobs in flight: operation id -> (ProcessingJob, coordinator)
+        self._jobs = {}
+        self._deadlines = {}  # operation id -> single-shot QTimer
+        # Local cross correlation / vector average run on a small pool
+        self._local_pool = None
+        self._local_running = 0
+        coordinators.signals.result_ready.connect(self._on_coordinator_result)
+        self._local_done.connect(self._on_local_done)
 
     def run(self):
         QTimer.singleShot(0, self.start_processing)
         super().run()
 
     def start_processing(self):
-        """Start the processing workflow"""
+        """Plan the jobs for the selected mode and start the first ones"""
         if not self.running:
             return
 
         state = self.processing_state
+        self.scheduler = ProcessingScheduler(
+            state["channel_measurements"],
+            state["mode"],
+            max_concurrent=processing_concurrency(),
+            max_retries=self.max_retries,
+        )
+        state["scheduler"] = self.scheduler
 
-        # Check if we've processed all channels
-        if state["channel_index"] >= len(state["channels"]):
-            self.status_update.emit("All processing complete!")
-            self.stop_and_finish()
+        for channel in self.scheduler.empty_channels:
+            self.status_update.emit(f"No measurements found for {channel}, skipping...")
+        self.status_update.emit(
+            f"Processing {len(self.scheduler.jobs)} jobs, "
+            f"up to {self.scheduler.max_concurrent} at a time..."
+        )
+        self.dispatch()
+
+    def dispatch(self):
+        """Start every job whose dependencies are settled; finish when done"""
+        if not self.running or self.scheduler is None:
             return
 
-        current_channel = state["channels"][state["channel_index"]]
-        measurements = state["channel_measurements"].get(current_channel, [])
+        started = self.scheduler.next_jobs()
+        for job in started:
+            self.start_job(job)
 
-        if not measurements:
+        in_flight = self._jobs or self._local_running
+        if not started and not in_flight and not self.scheduler.finished:
+            # Only retries waiting out their delay are left
+            QTimer.singleShot(100, self.dispatch)
+        elif self.scheduler.finished and not in_flight:
+            print(self.scheduler.summary())
             self.status_update.emit(
-                f"No measurements found for {current_channel}, skipping..."
+                f"All processing complete! ({self.scheduler.progress()})"
             )
-            state["channel_index"] += 1
-            QTimer.singleShot(100, self.start_processing)
-            return
+            self.stop_and_finish()
 
-        # Sort by mic position (0 first) and keep only the UUIDs
-        try:
-            measurement_ids = [
-                m["uuid"]
-                for m in sorted(measurements, key=lambda x: x.get("position", 0))
-            ]
-        except (TypeError, KeyError):
-            # backward-compatibility with the old tuple format: (uuid, position, ...)
-            measurement_ids = [
-                m[0]
-                for m in sorted(measurements, key=lambda x: x[1] if len(m) > 1 else 0)
-            ]
-        mode = state["mode"]
+    def start_job(self, job):
+        if job.step == "rename":
+            self.rename_result(job)
+            return
 
         retry_msg = (
-            f" (Retry {self.current_retry + 1}/{self.max_retries})"
-            if self.current_retry > 0
-            else ""
+            f" (Retry {job.attempts - 1}/{self.max_retries})" if job.attempts > 1 else ""
+        )
+        backend = cross_corr_backend() if job.step == "cross_corr" else vector_avg_backend()
+        if backend == "local":
+            self.status_update.emit(f"Starting {job.label.lower()} (local){retry_msg}...")
+            self.start_local_job(job)
+            return
+        self.status_update.emit(f"Starting {job.label.lower()}{retry_msg}...")
+
+        measurement_ids = job.measurement_ids
+        alignment = job.after.result if job.after is not None else None
+        if isinstance(alignment, ChannelAlignment) and alignment.aligned_uuids:
+            measurement_ids = alignment.aligned_uuids  # the locally aligned copies
+
+        op = coordinators.begin(job.channel, job.step, measurement_ids)
+        start = start_cross_corr_align if job.step == "cross_corr" else start_vector_avg
+        success, error_msg = start(
+            job.channel,
+            measurement_ids,
+            status_callback=self.status_update.emit,
+            error_callback=self.error_occurred.emit,
+            result_url=op.result_url,
         )
+        if not success:
+            coordinators.discard(op)
+            self.job_failed(job, f"Failed to start {job.label.lower()}: {error_msg}")
+            return
 
-        if state["current_step"] == "cross_corr":
-            # Start cross correlation alignment
-            coordinator.reset(current_channel, "cross_corr")
-            self.status_update.emit(
-                f"Starting cross correlation for {current_channel}{retry_msg}..."
+        self._jobs[op.op_id] = (job, op)
+        deadline = QTimer(self)
+        deadline.setSingleShot(True)
+        deadline.timeout.connect(lambda op_id=op.op_id: self._on_deadline(op_id))
+        deadline.start(int(step_timing("operation_timeout_s") * 1000))
+        self._deadlines[op.op_id] = deadline
+
+    def start_local_job(self, job):
+        """Run the job in Qrew instead of queueing a REW job"""
+        if self._local_pool is None:
+            self._local_pool = ThreadPoolExecutor(
+                max_workers=self.scheduler.max_concurrent, thread_name_prefix="qrew-local"
             )
+        self._local_running += 1
+        run_job = self.local_alignment if job.step == "cross_corr" else self.local_average
 
-            success, error_msg = start_cross_corr_align(
-                current_channel,
-                measurement_ids,
-                status_callback=self.status_update.emit,
-                error_callback=self.error_occurred.emit,
-            )
+        def run():
+            try:
+                result, error_msg = run_job(job)
+            except Exception as e:
+                result, error_msg = None, f"Local {job.label.lower()} failed: {e}"
+            self._local_done.emit(job, result, error_msg or "")
 
-            if success:
-                self.start_completion_check()
-            else:
-                self.handle_processing_failure(
-                    f"Failed to start cross correlation: {error_msg}"
-                )
+        self._local_pool.submit(run)
 
-        elif state["current_step"] == "vector_avg":
-            # Start vector averaging
-            coordinator.reset(current_channel, "vector_avg")
-            self.status_update.emit(
-                f"Starting vector averaging for {current_channel}{retry_msg}..."
-            )
-
-            success, error_msg = start_vector_avg(
-                current_channel,
-                measurement_ids,
-                status_callback=self.status_update.emit,
-                error_callback=self.error_occurred.emit,
-            )
-
-            if success:
-                self.start_completion_check()
+    def local_alignment(self, job):
+        """
+        Align one channel locally.  The aligned IRs are only uploaded when
+        REW needs them (its vector average, or a cross-corr-only run); the
+        local vector average applies the shifts itself.
+        """
+        upload = self.scheduler.mode == "cross_corr_only" or vector_avg_backend() == "rew"
+        return align_channel(job.channel, job.measurement_ids, self.status_update.emit, upload)
+
+    def local_average(self, job):
+        """Vector-average one channel locally, applying a local alignment if there is one"""
+        measurement_ids, shifts, positions = job.measurement_ids, None, None
+        alignment = job.after.result if job.after is not None else None
+        if isinstance(alignment, ChannelAlignment):
+            positions = alignment.positions
+            if alignment.aligned_uuids:
+                measurement_ids = alignment.aligned_uuids
             else:
-                self.handle_processing_failure(
-                    f"Failed to start vector averaging: {error_msg}"
-                )
-
-    # ─────────────────────────────────────────────────────────────
-    #  Completion Polling
-    # ─────────────────────────────────────────────────────────────
-    def _init_poll_timer(self):
-        if getattr(self, "_poll_timer", None) is None:
-            self._poll_timer = QTimer(self)
-            self._poll_timer.setInterval(200)
-            self._poll_timer.timeout.connect(self._poll_processing)
-
-    def start_completion_check(self):
-        self.timeout_count = 0
-        self._init_poll_timer()
-        if not self._poll_timer.isActive():
-            self._poll_timer.start()
+                measurement_ids, shifts = alignment.measurement_ids, alignment.shifts
+        return average_channel(
+            job.channel,
+            measurement_ids,
+            shifts=shifts,
+            positions=positions,
+            upload_aligned=bool(qs.get("upload_aligned_measurements", False)),
+            status_callback=self.status_update.emit,
+        )
 
-    def _poll_processing(self):
+    def _on_local_done(self, job, result, error_msg):
+        """Slot: a local job finished (runs in the worker's thread)"""
+        self._local_running -= 1
         if not self.running:
             return
-
-        if coordinator.event.is_set():
-            status, error_msg = coordinator.status, coordinator.error_message
-
-            if status == "success":
-                self.on_operation_success()
-            elif status in ("abort", "error"):
-                self.handle_processing_failure(error_msg or f"Processing {status}")
-            elif status == "timeout":
-                self.handle_processing_failure("Processing timed out")
-            else:
-                self.on_operation_success()
+        if result:
+            self.job_succeeded(job, result)
+        else:
+            self.job_failed(job, error_msg or f"{job.label} failed")
+
+    def rename_result(self, job):
+        """Rename the measurement the channel's vector average created"""
+        vector_avg_id = job.after.result if job.after else None
+        if vector_avg_id is None:
+            # Retrying can't recover an ID REW never reported
+            self.job_failed(
+                job,
+                f"Cannot rename {job.channel}: REW did not report the "
+                "measurement its vector average created",
+                retry=False,
+            )
             return
 
-        self.timeout_count += 1
-        if self.timeout_count >= 1500:
-            coordinator.trigger_timeout()
-            self.handle_processing_failure("Operation timed out after 5 minutes")
-
-    def on_operation_success(self):
-        """Called when current operation completes successfully"""
-        self._stop_poll_timer()
-
-        state = self.processing_state
-        current_channel = state["channels"][state["channel_index"]]
-        mode = state["mode"]
-
-        # Reset retry count
-        self.current_retry = 0
+        new_name = f"{job.channel}_VectorAvg"
+        if rename_measurement(vector_avg_id, new_name, self.status_update.emit):
+            self.scheduler.complete(job, new_name)
+            self.status_update.emit(f"Renamed vector average to: {new_name}")
+            QTimer.singleShot(0, self.dispatch)
+        else:
+            self.job_failed(job, f"Failed to rename vector average for {job.channel}")
 
-        if state["current_step"] == "cross_corr":
-            self.status_update.emit(
-                f"Cross correlation completed for {current_channel}"
+    # ─────────────────────────────────────────────────────────────
+    #  Completion (pushed by the coordinators)
+    # ─────────────────────────────────────────────────────────────
+    def _on_deadline(self, op_id):
+        entry = self._jobs.get(op_id)
+        if self.running and entry is not None:
+            entry[1].trigger_timeout(
+                f"Operation timed out after {step_timing('operation_timeout_s'):.0f} s"
             )
 
-            # Handle next step based on mode
-            if mode == "cross_corr_only":
-                state["channel_index"] += 1
-            elif mode == "full":
-                state["current_step"] = "vector_avg"
-
-            QTimer.singleShot(500, self.start_processing)
-
-        elif state["current_step"] == "vector_avg":
-            self.status_update.emit(f"Vector averaging completed for {current_channel}")
-
-            # Get and rename the vector average result
-            vector_avg_id = get_vector_average_result()
-            if vector_avg_id:
-                new_name = f"{current_channel}_VectorAvg"
-                success = rename_measurement(
-                    vector_avg_id, new_name, self.status_update.emit
-                )
-                if success:
-                    self.status_update.emit(f"Renamed vector average to: {new_name}")
-
-            # Handle next step based on mode
-            if mode == "vector_avg_only":
-                state["channel_index"] += 1
-            elif mode == "full":
-                state["channel_index"] += 1
-                state["current_step"] = "cross_corr"
-
-            QTimer.singleShot(500, self.start_processing)
+    def _on_coordinator_result(self, op_id, status, error_msg):
+        """Slot: a coordinator finished an operation."""
+        entry = self._jobs.pop(op_id, None)
+        if entry is None or not self.running:
+            return  # not one of our jobs
+        job, op = entry
+        self._stop_deadline(op_id)
+        coordinators.discard(op)
+
+        if status in ("abort", "error"):
+            self.job_failed(job, error_msg or f"Processing {status}")
+        elif status == "timeout":
+            self.job_failed(job, error_msg or "Processing timed out")
+        elif job.step == "vector_avg":
+            # REW reports the new measurement in the job's own callback;
+            # the global process-result is only ours when nothing else runs
+            result = op.new_measurement_id()
+            if result is None and not self._jobs:
+                result = get_vector_average_result()
+            self.job_succeeded(job, result)
+        else:
+            self.job_succeeded(job)
 
-    def handle_processing_failure(self, error_msg):
-        """Handle processing failure with retry logic"""
-        self._stop_poll_timer()
+    def job_succeeded(self, job, result=None):
+        self.scheduler.complete(job, result)
+        self.status_update.emit(f"{job.label} completed")
+        self.status_update.emit(f"Processing: {self.scheduler.progress()}")
+        QTimer.singleShot(0, self.dispatch)
 
+    def job_failed(self, job, error_msg, retry=True):
+        """Handle a failed job with per-job retry logic"""
         self.status_update.emit(f"Processing error: {error_msg}")
 
-        if self.current_retry < self.max_retries:
-            self.current_retry += 1
+        retry_delay = step_timing("retry_delay_ms")
+        if self.scheduler.fail(job, error_msg, retry_delay / 1000.0, retry):
             self.status_update.emit(
-                f"Retrying... ({self.current_retry}/{self.max_retries})"
+                f"Retrying {job.label.lower()}... ({job.attempts}/{self.max_retries})"
             )
-            QTimer.singleShot(2000, self.start_processing)
+            QTimer.singleShot(int(retry_delay), self.dispatch)
         else:
-            # Max retries reached, skip this operation
-            state = self.processing_state
-            self.status_update.emit(
-                f"Max retries reached, skipping {state['current_step']} for {state['channels'][state['channel_index']]}"
-            )
-            self.current_retry = 0
-
-            # Move to next operation
-            if state["current_step"] == "cross_corr" and state["mode"] == "full":
-                state["current_step"] = "vector_avg"
-            else:
-                state["channel_index"] += 1
-                if state["mode"] == "full":
-                    state["current_step"] = "cross_corr"
-
-            QTimer.singleShot(1000, self.start_processing)
+            reason = "Max retries reached" if retry else "Not retryable"
+            self.status_update.emit(f"{reason}, skipping {job.step} for {job.channel}")
+            QTimer.singleShot(0, self.dispatch)
 
     # ─────────────────────────────────────────────────────────────
     #  Shutdown helpers
     # ─────────────────────────────────────────────────────────────
-    def _stop_poll_timer(self):
-        t = getattr(self, "_poll_timer", None)
+    def _stop_deadline(self, op_id):
+        t = self._deadlines.pop(op_id, None)
         if t is not None:
             t.stop()
             t.deleteLater()
-            self._poll_timer = None
+
+    def _abandon_jobs(self):
+        for op_id, (job, op) in list(self._jobs.items()):
+            self._stop_deadline(op_id)
+            coordinators.discard(op)
+        self._jobs = {}
+        if self._local_pool is not None:
+            # A running local job finishes in the background; its result is ignored
+            self._local_pool.shutdown(wait=False)
+            self._local_pool = None
+        if self.scheduler is not None:
+            self.scheduler.cancel()
 
     def stop(self):
         self.running = False
-        self._stop_poll_timer()
+        self._abandon_jobs()
         self.quit()
         self.wait()
 
@@ -878,25 +1148,38 @@ class ProcessingWorker(QThread):
         if self.running:
             self.running = False
             self.finished.emit()
-        self._stop_poll_timer()
+        self._abandon_jobs()
         self.quit()
 
 
 class RTAWorker(QThread):
-    """Worker thread for RTA verification measurements"""
+    """
+    Worker thread for RTA verification measurements.
+
+    Collection is driven by the RTA updates themselves: the worker blocks
+    on rta_coordinator until it stops the run (maximum duration, or - in
+    adaptive mode - tight enough confidence intervals), the sweep ends,
+    or stop() is called.
+    """
 
     status_update = pyqtSignal(str)
     error_occurred = pyqtSignal(str, str)
     finished = pyqtSignal()
     verification_complete = pyqtSignal(dict)  # Emits enhanced measurement result
 
-    def __init__(self, channel, initial_result, duration=8):
+    # Past the maximum duration, how long to wait for REW's last updates
+    RESULT_GRACE_S = 2.0
+
+    def __init__(self, channel, initial_result, duration=None):
         super().__init__()
         self.channel = channel
         self.initial_result = initial_result
-        self.duration = duration
+        self.duration = (
+            rta_setting("rta_max_duration_s") if duration is None else duration
+        )
+        self.adaptive = rta_setting("rta_adaptive")
+        self.min_duration = min(rta_setting("rta_min_duration_s"), self.duration)
         self.running = True
-        self.rta_samples = []
         self.start_time = None
         self.min_samples = 20
         self.collecting = False
@@ -926,13 +1209,10 @@ class RTAWorker(QThread):
             # Start RTA mode
             if not start_rta():
                 self.error_occurred.emit("RTA Error", "Failed to start RTA mode")
-                self.cleanup()
                 return
 
-            # Brief delay to let RTA settle
-            time.sleep(0.5)
-
-            # Start collecting samples
+            # No fixed settling delay: updates from a partly filled FFT and
+            # the settle window are skipped by the coordinator
             self.start_collection()
 
             # Play verification sweep with callback
@@ -948,13 +1228,11 @@ class RTAWorker(QThread):
                     self.error_occurred.emit(
                         "Playback Error", "Failed to start verification sweep"
                     )
-                    self.cleanup()
                     return
             else:
                 self.error_occurred.emit(
                     "File Error", f"No sweep file found for {self.channel}"
                 )
-                self.cleanup()
                 return
 
             # Wait for completion or timeout
@@ -964,45 +1242,43 @@ class RTAWorker(QThread):
             self.error_occurred.emit("RTA Error", f"Unexpected error: {str(e)}")
         finally:
             self.cleanup()
-            self.stop_and_finish
+            self.stop_and_finish()
 
     def start_collection(self):
         """Start collecting RTA samples"""
         self.collecting = True
-        self.rta_samples = []
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.status_update.emit("Collecting RTA distortion data...")
 
-        # Connect to the global RTA coordinator
-        rta_coordinator.start_collection(duration=self.duration)
+        if self.adaptive:
+            ci_limits = {
+                "thd": rta_setting("rta_ci_thd"),
+                "thd_plus_n": rta_setting("rta_ci_thd_plus_n"),
+                "snr": rta_setting("rta_ci_snr_db"),
+            }
+            rta_coordinator.start_collection(
+                duration=self.duration,
+                ci_limits=ci_limits,
+                min_duration=self.min_duration,
+                settle_time=self.min_duration * rta_coordinator.SETTLE_FRACTION,
+            )
+        else:
+            rta_coordinator.start_collection(
+                duration=self.duration, early_stop=bool(qs.get("rta_early_stop", False))
+            )
 
     def on_playback_complete(self):
-        """Called when VLC playback finishes"""
-        self.status_update.emit("Playback complete, finalizing RTA collection...")
+        """Called when VLC playback finishes (VLC's thread)"""
         print("RTA verification sweep finished")
-        # Give a brief moment for final samples
-        QTimer.singleShot(1000, self.stop_collection)
+        # Nothing after the sweep is worth collecting; wakes the worker
+        rta_coordinator.stop_collection()
 
     def wait_for_completion(self):
-        """Wait for collection to complete with timeout"""
-        timeout_count = 0
-        max_timeout = (self.duration + 5) * 10  # Add 5 second buffer, check every 100ms
-
-        while self.collecting and self.running and timeout_count < max_timeout:
-            time.sleep(0.1)
-            timeout_count += 1
-
-            # Check if we have enough samples and minimum time has passed
-            elapsed = time.time() - self.start_time if self.start_time else 0
-            if (
-                elapsed >= self.duration
-                and len(rta_coordinator.samples) >= self.min_samples
-            ):
-                self.stop_collection()
-                break
-
-        if timeout_count >= max_timeout:
-            self.status_update.emit("RTA verification timed out")
+        """Block until rta_coordinator ends the run, then report it"""
+        rta_result = rta_coordinator.wait_for_result(self.duration + self.RESULT_GRACE_S)
+        if self.running and rta_result and rta_result.get("early_stopped") and is_playing():
+            stop_vlc_and_exit()  # rest of the sweep is not needed
+        self.stop_collection()
 
     def stop_collection(self):
         """Stop collecting and analyze results"""
@@ -1013,10 +1289,12 @@ class RTAWorker(QThread):
 
         # Get results from global coordinator
         rta_result = rta_coordinator.stop_collection()
+        elapsed = time.monotonic() - self.start_time
 
         if rta_result and rta_result["stable_samples"] >= self.min_samples:
             self.status_update.emit(
-                f"RTA verification complete: {rta_result['stable_samples']} samples analyzed"
+                f"RTA verification complete: {rta_result['stable_samples']} samples "
+                f"analyzed in {elapsed:.1f}s"
             )
 
             # Combine with initial sweep result
@@ -1044,27 +1322,136 @@ class RTAWorker(QThread):
         """External hard-stop (e.g. MainWindow.closeEvent)"""
         if not self.running:  # already stopped
             return
+        # Wakes a worker blocked in wait_for_completion()
+        if rta_coordinator.is_collecting():
+            rta_coordinator.stop_collection()
         self.stop_and_finish()  # <- delegate, emits `finished` & quits
 
     def stop_and_finish(self):
         if self.running:
-            # ----------------------------------------------------------
-            # keep current_position inside 0 … num_positions-1
-            state = self.measurement_state
-            if (
-                not state.get("repeat_mode", False)
-                and state["current_position"] >= state["num_positions"]
-            ):
-                state["current_position"] = max(0, state["num_positions"] - 1)
-            # ----------------------------------------------------------
-
             self.running = False
-            if self.check_timer:
-                self.check_timer.stop()
-                self.check_timer = None
-
-            # turn off grid flash & clear visuals
-            #  self.grid_flash_signal.emit(False)
-            self.visualization_update.emit(state.get("current_position", 0), [], False)
             self.finished.emit()
         self.quit()
+
+
+class QualityLoaderWorker(QThread):
+    """
+    Re-score measurements already loaded in REW without blocking the GUI.
+
+    Each measurement is scored by score_measurement() (the same path a
+    live capture takes) on a small pool, with the metadata taken from the
+    measurement index; several downloads run at once and each result is
+    emitted as soon as it is ready.
+    """
+
+    status_update = pyqtSignal(str)
+    quality_loaded = pyqtSignal(dict)  # channel, position, uuid, title, score, rating, detail
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal()
+
+    SCORE_WORKERS = 6  # x2 requests each, stays inside RewClient's pool
+    POLL_S = 0.2  # how often the wait for results checks for stop()
+
+    def __init__(self, skip_keys=None):
+        super().__init__()
+        self.running = True
+        self.skip_keys = set(skip_keys or ())  # (channel, position) already known
+
+    def run(self):
+        try:
+            self._load_all()
+        except Exception as e:
+            print(f"Error loading existing measurement qualities: {e}")
+        finally:
+            self.finished.emit()
+
+    def _load_all(self):
+        measurements, _ = get_all_measurements_with_uuid()
+        if not measurements or not self.running:
+            return
+
+        jobs = []
+        for measurement in measurements:
+            channel, position, kind = parse_measurement_title(measurement.get("title", ""))
+            if kind == TITLE_RAW and (channel, position) not in self.skip_keys:
+                jobs.append((channel, position, measurement))
+
+        total = len(jobs)
+        if total == 0:
+            return
+        self.status_update.emit(f"Loading quality data for {total} existing measurements...")
+        self.progress.emit(0, total)
+
+        done = 0
+        loaded = 0
+        pool = ThreadPoolExecutor(
+            max_workers=self.SCORE_WORKERS, thread_name_prefix="quality-score"
+        )
+        pending = set()
+        try:
+            # Scores cached by an earlier session cost no REW downloads
+            for job in jobs:
+                cached = self._from_cache(job)
+                if cached is not None:
+                    done += 1
+                    loaded += 1
+                    self.quality_loaded.emit(cached)
+                    self.progress.emit(done, total)
+                else:
+                    pending.add(pool.submit(self._score, job))
+
+            while pending and self.running:
+                completed, pending = wait(
+                    pending, timeout=self.POLL_S, return_when=FIRST_COMPLETED
+                )
+                for future in completed:
+                    result = future.result()
+                    if result is not None:
+                        loaded += 1
+                        self.quality_loaded.emit(result)
+                    done += 1
+                    self.progress.emit(done, total)
+        finally:
+            # Downloads already running finish in the background and are
+            # ignored; nothing queued starts after a stop()
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+        if self.running:
+            print(f"Loaded quality data for {loaded} existing measurements")
+
+    def _from_cache(self, job):
+        channel, position, measurement = job
+        cached = quality_cache.get(measurement.get("uuid", ""))
+        if cached is None:
+            return None
+        return {
+            "channel": channel,
+            "position": position,
+            "uuid": measurement.get("uuid", ""),
+            "title": measurement.get("title", ""),
+            **cached,
+        }
+
+    def _score(self, job):
+        """Score one measurement (pool thread)."""
+        if not self.running:
+            return None
+        channel, position, measurement = job
+        uuid = measurement.get("uuid", "")
+        title = measurement.get("title", "")
+        try:
+            # index metadata, no need to ask REW for it again
+            result, error_msg = score_measurement(uuid, measurement)
+        except Exception as e:
+            result, error_msg = None, str(e)
+        if result is None:
+            print(f"Could not evaluate quality for {title}: {error_msg}")
+            return None
+        return {"channel": channel, "position": position, "title": title, **result}
+
+    def stop(self):
+        """Abandon outstanding work and wait for the thread (e.g. MainWindow.closeEvent)."""
+        self.running = False
+        self.wait()  # run() notices within POLL_S once the index read returns
@@ -8,10 +8,18 @@ through the Room EQ Wizard (REW) API.
 __version__ = "1.0.0"
 __author__ = "Juan F. Loya"
 
-# Import main components for easier access
-from .Qrew import MainWindow, shutdown_handler
-from .Qrew_api_helper import check_rew_connection, initialize_rew_subscriptions
-from .Qrew_message_handlers import run_flask_server, stop_flask_server
+# Main components are resolved on first access so that ``python -m qrew``
+# does not import the whole GUI before main() (and its startup profile) runs.
+_LAZY_EXPORTS = {
+    "MainWindow": ".Qrew",
+    "shutdown_handler": ".Qrew",
+    "check_rew_connection": ".Qrew_api_helper",
+    "initialize_rew_subscriptions": ".Qrew_api_helper",
+    "run_callback_server": ".Qrew_message_handlers",
+    "stop_callback_server": ".Qrew_message_handlers",
+    "run_flask_server": ".Qrew_message_handlers",
+    "stop_flask_server": ".Qrew_message_handlers",
+}
 #from .Qrew_common import SPEAKER_LABELS, SPEAKER_CONFIGS
 
 __all__ = [
@@ -19,7 +27,20 @@ __all__ = [
     "shutdown_handler",
     "check_rew_connection", 
     "initialize_rew_subscriptions",
+    "run_callback_server",
+    "stop_callback_server",
     "run_flask_server",
     "stop_flask_server",
 
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
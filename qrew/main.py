@@ -4,12 +4,24 @@ Main entry point for Qrew application
 """
 import os
 import sys
-import time
 import platform
 import signal
 from threading import Thread
+
+# Imported first so the startup profile clock covers everything below
+try:
+    from .Qrew_startup import startup_profile
+except ImportError:
+    try:
+        from Qrew_startup import startup_profile
+    except ImportError:
+        from qrew.Qrew_startup import startup_profile
+
+from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtWidgets import QApplication
 
+startup_profile.mark("qt_import")
+
 # Add the frozen application path for imports
 if getattr(sys, "frozen", False):
     # Running as PyInstaller bundle
@@ -34,25 +46,68 @@ if platform.system() == "Windows":
 try:
     from .Qrew import MainWindow, wait_for_rew_qt, shutdown_handler
     from .Qrew_api_helper import initialize_rew_subscriptions
-    from .Qrew_message_handlers import run_flask_server
+    from .Qrew_message_handlers import run_callback_server, wait_for_callback_server
     from .Qrew_styles import GLOBAL_STYLE
+    from .Qrew_vlc_helper_v2 import load_vlc
 except ImportError:
     try:
         from Qrew import MainWindow, wait_for_rew_qt, shutdown_handler
         from Qrew_api_helper import initialize_rew_subscriptions
-        from Qrew_message_handlers import run_flask_server
+        from Qrew_message_handlers import run_callback_server, wait_for_callback_server
         from Qrew_styles import GLOBAL_STYLE
+        from Qrew_vlc_helper_v2 import load_vlc
     except ImportError:
         # Try with qrew prefix
         import qrew.Qrew as QrewModule
         from qrew.Qrew_api_helper import initialize_rew_subscriptions
-        from qrew.Qrew_message_handlers import run_flask_server
+        from qrew.Qrew_message_handlers import run_callback_server, wait_for_callback_server
         from qrew.Qrew_styles import GLOBAL_STYLE
+        from qrew.Qrew_vlc_helper_v2 import load_vlc
 
         MainWindow = QrewModule.MainWindow
         wait_for_rew_qt = QrewModule.wait_for_rew_qt
         shutdown_handler = QrewModule.shutdown_handler
 
+startup_profile.mark("qrew_import")
+
+# Upper bound on waiting for the callback server before subscribing
+CALLBACK_SERVER_READY_TIMEOUT = 5.0
+
+
+class StartupWorker(QThread):
+    """
+    Non-visual start-up, run off the GUI thread once the window is up:
+    wait for the callback server, then subscribe to REW callbacks.
+    Both can block for seconds, so the window stays responsive meanwhile.
+    """
+
+    subscriptions_ready = pyqtSignal(bool)
+
+    def run(self):
+        ready = wait_for_callback_server(CALLBACK_SERVER_READY_TIMEOUT)
+        startup_profile.mark("callback_server")
+
+        try:
+            # Initialize all subscriptions
+            initialize_rew_subscriptions()
+        except Exception as e:
+            print(f"❌ REW subscription setup failed: {e}")
+            ready = False
+        startup_profile.mark("subscriptions")
+
+        self.subscriptions_ready.emit(ready)
+
+
+def finish_startup(ready):
+    """
+    Back on the GUI thread once subscriptions are in place: warm up VLC
+    in the background so the first sweep does not pay for it.
+    """
+    if not ready:
+        print("⚠️  Continuing without REW callbacks")
+
+    Thread(target=load_vlc, name="vlc-preload", daemon=True).start()
+
 
 def main():
     """Main application entry point"""
@@ -60,27 +115,34 @@ def main():
         signal.signal(signal.SIGINT, shutdown_handler)
         signal.signal(signal.SIGTERM, shutdown_handler)
 
-        # Start Flask in a background thread
-        flask_thread = Thread(target=run_flask_server, daemon=True)
-        flask_thread.start()
-
-        time.sleep(1)
+        # Start the REW callback server in a background thread; it comes up
+        # while Qt starts and signals readiness through wait_for_callback_server()
+        server_thread = Thread(target=run_callback_server, daemon=True)
+        server_thread.start()
 
         # Create Qt application
         app = QApplication(sys.argv)
         app.setStyle("Fusion")
         app.setStyleSheet(GLOBAL_STYLE)
+        startup_profile.mark("qapplication")
+
         # Check REW connection
         wait_for_rew_qt()
-
-        # Initialize all subscriptions
-        initialize_rew_subscriptions()
+        startup_profile.mark("rew_check")
 
         # Create and show main window
         window = MainWindow()
+        startup_profile.mark("main_window")
+        startup_profile.watch_first_paint(window)
         window.show()
 
-        sys.exit(app.exec_())
+        startup_worker = StartupWorker()
+        startup_worker.subscriptions_ready.connect(finish_startup)
+        startup_worker.start()
+
+        exit_code = app.exec_()
+        startup_worker.wait()  # never destroy a QThread that is still running
+        sys.exit(exit_code)
     except Exception as e:
         print(f"Error starting application: {e}")
         import traceback